@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, Header, UploadFile, File, Form, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
 
+from app.models.models import UserQuestionProfile
 from app.schemas.responses import AudioAnswerResponse
 from app.services.answer import get_answer_service, AnswerService
 from app.services.question import get_question_service, QuestionService
-from app.core.constants import ALLOWED_AUDIO_TYPES, MAX_AUDIO_FILE_SIZE, ErrorMessages
+from app.services.user_cache import get_user_profile_cache
+from app.core.constants import ErrorMessages
+from app.utils.audio_stream import StreamingAudioForm
 from app.utils.common import format_message
 
 router = APIRouter(prefix="/answers", tags=["answers"])
@@ -14,16 +18,7 @@ async def get_questions(
     question_service: QuestionService = Depends(get_question_service)
 ):
     """전체 질문 목록 조회"""
-    user = None
-    if x_user_id:
-        from app.models.models import User
-        user = await User.find_one(User.user_id == x_user_id)
-        
-        if user is None:
-            raise HTTPException(
-                status_code=404,
-                detail=format_message(ErrorMessages.USER_NOT_FOUND)
-            )
+    user = await _get_question_profile(x_user_id)
     
     personalized_questions = {}
     for question_number in range(1, question_service.get_total_questions() + 1):
@@ -47,36 +42,63 @@ async def get_question(
             detail=format_message(ErrorMessages.QUESTION_NOT_FOUND, question_number=question_number)
         )
     
-    user = None
-    if x_user_id:
-        from app.models.models import User
-        user = await User.find_one(User.user_id == x_user_id)
-        
-        if user is None:
-            raise HTTPException(
-                status_code=404,
-               detail=format_message(ErrorMessages.USER_NOT_FOUND)
-            )
+    user = await _get_question_profile(x_user_id)
     
     return {
         "question_number": question_number,
         "question_text": question_service.get_question_text(question_number, user)
     }
 
-@router.post("/audio", response_model=AudioAnswerResponse)
+async def _get_question_profile(user_id: str) -> Optional[UserQuestionProfile]:
+    """질문 개인화용 사용자 정보 조회 (필요한 필드만 projection)"""
+    if not user_id:
+        return None
+    
+    user = await get_user_profile_cache().get_user(user_id, UserQuestionProfile)
+    if user is None:
+        raise HTTPException(
+            status_code=404,
+            detail=format_message(ErrorMessages.USER_NOT_FOUND)
+        )
+    return user
+
+@router.post(
+    "/audio",
+    response_model=AudioAnswerResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["audio_file", "question_number"],
+                        "properties": {
+                            "audio_file": {
+                                "type": "string",
+                                "format": "binary",
+                                "description": "오디오 파일 (wav, mp3, m4a, webm, ogg 등)"
+                            },
+                            "question_number": {"type": "integer", "description": "질문 번호 (1-3)"}
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
 async def upload_audio_answer(
-    audio_file: UploadFile = File(..., description="오디오 파일 (wav, mp3, m4a, webm, ogg 등)"),
-    question_number: int = Form(..., description="질문 번호 (1-3)"),
+    request: Request,
     x_user_id: str = Header(..., alias="X-User-Id"),
     answer_service: AnswerService = Depends(get_answer_service)
 ):
-    """오디오 파일로 답변 제출 (한국 시간 기준)"""
+    """오디오 파일로 답변 제출 (한국 시간 기준, 요청 본문을 스트리밍으로 GCS에 업로드)"""
     try:
-        _validate_audio_file(audio_file)
+        audio_form = StreamingAudioForm(request)
+        await audio_form.open_audio()
         
         result = await answer_service.process_audio_answer(
-            audio_file=audio_file,
-            question_number=question_number,
+            audio_form=audio_form,
             user_id=x_user_id
         )
         
@@ -89,25 +111,3 @@ async def upload_audio_answer(
             status_code=500,
             detail=format_message(ErrorMessages.AUDIO_ANSWER_PROCESSING_ERROR, error=str(e))
         )
-
-def _validate_audio_file(audio_file: UploadFile):
-    """오디오 파일 유효성 검사"""
-    if audio_file.content_type not in ALLOWED_AUDIO_TYPES:
-        raise HTTPException(
-            status_code=400, 
-            detail=format_message(
-                ErrorMessages.UNSUPPORTED_AUDIO_FORMAT, 
-                formats=', '.join(ALLOWED_AUDIO_TYPES)
-            )
-        )
-    
-    audio_file.file.seek(0, 2)
-    file_size = audio_file.file.tell()
-    audio_file.file.seek(0)
-    
-    if file_size > MAX_AUDIO_FILE_SIZE:
-        max_size_mb = MAX_AUDIO_FILE_SIZE // (1024 * 1024)
-        raise HTTPException(
-            status_code=400,
-            detail=format_message(ErrorMessages.FILE_SIZE_EXCEEDED, max_size=max_size_mb)
-        )
\ No newline at end of file
@@ -1,26 +1,105 @@
-from fastapi import APIRouter, Depends, Header, Query
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from app.core.constants import Defaults
 from app.services.report import ReportService, get_report_service
+from app.services.report_cache import CachedResponse, ReportResponseCache, get_report_response_cache
+from app.services.report_stream import ReportStreamService, get_report_stream_service
 from app.schemas.responses import ReportsListResponse, ReportDetailResponse
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
 @router.get("", response_model=ReportsListResponse)
 async def list_reports(
-    year: int = Query(..., description="조회할 연도 (예: 2025)"),
-    month: int = Query(..., ge=1, le=12, description="조회할 월 (1~12)"),
+    request: Request,
+    year: Optional[int] = Query(None, ge=1, le=9998, description="조회할 연도 (예: 2025, 생략 시 전체 기간)"),
+    month: Optional[int] = Query(None, ge=1, le=12, description="조회할 월 (1~12, 생략 시 연도 전체)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(Defaults.REPORT_PAGE_SIZE, ge=1, le=100, description="페이지 크기"),
     x_user_id: str = Header(..., alias="X-User-Id"),
-    report_service: ReportService = Depends(get_report_service)
+    report_service: ReportService = Depends(get_report_service),
+    report_cache: ReportResponseCache = Depends(get_report_response_cache)
 ):
-    return await report_service.get_user_reports(
-        user_id=x_user_id,
-        year=year,
-        month=month
+    return await _cached_response(
+        request,
+        report_cache,
+        ReportResponseCache.list_key(x_user_id, year, month, cursor, limit),
+        ReportsListResponse,
+        lambda: report_service.get_user_reports(
+            user_id=x_user_id, year=year, month=month, cursor=cursor, limit=limit
+        )
     )
 
 @router.get("/{report_id}", response_model=ReportDetailResponse)
 async def get_report_detail(
+    request: Request,
     report_id: str,
     x_user_id: str = Header(..., alias="X-User-Id"),
     report_service: ReportService = Depends(get_report_service),
+    report_cache: ReportResponseCache = Depends(get_report_response_cache)
+):
+    key = ReportResponseCache.detail_key(x_user_id, report_id)
+    # 방금 저장본 버전을 확인한 응답이면 If-None-Match를 Mongo 조회 없이 비교
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        verified = report_cache.get_verified(key)
+        if verified is not None and _etag_matches(if_none_match, verified.etag):
+            report_cache.record_not_modified()
+            return Response(status_code=304, headers=_cache_headers(verified))
+
+    # 다른 워커가 같은 리포트를 다시 저장했을 수 있으므로 저장본 버전을 확인 (_id 조회, created_at만 반환)
+    version = await report_service.get_report_version(user_id=x_user_id, report_id=report_id)
+    return await _cached_response(
+        request,
+        report_cache,
+        key,
+        ReportDetailResponse,
+        lambda: report_service.get_report_detail(user_id=x_user_id, report_id=report_id),
+        version=version
+    )
+
+@router.get("/{report_id}/stream")
+async def stream_report(
+    report_id: str,
+    x_user_id: str = Header(..., alias="X-User-Id"),
+    report_stream_service: ReportStreamService = Depends(get_report_stream_service)
 ):
-    return await report_service.get_report_detail(user_id=x_user_id, report_id=report_id)
\ No newline at end of file
+    """리포트 생성 과정을 Server-Sent Events로 전달 (이미 생성된 리포트는 done 이벤트 하나로 응답)"""
+    events = await report_stream_service.open_stream(user_id=x_user_id, report_id=report_id)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _cached_response(
+    request: Request,
+    report_cache: ReportResponseCache,
+    key: Tuple,
+    response_model: Type[BaseModel],
+    load: Callable[[], Awaitable],
+    version: Optional[str] = None
+) -> Response:
+    """캐시된 직렬화 응답을 반환하고, If-None-Match가 일치하면 304 응답 (version이 다르면 새로 조회)"""
+    cached = report_cache.get(key, version)
+    if cached is None:
+        result = await load()
+        # 생성 중(202) 등 이미 완성된 응답은 캐시하지 않음
+        if isinstance(result, Response):
+            return result
+        body = response_model.model_validate(result).model_dump_json().encode()
+        cached = report_cache.put(key, body, version)
+
+    headers = _cache_headers(cached)
+    if _etag_matches(request.headers.get("if-none-match", ""), cached.etag):
+        report_cache.record_not_modified()
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+def _cache_headers(cached: CachedResponse) -> Dict[str, str]:
+    return {"ETag": cached.etag, "Cache-Control": "private, no-cache"}
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
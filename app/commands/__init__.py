@@ -0,0 +1,3 @@
+"""
+운영용 명령어 패키지 (python -m app.commands.<name> 으로 실행)
+"""
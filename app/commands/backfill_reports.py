@@ -0,0 +1,84 @@
+"""
+Conversation에 내장된 기존 리포트를 reports 컬렉션으로 옮기는 백필 명령어
+
+사용법:
+    python -m app.commands.backfill_reports [--batch-size 500]
+
+이미 reports에 있는 문서는 $setOnInsert로 건너뛰므로 여러 번 실행해도 안전합니다.
+"""
+import argparse
+import asyncio
+import logging
+
+from pymongo import UpdateOne
+
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.models import Conversation, Report
+from app.utils.common import get_korea_now
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+async def backfill_reports(batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    report가 내장된 Conversation을 순회하며 reports 컬렉션에 upsert합니다.
+
+    Returns:
+        int: 새로 생성된 Report 문서 수
+    """
+    source = Conversation.get_motor_collection()
+    target = Report.get_motor_collection()
+    cursor = source.find(
+        {"report": {"$ne": None}},
+        {"user_id": 1, "conversation_date": 1, "report": 1}
+    ).batch_size(batch_size)
+
+    scanned = 0
+    inserted = 0
+    operations = []
+    async for doc in cursor:
+        operations.append(UpdateOne(
+            {"_id": doc["_id"]},
+            {"$setOnInsert": {
+                "user_id": doc["user_id"],
+                "report_date": doc["conversation_date"],
+                "report": doc["report"],
+                "created_at": get_korea_now(),
+            }},
+            upsert=True
+        ))
+        scanned += 1
+        if len(operations) >= batch_size:
+            inserted += await _flush(target, operations)
+            operations = []
+            logger.info(f"🔄 리포트 백필 진행: {scanned}건 확인, {inserted}건 생성")
+
+    if operations:
+        inserted += await _flush(target, operations)
+
+    logger.info(f"✅ 리포트 백필 완료: {scanned}건 확인, {inserted}건 생성")
+    return inserted
+
+
+async def _flush(collection, operations) -> int:
+    result = await collection.bulk_write(operations, ordered=False)
+    return result.upserted_count
+
+
+async def main(batch_size: int) -> None:
+    await connect_to_mongo()
+    try:
+        await backfill_reports(batch_size)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Conversation 내장 리포트를 reports 컬렉션으로 백필")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,165 @@
+"""
+(user_id, conversation_date)가 같은 Conversation을 하나로 합치는 정리 명령어
+
+conversations의 고유 인덱스를 만들기 전에 남아 있는 중복 대화를 정리합니다.
+(중복이 있으면 서버 시작 시 기존 비고유 인덱스를 유지한 채 시작을 중단)
+
+사용법:
+    python -m app.commands.dedupe_conversations [--dry-run]
+
+- 남길 대화: 저장된 리포트가 있는 대화 → 답변(오디오)이 가장 많은 대화 → 가장 최근 대화 순
+- 남길 대화에 없는 질문의 오디오 / 전사 결과는 가장 최근 중복 대화에서 가져오고,
+  모든 답변에 전사 결과가 있으면 user_message를 다시 구성
+- 제거되는 대화와 그 리포트는 conversation_duplicates 컬렉션에 보관한 뒤 삭제 (리포트 작업도 삭제)
+"""
+import argparse
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.core.constants import FINAL_QUESTION_NUMBER
+from app.core.container import close_container
+from app.core.database import close_mongo_connection, connect_to_mongo, duplicate_conversations_pipeline, get_database
+from app.models import Conversation, Report
+from app.models.models import ReportJob, UserQuestionProfile
+from app.services.question import QuestionService
+from app.services.user_cache import get_user_profile_cache
+from app.utils.common import format_answer_lines, get_korea_now
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLLECTION = "conversation_duplicates"
+QUESTION_NUMBERS = range(1, FINAL_QUESTION_NUMBER + 1)
+
+
+async def dedupe_conversations(dry_run: bool = False) -> Dict[str, int]:
+    """
+    중복 Conversation 묶음마다 하나만 남기고 나머지를 합친 뒤 삭제합니다.
+
+    Returns:
+        Dict[str, int]: groups (중복 묶음 수) / removed (삭제한 대화 수) / merged (답변을 옮겨 온 대화 수)
+    """
+    conversations = Conversation.get_motor_collection()
+    stats = {"groups": 0, "removed": 0, "merged": 0}
+
+    cursor = conversations.aggregate(duplicate_conversations_pipeline(), allowDiskUse=True)
+    async for group in cursor:
+        stats["groups"] += 1
+        documents = await conversations.find({"_id": {"$in": group["ids"]}}).to_list(None)
+        report_ids = {
+            report["_id"]
+            for report in await Report.get_motor_collection().find(
+                {"_id": {"$in": group["ids"]}}, {"_id": 1}
+            ).to_list(None)
+        }
+
+        survivor = _choose_survivor(documents, report_ids)
+        duplicates = [document for document in documents if document["_id"] != survivor["_id"]]
+        fields = await _merge_answers(survivor, duplicates)
+
+        logger.info(
+            f"🔀 중복 대화 정리{' (dry-run)' if dry_run else ''}: user_id={group['_id']['user_id']} "
+            f"date={group['_id']['conversation_date']:%Y-%m-%d} 유지={survivor['_id']} "
+            f"삭제={[document['_id'] for document in duplicates]} 병합 필드={sorted(fields)}"
+        )
+        if fields:
+            stats["merged"] += 1
+        stats["removed"] += len(duplicates)
+        if dry_run:
+            continue
+
+        if fields:
+            await conversations.update_one({"_id": survivor["_id"]}, {"$set": fields})
+        await _archive_and_delete(duplicates, report_ids)
+
+    logger.info(
+        f"✅ 중복 대화 정리 완료{' (dry-run)' if dry_run else ''}: "
+        f"{stats['groups']}개 묶음, {stats['removed']}건 삭제, {stats['merged']}건 병합"
+    )
+    return stats
+
+
+def _answer_count(document: Dict[str, Any]) -> int:
+    return sum(1 for number in QUESTION_NUMBERS if document.get(f"audio_uri_{number}"))
+
+
+def _choose_survivor(documents: List[Dict[str, Any]], report_ids: set) -> Dict[str, Any]:
+    """리포트가 있는 대화 → 답변이 많은 대화 → 최근 대화 순으로 남길 대화 선택"""
+    return max(documents, key=lambda document: (
+        document["_id"] in report_ids,
+        _answer_count(document),
+        document["_id"],
+    ))
+
+
+async def _merge_answers(survivor: Dict[str, Any], duplicates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """남길 대화에 없는 답변을 최근 중복 대화에서 가져와 $set할 필드 구성"""
+    fields: Dict[str, Any] = {}
+    latest_first = sorted(duplicates, key=lambda document: document["_id"], reverse=True)
+    for number in QUESTION_NUMBERS:
+        if survivor.get(f"audio_uri_{number}"):
+            continue
+        source = next((document for document in latest_first if document.get(f"audio_uri_{number}")), None)
+        if source is not None:
+            fields[f"audio_uri_{number}"] = source[f"audio_uri_{number}"]
+            fields[f"transcript_{number}"] = source.get(f"transcript_{number}")
+
+    if fields:
+        user_message = await _build_user_message(survivor["user_id"], {**survivor, **fields})
+        if user_message is not None:
+            fields["user_message"] = user_message
+    return fields
+
+
+async def _build_user_message(user_id: str, document: Dict[str, Any]) -> Optional[str]:
+    """합친 답변으로 user_message 재구성 (전사 결과가 없는 답변이 있으면 None — 기존 값 유지)"""
+    profile = await get_user_profile_cache().get_user(user_id, UserQuestionProfile)
+    lines: List[str] = []
+    for number in QUESTION_NUMBERS:
+        if not document.get(f"audio_uri_{number}"):
+            continue
+        text = document.get(f"transcript_{number}")
+        if not text:
+            return None
+        question_text = QuestionService.get_question_text(number, profile)
+        if question_text:
+            lines.extend(format_answer_lines(number, question_text, text))
+    return "\n".join(lines)
+
+
+async def _archive_and_delete(duplicates: List[Dict[str, Any]], report_ids: set) -> None:
+    """삭제할 대화와 리포트를 보관 컬렉션에 남긴 뒤 삭제"""
+    duplicate_ids = [document["_id"] for document in duplicates]
+    reports = await Report.get_motor_collection().find(
+        {"_id": {"$in": [conversation_id for conversation_id in duplicate_ids if conversation_id in report_ids]}}
+    ).to_list(None)
+
+    now = get_korea_now()
+    archive = get_database()[ARCHIVE_COLLECTION]
+    await archive.insert_many([
+        {"conversation": document, "reports": [report for report in reports if report["_id"] == document["_id"]], "archived_at": now}
+        for document in duplicates
+    ])
+
+    await Report.get_motor_collection().delete_many({"_id": {"$in": duplicate_ids}})
+    await ReportJob.get_motor_collection().delete_many({"conversation_id": {"$in": duplicate_ids}})
+    await Conversation.get_motor_collection().delete_many({"_id": {"$in": duplicate_ids}})
+
+
+async def main(dry_run: bool) -> None:
+    # 중복이 남아 있으면 고유 인덱스를 만들 수 없으므로 인덱스 교체 없이 연결
+    await connect_to_mongo(manage_indexes=False)
+    try:
+        await dedupe_conversations(dry_run)
+    finally:
+        await close_container()
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="(user_id, conversation_date)가 같은 Conversation 정리")
+    parser.add_argument("--dry-run", action="store_true", help="정리 대상만 확인")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.dry_run))
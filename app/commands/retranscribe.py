@@ -0,0 +1,460 @@
+"""
+과거 Conversation의 오디오를 다시 전사(STT)하는 배치 명령어
+
+STT_MODEL 변경이나 전사 버그 수정 후 transcript_1~3과 user_message를 다시 만듭니다.
+(user_message는 transcript와 같은 UpdateOne에서 재구성하며, 전사 결과가 없는 답변이 하나라도 있으면
+ 기존 user_message를 그대로 두고 messages_kept로 집계 / --keep-user-message이면 항상 그대로 둠)
+
+사용법:
+    python -m app.commands.retranscribe --since 2025-01-01 --rpm 20 [--job-name stt-2025-01] [--dry-run]
+
+- 대상 조회(--read-preference, 기본 secondary 우선) → 오디오 다운로드 → STT → bulk 저장 단계를
+  크기가 정해진 큐로 연결해 동시 실행 수와 메모리 사용량을 고정
+- 저장이 끝난 위치(_id)를 batch_checkpoints 컬렉션에 기록하므로 같은 --job-name으로 다시 실행하면 이어서 처리
+  (--until을 생략하면 처음 실행한 날짜를 체크포인트에 기록해 자정이 지나도 같은 조건으로 이어서 처리)
+- 운영 워커와 별도 프로세스에서 실행되며 Whisper 호출은 --rpm으로 제한
+  (OpenAI 계정 한도는 공유되므로 계정 한도에서 OPENAI_AUDIO_RPM x 운영 워커 수를 뺀 값 이하로 설정)
+- 기본값으로 오늘 대화는 제외하고(진행 중인 세션), 실행 중 오디오가 바뀐 대화는 덮어쓰지 않음
+"""
+import argparse
+import asyncio
+import logging
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import json_util
+from pymongo import UpdateOne
+
+from app.core.constants import FINAL_QUESTION_NUMBER, STT_MODEL
+from app.core.container import close_container, get_container
+from app.core.database import close_mongo_connection, collection_for_read, connect_to_mongo, get_database
+from app.external.rate_limiter import RateLimiter
+from app.models import Conversation
+from app.models.models import UserQuestionProfile
+from app.services.audio_cache import AudioCacheService
+from app.services.question import QuestionService
+from app.services.speech_to_text import get_speech_to_text_service
+from app.services.user_cache import get_user_profile_cache
+from app.utils.common import format_answer_lines, get_korea_now, get_korea_today_date, safe_get_error_message
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_COLLECTION = "batch_checkpoints"
+FAILED_IDS_LIMIT = 1000  # 체크포인트에 남기는 실패 conversation _id 수
+PAGE_SIZE = 200
+FLUSH_INTERVAL_SECONDS = 10  # 결과가 뜸할 때 모아 둔 결과를 저장하는 주기
+
+PROJECTION = {
+    "user_id": 1,
+    "user_message": 1,
+    **{f"audio_uri_{number}": 1 for number in range(1, FINAL_QUESTION_NUMBER + 1)},
+    **{f"transcript_{number}": 1 for number in range(1, FINAL_QUESTION_NUMBER + 1)},
+}
+
+
+@dataclass
+class RetranscribeOptions:
+    job_name: str
+    since: Optional[date] = None
+    until: Optional[date] = None
+    user_ids: List[str] = field(default_factory=list)
+    missing_only: bool = False
+    stale_model_only: bool = False
+    rpm: int = 20
+    download_concurrency: int = 4
+    transcribe_concurrency: int = 4
+    write_batch_size: int = 50
+    limit: int = 0
+    refresh_cache: bool = False
+    rebuild_user_message: bool = True
+    read_preference: str = "secondaryPreferred"
+    progress_interval: float = 30
+    restart: bool = False
+    dry_run: bool = False
+
+
+@dataclass
+class RetranscribeItem:
+    """파이프라인을 통과하는 대화 하나"""
+    document: Dict[str, Any]
+    audio_uris: List[Tuple[int, str]]
+    transcripts: Dict[int, str] = field(default_factory=dict)
+    errors: Dict[int, str] = field(default_factory=dict)
+
+
+def build_filter(options: RetranscribeOptions) -> Dict[str, Any]:
+    """대상 Conversation 조건 (오디오가 하나 이상 있는 대화)"""
+    conditions: List[Dict[str, Any]] = [
+        {"$or": [{f"audio_uri_{number}": {"$ne": None}} for number in range(1, FINAL_QUESTION_NUMBER + 1)]}
+    ]
+
+    date_range: Dict[str, datetime] = {}
+    if options.since:
+        date_range["$gte"] = datetime.combine(options.since, datetime.min.time())
+    if options.until:
+        date_range["$lt"] = datetime.combine(options.until, datetime.min.time())
+    if date_range:
+        conditions.append({"conversation_date": date_range})
+
+    if options.user_ids:
+        conditions.append({"user_id": {"$in": options.user_ids}})
+    if options.missing_only:
+        conditions.append({"$or": [
+            {f"audio_uri_{number}": {"$ne": None}, f"transcript_{number}": None}
+            for number in range(1, FINAL_QUESTION_NUMBER + 1)
+        ]})
+    if options.stale_model_only:
+        conditions.append({"transcript_model": {"$ne": STT_MODEL}})
+
+    return {"$and": conditions}
+
+
+class RetranscribePipeline:
+    """다운로드 / STT / 저장 단계를 큐로 연결한 재전사 파이프라인"""
+
+    def __init__(self, options: RetranscribeOptions):
+        self.options = options
+        self.query = build_filter(options)
+        self.query_text = json_util.dumps(self.query)
+        self.source = collection_for_read(Conversation, options.read_preference)
+        self.target = Conversation.get_motor_collection()
+        self.checkpoints = get_database()[CHECKPOINT_COLLECTION]
+        self.speech_to_text = get_speech_to_text_service()
+        self.user_cache = get_user_profile_cache()
+
+        queue_size = max(options.download_concurrency, options.transcribe_concurrency) * 2
+        self._download_queue: "asyncio.Queue[Optional[RetranscribeItem]]" = asyncio.Queue(queue_size)
+        self._transcribe_queue: "asyncio.Queue[Optional[RetranscribeItem]]" = asyncio.Queue(queue_size)
+        self._write_queue: "asyncio.Queue[Optional[RetranscribeItem]]" = asyncio.Queue(queue_size)
+
+        # 체크포인트는 앞선 대화가 모두 저장된 위치까지만 전진 (조회 순서대로 보관)
+        self._dispatched: List[Any] = []
+        self._finished: set = set()
+        self._last_id: Any = None
+
+        self._stats = {"processed": 0, "updated": 0, "failed": 0, "skipped": 0, "messages_kept": 0, "files": 0}
+        self._saved_stats: Dict[str, int] = {}
+        self._total = 0
+        self._started = 0.0
+
+    async def run(self) -> Dict[str, int]:
+        """
+        대상 대화를 모두 처리합니다.
+
+        Returns:
+            Dict[str, int]: processed / updated / failed / skipped / messages_kept / files
+        """
+        checkpoint = await self._load_checkpoint()
+        if checkpoint is not None:
+            self._last_id = checkpoint.get("last_id")
+            logger.info(f"📍 체크포인트에서 이어서 처리: job={self.options.job_name} last_id={self._last_id}")
+
+        self._total = await self.source.count_documents(self._query_after(self._last_id))
+        if self.options.limit:
+            self._total = min(self._total, self.options.limit)
+        logger.info(f"🎯 재전사 대상: {self._total}건 (STT_MODEL={STT_MODEL}, rpm={self.options.rpm})")
+        if self.options.dry_run or not self._total:
+            return self._stats
+
+        self._started = time.monotonic()
+        downloaders = [asyncio.create_task(self._download_worker()) for _ in range(self.options.download_concurrency)]
+        transcribers = [asyncio.create_task(self._transcribe_worker()) for _ in range(self.options.transcribe_concurrency)]
+        writer = asyncio.create_task(self._write_loop())
+        reporter = asyncio.create_task(self._report_progress())
+        pipeline = asyncio.create_task(self._drive(downloaders, transcribers, writer))
+        tasks = [pipeline, *downloaders, *transcribers, writer]
+        try:
+            # 어느 단계든 예외로 끝나면 앞 단계가 가득 찬 큐에서 멈추지 않도록 바로 중단
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+            await pipeline
+        finally:
+            for task in [*tasks, reporter]:
+                task.cancel()
+            await asyncio.gather(*tasks, reporter, return_exceptions=True)
+
+        await self._save_checkpoint(completed=True)
+        self._log_progress("✅ 재전사 완료")
+        return self._stats
+
+    async def _drive(self, downloaders: List[asyncio.Task], transcribers: List[asyncio.Task], writer: asyncio.Task) -> None:
+        """대상 조회가 끝나면 앞 단계부터 차례로 종료"""
+        await self._produce()
+        await self._close_stage(self._download_queue, downloaders)
+        await self._close_stage(self._transcribe_queue, transcribers)
+        await self._close_stage(self._write_queue, [writer])
+
+    def _query_after(self, last_id: Any) -> Dict[str, Any]:
+        """last_id 이후의 대상 조건"""
+        if last_id is None:
+            return self.query
+        return {"$and": [self.query, {"_id": {"$gt": last_id}}]}
+
+    async def _produce(self) -> None:
+        """_id 순으로 페이지 단위 조회 (긴 커서 대신 매번 새 쿼리를 써서 커서 만료 없이 천천히 소비)"""
+        produced = 0
+        last_seen = self._last_id
+        while True:
+            query = self._query_after(last_seen)
+            page_size = PAGE_SIZE
+            if self.options.limit:
+                page_size = min(page_size, self.options.limit - produced)
+                if page_size <= 0:
+                    return
+            page = await self.source.find(query, PROJECTION, sort=[("_id", 1)], limit=page_size).to_list(page_size)
+            if not page:
+                return
+
+            for document in page:
+                audio_uris = [
+                    (number, document[f"audio_uri_{number}"])
+                    for number in range(1, FINAL_QUESTION_NUMBER + 1)
+                    if document.get(f"audio_uri_{number}")
+                ]
+                self._dispatched.append(document["_id"])
+                await self._download_queue.put(RetranscribeItem(document, audio_uris))
+                produced += 1
+            last_seen = page[-1]["_id"]
+
+    async def _close_stage(self, queue: asyncio.Queue, workers: List[asyncio.Task]) -> None:
+        """앞 단계가 끝나면 워커 수만큼 종료 신호를 넣고 남은 항목 처리를 기다림"""
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+    async def _download_worker(self) -> None:
+        while (item := await self._download_queue.get()) is not None:
+            for number, audio_uri in item.audio_uris:
+                try:
+                    await self.speech_to_text.prefetch_audio(audio_uri)
+                except Exception as e:
+                    item.errors[number] = safe_get_error_message(e)
+            await self._transcribe_queue.put(item)
+
+    async def _transcribe_worker(self) -> None:
+        while (item := await self._transcribe_queue.get()) is not None:
+            for number, audio_uri in item.audio_uris:
+                if number in item.errors:
+                    continue
+                try:
+                    item.transcripts[number] = await self.speech_to_text.transcribe_audio(
+                        audio_uri,
+                        refresh_cache=self.options.refresh_cache
+                    )
+                    self._stats["files"] += 1
+                except Exception as e:
+                    item.errors[number] = safe_get_error_message(e)
+            await self._write_queue.put(item)
+
+    async def _write_loop(self) -> None:
+        """결과를 write_batch_size 또는 FLUSH_INTERVAL_SECONDS 단위로 모아 저장"""
+        batch: List[RetranscribeItem] = []
+        flush_at = 0.0
+        finished = False
+        while not finished:
+            timeout = max(flush_at - time.monotonic(), 0) if batch else None
+            try:
+                item = await asyncio.wait_for(self._write_queue.get(), timeout=timeout)
+                if item is None:
+                    finished = True
+                else:
+                    if not batch:
+                        flush_at = time.monotonic() + FLUSH_INTERVAL_SECONDS
+                    batch.append(item)
+            except asyncio.TimeoutError:
+                pass
+            if batch and (finished or len(batch) >= self.options.write_batch_size or time.monotonic() >= flush_at):
+                await self._flush(batch)
+                batch = []
+
+    async def _flush(self, batch: List[RetranscribeItem]) -> None:
+        operations = []
+        failed_ids = []
+        for item in batch:
+            operation = await self._build_update(item)
+            if operation is not None:
+                operations.append(operation)
+            if item.errors:
+                failed_ids.append(item.document["_id"])
+                logger.warning(f"⚠️ 재전사 실패: conversation_id={item.document['_id']} errors={item.errors}")
+            elif operation is None:
+                self._stats["skipped"] += 1
+
+        if operations:
+            result = await self.target.bulk_write(operations, ordered=False)
+            self._stats["updated"] += result.modified_count
+        self._stats["processed"] += len(batch)
+        self._stats["failed"] += len(failed_ids)
+
+        self._finished.update(item.document["_id"] for item in batch)
+        self._advance_checkpoint()
+        await self._save_checkpoint(failed_ids=failed_ids)
+
+    async def _build_update(self, item: RetranscribeItem) -> Optional[UpdateOne]:
+        """전사에 성공한 항목만 $set (조회 이후 오디오가 바뀐 대화는 조건 불일치로 건너뜀)"""
+        if not item.transcripts:
+            return None
+
+        fields: Dict[str, Any] = {f"transcript_{number}": text for number, text in item.transcripts.items()}
+        fields["transcript_model"] = STT_MODEL
+        if self.options.rebuild_user_message:
+            user_message = await self._build_user_message(item)
+            if user_message is not None:
+                fields["user_message"] = user_message
+            else:
+                self._stats["messages_kept"] += 1
+
+        return UpdateOne(
+            {"_id": item.document["_id"], **{f"audio_uri_{number}": uri for number, uri in item.audio_uris}},
+            {"$set": fields}
+        )
+
+    async def _build_user_message(self, item: RetranscribeItem) -> Optional[str]:
+        """새 전사 결과와 기존 전사 결과로 user_message 재구성 (전사가 없는 질문이 있으면 기존 값 유지)"""
+        profile = await self.user_cache.get_user(item.document["user_id"], UserQuestionProfile)
+        lines: List[str] = []
+        for number, _ in item.audio_uris:
+            text = item.transcripts.get(number) or item.document.get(f"transcript_{number}")
+            if not text:
+                return None
+            question_text = QuestionService.get_question_text(number, profile)
+            if question_text:
+                lines.extend(format_answer_lines(number, question_text, text))
+        return "\n".join(lines)
+
+    def _advance_checkpoint(self) -> None:
+        index = 0
+        while index < len(self._dispatched) and self._dispatched[index] in self._finished:
+            self._finished.discard(self._dispatched[index])
+            index += 1
+        if index:
+            self._last_id = self._dispatched[index - 1]
+            del self._dispatched[:index]
+
+    async def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        if self.options.restart:
+            await self.checkpoints.delete_one({"_id": self.options.job_name})
+            checkpoint = None
+        else:
+            checkpoint = await self.checkpoints.find_one({"_id": self.options.job_name})
+        if self.options.until is None:
+            self._resolve_default_until(checkpoint)
+        if checkpoint is not None and checkpoint.get("filter") != self.query_text:
+            raise SystemExit(
+                f"job={self.options.job_name}의 체크포인트 조건이 현재 조건과 다릅니다. "
+                "같은 조건으로 실행하거나 --restart 또는 다른 --job-name을 사용하세요."
+            )
+        return checkpoint
+
+    def _resolve_default_until(self, checkpoint: Optional[Dict[str, Any]]) -> None:
+        """--until 생략 시 종료일 (체크포인트에 기록된 첫 실행 날짜, 없으면 오늘)"""
+        stored = checkpoint.get("until") if checkpoint else None
+        until = date.fromisoformat(stored) if stored else get_korea_today_date()
+        self.options = replace(self.options, until=until)
+        self.query = build_filter(self.options)
+        self.query_text = json_util.dumps(self.query)
+
+    async def _save_checkpoint(self, failed_ids: Optional[List[Any]] = None, completed: bool = False) -> None:
+        now = get_korea_now()
+        update: Dict[str, Any] = {
+            "$set": {
+                "filter": self.query_text,
+                "last_id": self._last_id,
+                "until": self.options.until.isoformat() if self.options.until else None,
+                "stt_model": STT_MODEL,
+                "updated_at": now,
+                "completed_at": now if completed else None,
+            },
+            "$inc": {
+                name: self._stats[name] - self._saved_stats.get(name, 0)
+                for name in ("processed", "updated", "failed", "skipped", "messages_kept")
+            },
+            "$setOnInsert": {"started_at": now},
+        }
+        if failed_ids:
+            update["$push"] = {"failed_ids": {"$each": failed_ids, "$slice": -FAILED_IDS_LIMIT}}
+        await self.checkpoints.update_one({"_id": self.options.job_name}, update, upsert=True)
+        self._saved_stats = dict(self._stats)
+
+    async def _report_progress(self) -> None:
+        while True:
+            await asyncio.sleep(self.options.progress_interval)
+            self._log_progress("🔄 재전사 진행")
+
+    def _log_progress(self, title: str) -> None:
+        elapsed = max(time.monotonic() - self._started, 1e-6)
+        processed = self._stats["processed"]
+        per_minute = processed / elapsed * 60
+        remaining = self._total - processed
+        eta = f"{remaining / per_minute:.0f}분" if per_minute and remaining > 0 else "-"
+        logger.info(
+            f"{title}: {processed}/{self._total}건 ({per_minute:.1f}건/분, 파일 {self._stats['files'] / elapsed * 60:.1f}개/분) "
+            f"갱신 {self._stats['updated']} 실패 {self._stats['failed']} 건너뜀 {self._stats['skipped']} "
+            f"user_message 유지 {self._stats['messages_kept']} 남은 시간 {eta}"
+        )
+
+
+def configure_batch_services(options: RetranscribeOptions, work_dir: str) -> None:
+    """
+    운영 트래픽과 자원을 나누지 않도록 배치 전용 인스턴스를 컨테이너에 먼저 등록합니다.
+    (Whisper 속도 제한기는 --rpm, 오디오 캐시는 임시 디렉터리)
+    """
+    container = get_container()
+    container.resolve("audio_rate_limiter", lambda: RateLimiter("openai-audio-batch", options.rpm))
+    container.resolve("audio_cache_service", lambda: AudioCacheService(cache_dir=work_dir))
+
+
+async def main(options: RetranscribeOptions) -> None:
+    await connect_to_mongo()
+    work_dir = tempfile.mkdtemp(prefix="moa-retranscribe-")
+    try:
+        configure_batch_services(options, work_dir)
+        await RetranscribePipeline(options).run()
+    finally:
+        await close_container()
+        await close_mongo_connection()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _parse_date(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Conversation 오디오 재전사 (transcript / user_message 갱신)")
+    parser.add_argument("--job-name", default=f"retranscribe-{STT_MODEL}", help="체크포인트 이름 (같은 이름으로 재실행하면 이어서 처리)")
+    parser.add_argument("--since", type=_parse_date, help="conversation_date 시작일 (포함, YYYY-MM-DD)")
+    parser.add_argument(
+        "--until",
+        type=_parse_date,
+        help="conversation_date 종료일 (제외, 기본 처음 실행한 날짜: 체크포인트에 기록되어 이어서 실행해도 유지)"
+    )
+    parser.add_argument("--user-id", action="append", default=[], dest="user_ids", help="특정 사용자만 (여러 번 지정 가능)")
+    parser.add_argument("--missing-only", action="store_true", help="전사 결과가 없는 오디오가 있는 대화만")
+    parser.add_argument("--stale-model-only", action="store_true", help="현재 STT_MODEL로 재전사되지 않은 대화만")
+    parser.add_argument("--rpm", type=int, default=20, help="Whisper 분당 요청 한도 (0이면 무제한)")
+    parser.add_argument("--download-concurrency", type=int, default=4)
+    parser.add_argument("--transcribe-concurrency", type=int, default=4)
+    parser.add_argument("--write-batch-size", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=0, help="이번 실행에서 처리할 최대 대화 수 (0이면 전체)")
+    parser.add_argument("--refresh-cache", action="store_true", help="전사 캐시를 무시하고 결과를 교체 (전사 버그 수정 후)")
+    parser.add_argument(
+        "--keep-user-message",
+        action="store_false",
+        dest="rebuild_user_message",
+        help="user_message는 갱신하지 않음 (기본은 전사 결과로 재구성, 전사 결과가 없는 답변이 있는 대화는 기존 값 유지)"
+    )
+    parser.add_argument("--read-preference", default="secondaryPreferred", help="대상 조회 읽기 선호도")
+    parser.add_argument("--progress-interval", type=float, default=30, help="진행 상황 로그 주기 (초)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 지우고 처음부터")
+    parser.add_argument("--dry-run", action="store_true", help="대상 수만 확인")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(RetranscribeOptions(**vars(args))))
@@ -10,12 +10,37 @@ class Settings:
     VERSION: str = "0.1.0"
     DESCRIPTION: str = "치매 부양자를 위한 감정 분석 및 위로 메시지 제공 서비스"
     
-    HOST: str = "0.0.0.0"
-    PORT: int = 8000
-    DEBUG: bool = True
+    HOST: str = os.getenv("HOST", "0.0.0.0")
+    PORT: int = int(os.getenv("PORT", "8000"))
+    DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"  # true면 단일 프로세스 + 자동 재시작
+    WORKERS: int = int(os.getenv("WORKERS", "1"))  # 0이면 CPU 코어 수
+    SERVER_LOOP: str = os.getenv("SERVER_LOOP", "auto")  # auto / uvloop / asyncio
+    SERVER_HTTP: str = os.getenv("SERVER_HTTP", "auto")  # auto / httptools / h11
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", "2048"))
+    SERVER_KEEPALIVE_SECONDS: int = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "75"))  # 로드밸런서 유휴 타임아웃보다 길게
+    SERVER_LIMIT_CONCURRENCY: int = int(os.getenv("SERVER_LIMIT_CONCURRENCY", "0"))  # 워커당 동시 연결 한도 (초과 시 503, 0이면 무제한)
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = int(os.getenv("SERVER_GRACEFUL_SHUTDOWN_SECONDS", "30"))
+    FORWARDED_ALLOW_IPS: str = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+    ACCESS_LOG: bool = os.getenv("ACCESS_LOG", "true").lower() == "true"
+    HEALTH_CACHE_SECONDS: float = float(os.getenv("HEALTH_CACHE_SECONDS", "5"))  # /health/ready 결과 재사용 시간
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "2"))  # 의존성별 확인 제한 시간
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
     
     MONGODB_URL: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
     MONGODB_DATABASE: str = os.getenv("MONGODB_DATABASE", "database")
+    # 커넥션 풀은 워커 프로세스마다 생성 (서버 최대 연결 수 = MONGODB_MAX_POOL_SIZE x WORKERS)
+    MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+    MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "10"))  # 미리 열어두는 유휴 연결
+    MONGODB_MAX_IDLE_SECONDS: float = float(os.getenv("MONGODB_MAX_IDLE_SECONDS", "300"))
+    MONGODB_WAIT_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_SECONDS", "10"))
+    MONGODB_SERVER_SELECTION_TIMEOUT_SECONDS: float = float(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_SECONDS", "5"))
+    MONGODB_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("MONGODB_CONNECT_TIMEOUT_SECONDS", "5"))
+    MONGODB_SOCKET_TIMEOUT_SECONDS: float = float(os.getenv("MONGODB_SOCKET_TIMEOUT_SECONDS", "30"))
+    MONGODB_WRITE_CONCERN: str = os.getenv("MONGODB_WRITE_CONCERN", "majority")  # majority 또는 노드 수
+    MONGODB_WRITE_TIMEOUT_SECONDS: float = float(os.getenv("MONGODB_WRITE_TIMEOUT_SECONDS", "10"))
+    # primary / primaryPreferred / secondary / secondaryPreferred / nearest
+    MONGODB_REPORT_LIST_READ_PREFERENCE: str = os.getenv("MONGODB_REPORT_LIST_READ_PREFERENCE", "secondaryPreferred")
+    MONGODB_MAX_STALENESS_SECONDS: int = int(os.getenv("MONGODB_MAX_STALENESS_SECONDS", "90"))  # secondary 허용 복제 지연 (최소 90, -1이면 제한 없음)
     
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
@@ -23,6 +48,60 @@ class Settings:
     GCP_BUCKET_NAME: str = os.getenv("GCP_BUCKET_NAME", "moa-audio-storage")
     GCP_PROJECT_ID: str = os.getenv("GCP_PROJECT_ID", "")
     GOOGLE_APPLICATION_CREDENTIALS: str = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "")
+    GCS_UPLOAD_CHUNK_SIZE: int = int(os.getenv("GCS_UPLOAD_CHUNK_SIZE", str(256 * 1024)))  # 256KB 배수
+
+    AUDIO_CACHE_DIR: str = os.getenv("AUDIO_CACHE_DIR", "/tmp/moa-audio-cache")
+    AUDIO_CACHE_MAX_BYTES: int = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))  # 워커 프로세스당 용량, 0이면 비활성
+
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "300"))
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+
+    REPORT_DETAIL_CACHE_TTL_SECONDS: float = float(os.getenv("REPORT_DETAIL_CACHE_TTL_SECONDS", "3600"))
+    REPORT_LIST_CACHE_TTL_SECONDS: float = float(os.getenv("REPORT_LIST_CACHE_TTL_SECONDS", "30"))
+    REPORT_CACHE_MAX_SIZE: int = int(os.getenv("REPORT_CACHE_MAX_SIZE", "5000"))
+    REPORT_VERSION_CHECK_SECONDS: float = float(os.getenv("REPORT_VERSION_CHECK_SECONDS", "5"))  # If-None-Match 요청에서 저장본 버전 재확인 간격 (0이면 매번 확인)
+
+    STT_MAX_CONCURRENCY: int = int(os.getenv("STT_MAX_CONCURRENCY", "3"))
+    STT_BACKGROUND_DRAIN_SECONDS: float = float(os.getenv("STT_BACKGROUND_DRAIN_SECONDS", "10"))  # 종료 시 백그라운드 STT 완료 대기
+    TRANSCRIPTION_CACHE_TTL_SECONDS: int = int(os.getenv("TRANSCRIPTION_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    TRANSCRIPTION_CACHE_MEMORY_SIZE: int = int(os.getenv("TRANSCRIPTION_CACHE_MEMORY_SIZE", "1024"))
+
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "200"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "50"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    AI_REQUEST_TIMEOUT: float = float(os.getenv("AI_REQUEST_TIMEOUT", "60"))
+    AI_MAX_RETRIES: int = int(os.getenv("AI_MAX_RETRIES", "2"))  # 연결 오류 / 시간 초과 / 5xx 재시도 횟수 (RateLimiter.run에서 처리)
+
+    # 프로세스 단위 한도 (워커 수만큼 나눠서 설정, 0이면 무제한)
+    OPENAI_CHAT_RPM: int = int(os.getenv("OPENAI_CHAT_RPM", "500"))
+    OPENAI_CHAT_TPM: int = int(os.getenv("OPENAI_CHAT_TPM", "200000"))
+    OPENAI_AUDIO_RPM: int = int(os.getenv("OPENAI_AUDIO_RPM", "50"))
+    RATE_LIMIT_MAX_RETRIES: int = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "3"))
+    RATE_LIMIT_RETRY_BASE_SECONDS: float = float(os.getenv("RATE_LIMIT_RETRY_BASE_SECONDS", "1"))
+    RATE_LIMIT_MAX_QUEUE_SECONDS: float = float(os.getenv("RATE_LIMIT_MAX_QUEUE_SECONDS", "120"))
+
+    AI_CLIENT_TYPE: str = os.getenv("AI_CLIENT_TYPE", "composite")  # openai / gemini / composite
+    AI_PROVIDERS: list = [p.strip() for p in os.getenv("AI_PROVIDERS", "openai,gemini").split(",") if p.strip()]
+    AI_ROUTER_WINDOW_SIZE: int = int(os.getenv("AI_ROUTER_WINDOW_SIZE", "50"))
+    AI_CIRCUIT_MIN_REQUESTS: int = int(os.getenv("AI_CIRCUIT_MIN_REQUESTS", "5"))
+    AI_CIRCUIT_ERROR_RATE: float = float(os.getenv("AI_CIRCUIT_ERROR_RATE", "0.5"))
+    AI_CIRCUIT_SLOW_CALL_SECONDS: float = float(os.getenv("AI_CIRCUIT_SLOW_CALL_SECONDS", "45"))
+    AI_CIRCUIT_COOLDOWN_SECONDS: float = float(os.getenv("AI_CIRCUIT_COOLDOWN_SECONDS", "30"))
+    AI_HEDGE_ENABLED: bool = os.getenv("AI_HEDGE_ENABLED", "false").lower() == "true"
+    AI_HEDGE_QUANTILE: float = float(os.getenv("AI_HEDGE_QUANTILE", "0.9"))
+    AI_HEDGE_DEFAULT_DELAY_SECONDS: float = float(os.getenv("AI_HEDGE_DEFAULT_DELAY_SECONDS", "10"))
+    AI_HEDGE_MIN_DELAY_SECONDS: float = float(os.getenv("AI_HEDGE_MIN_DELAY_SECONDS", "1"))
+
+    REPORT_WORKER_COUNT: int = int(os.getenv("REPORT_WORKER_COUNT", "2"))
+    REPORT_JOB_MAX_ATTEMPTS: int = int(os.getenv("REPORT_JOB_MAX_ATTEMPTS", "3"))
+    REPORT_JOB_RETRY_BASE_SECONDS: float = float(os.getenv("REPORT_JOB_RETRY_BASE_SECONDS", "5"))
+    REPORT_JOB_POLL_INTERVAL: float = float(os.getenv("REPORT_JOB_POLL_INTERVAL", "2"))
+    REPORT_JOB_DRAIN_SECONDS: float = float(os.getenv("REPORT_JOB_DRAIN_SECONDS", "20"))  # 종료 시 진행 중 작업 완료 대기
+    REPORT_JOB_LEASE_SECONDS: float = float(os.getenv("REPORT_JOB_LEASE_SECONDS", "300"))
+    REPORT_STREAM_WAIT_SECONDS: float = float(os.getenv("REPORT_STREAM_WAIT_SECONDS", "120"))
+    REPORT_STREAM_POLL_INTERVAL: float = float(os.getenv("REPORT_STREAM_POLL_INTERVAL", "1"))
+    REPORT_STREAM_PROGRESS_INTERVAL: float = float(os.getenv("REPORT_STREAM_PROGRESS_INTERVAL", "0.5"))  # 다른 워커의 스트림용 진행 상황 저장 주기
 
     ALLOWED_ORIGINS: list = [
         "http://localhost:8080",
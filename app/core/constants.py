@@ -14,6 +14,7 @@ QUESTIONS = {
 
 # 오디오 파일 관련 상수
 MAX_AUDIO_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+AUDIO_SNIFF_LENGTH = 12  # 형식 판별에 사용하는 앞부분 바이트 수
 ALLOWED_AUDIO_TYPES = [
     "audio/wav",
     "audio/mpeg",
@@ -29,6 +30,13 @@ ALLOWED_AUDIO_TYPES = [
     "video/webm"
 ]
 
+# 준비 상태 확인 시 검사하는 GCS 권한 (업로드 / STT 다운로드 / 실패 시 삭제)
+GCS_REQUIRED_PERMISSIONS = [
+    "storage.objects.create",
+    "storage.objects.get",
+    "storage.objects.delete",
+]
+
 # AI 관련 상수
 DEFAULT_AI_SENTIMENT = "neutral"
 DEFAULT_AI_SCORE = 0.0
@@ -52,6 +60,13 @@ class Messages:
     STT_QUESTION_SUCCESS = "✅ 질문 {question_num} STT 완료: {text}..."
     STT_QUESTION_FAILED = "❌ 질문 {question_num} STT 실패: {error}"
     STT_FAILED = "❌ 전체 오디오 STT 처리 실패: {error}"
+    STT_BACKGROUND_SCHEDULED = "🕒 질문 {question_num} 백그라운드 STT 예약: {audio_uri}"
+    STT_BACKGROUND_SAVED = "✅ 질문 {question_num} 백그라운드 STT 결과 저장 완료"
+    STT_BACKGROUND_STALE = "⚠️ 질문 {question_num} 오디오가 교체되어 STT 결과를 저장하지 않습니다."
+    STT_BACKGROUND_FAILED = "❌ 질문 {question_num} 백그라운드 STT 실패: {error}"
+    STT_TRANSCRIPT_REUSED = "♻️ 질문 {question_num} 기존 STT 결과 재사용"
+    STT_BACKGROUND_DRAINING = "⏳ 진행 중인 백그라운드 STT {count}개 완료 대기 (최대 {timeout}초)"
+    STT_BACKGROUND_CANCELLED = "🛑 종료 대기 시간 초과로 백그라운드 STT {count}개 취소 (최종 답변 시 다시 변환)"
     
     AUDIO_URI_SAVE_SUCCESS = "✅ 질문 {question_number} 오디오 URI 저장 완료: {audio_uri}"
     AUDIO_URI_SAVE_FAILED = "❌ 오디오 URI 저장 실패: {error}"
@@ -64,6 +79,20 @@ class Messages:
     # 리포트 관련 성공 메시지
     REPORT_GENERATION_SUCCESS = "리포트 생성 및 저장 완료: user_id={user_id}"
     REPORT_SAVE_SUCCESS = "리포트 저장 완료 user_id={user_id} ts={timestamp}"
+    REPORT_GENERATION_QUEUED = "모든 답변이 저장되었습니다. 리포트를 생성하고 있습니다."
+    REPORT_JOB_ENQUEUED = "📥 리포트 작업 등록: conversation_id={conversation_id}"
+    REPORT_JOB_DONE = "✅ 리포트 작업 완료: conversation_id={conversation_id} attempts={attempts}"
+    REPORT_JOB_RETRY = "🔁 리포트 작업 재시도 예약: conversation_id={conversation_id} attempts={attempts} delay={delay}s"
+    REPORT_WORKERS_STARTED = "🚀 리포트 워커 {count}개 시작"
+    REPORT_WORKERS_DRAINING = "⏳ 진행 중인 리포트 작업 {count}개 완료 대기 (최대 {timeout}초)"
+    REPORT_WORKERS_STOPPED = "🛑 리포트 워커 종료"
+    REPORT_JOB_STREAMING = "📡 리포트 스트리밍 생성 시작: conversation_id={conversation_id}"
+    REPORT_JOB_RELEASED = "↩️ 리포트 작업 중단, 대기 상태로 반환: conversation_id={conversation_id}"
+    REPORT_JOB_LEASE_LOST = "⚠️ 리포트 작업 소유권 상실 (lease 만료 또는 재등록), 결과를 기록하지 않음: conversation_id={conversation_id}"
+    
+    # 상태 확인 관련 메시지
+    HEALTH_READY = "✅ 준비 상태 복구"
+    HEALTH_NOT_READY = "🚨 준비 상태 아님: {failed}"
     
     # 사용자 관련 메시지
     USER_LAST_ACTIVE_DEBUG = "사용자 활동 시간 업데이트: user_id={user_id}"
@@ -74,6 +103,8 @@ class ErrorMessages:
     QUESTION_NOT_FOUND = "질문 번호 {question_number}를 찾을 수 없습니다."
     UNSUPPORTED_AUDIO_FORMAT = "지원하지 않는 오디오 형식입니다. 지원 형식: {formats}"
     FILE_SIZE_EXCEEDED = "파일 크기가 {max_size}MB를 초과합니다."
+    AUDIO_FILE_MISSING = "오디오 파일(audio_file)이 포함되지 않았습니다."
+    MULTIPART_BOUNDARY_MISSING = "multipart/form-data 형식의 요청이 아닙니다."
     USER_NOT_FOUND = "사용자를 찾을 수 없습니다."
     AUDIO_FILE_NOT_FOUND = "오디오 파일을 찾을 수 없습니다."
     STT_TIMEOUT = "음성 변환 시간이 초과되었습니다."
@@ -89,14 +120,29 @@ class ErrorMessages:
     ENUM_VALIDATION_INVALID = "데이터 검증 실패: {field_name}이(가) 올바른 Enum 타입이 아닙니다."
     
     # 리포트 관련 에러 메시지
-    REPORT_EMPTY_RESPONSE = "리포트 응답이 비어있음"
     REPORT_SAVE_FAILED = "리포트 저장 실패: {error}"
     REPORT_GENERATION_FAILED = "리포트 생성 실패 (전체 프로세스는 계속): {error}"
     REPORT_GENERATION_EXCEPTION = "리포트 생성 예외 상세:"
     REPORT_SAVE_EXCEPTION = "리포트 저장 예외 상세:"
-    REPORT_SERVICE_GENERATION_ERROR = "리포트 생성 오류: {error}"
-    REPORT_SERVICE_GENERATION_EXCEPTION = "리포트 생성 예외 상세:"
+    REPORT_MONTH_WITHOUT_YEAR = "월(month)을 지정하려면 연도(year)도 함께 지정해야 합니다."
+    REPORT_INVALID_CURSOR = "잘못된 cursor 형식입니다. (YYYY-MM-DD)"
     REPORT_SERVICE_FALLBACK_ERROR = "리포트 생성 중 오류가 발생했습니다. 잠시 후 다시 시도해 주세요."
+    REPORT_JOB_FAILED = "❌ 리포트 작업 최종 실패: conversation_id={conversation_id} error={error}"
+    REPORT_JOB_HEARTBEAT_FAILED = "⚠️ 리포트 작업 lease 갱신 실패: {error}"
+    REPORT_JOB_PROGRESS_SAVE_FAILED = "⚠️ 리포트 진행 상황 저장 실패: {error}"
+    REPORT_JOB_CONVERSATION_MISSING = "리포트 작업 대상 Conversation이 없습니다: {conversation_id}"
+    REPORT_JOB_ENQUEUE_FAILED = "리포트 작업 등록 실패: {error}"
+    REPORT_WORKER_EXCEPTION = "리포트 워커 예외 상세:"
+    REPORT_STREAM_INCOMPLETE = "AI 응답 스트림이 완전한 JSON으로 끝나지 않았습니다."
+    AI_RATE_LIMITED = "요청이 많아 음성 변환이 지연되고 있습니다. 잠시 후 다시 시도해 주세요."
+    REPORT_STREAM_FAILED = "❌ 리포트 스트리밍 실패: report_id={report_id} error={error}"
+    REPORT_STREAM_TIMEOUT = "리포트 생성 대기 시간이 초과되었습니다. 잠시 후 다시 조회해 주세요."
+    
+    # 상태 확인 관련 에러 메시지
+    HEALTH_CHECK_TIMEOUT = "{timeout}초 안에 응답하지 않음"
+    HEALTH_MONGO_NOT_CONNECTED = "MongoDB 클라이언트가 연결되지 않음"
+    HEALTH_GCS_PERMISSION_MISSING = "GCS 권한 부족: {permissions}"
+    HEALTH_AI_UNAVAILABLE = "사용 가능한 AI 제공자가 없음"
     
     # 사용자 관련 에러 메시지
     USER_LAST_ACTIVE_UPDATE_FAILED = "사용자 활동 시간 업데이트 실패: {error}"
@@ -111,6 +157,7 @@ class Defaults:
     CONVERSATION_PROCESSED_STATUS = True
     USER_MESSAGE_EMPTY = ""
     HISTORY_LIMIT = 10
+    REPORT_PAGE_SIZE = 31
     TEXT_PREVIEW_LENGTH = 50
 
 # 파일 형식 상수
@@ -0,0 +1,93 @@
+"""
+서비스 / 외부 클라이언트 인스턴스 컨테이너
+
+- import 시점에는 아무것도 만들지 않고, 처음 요청될 때 생성해 프로세스 안에서 공유
+- lifespan 종료 시 생성 역순으로 정리
+- fork된 자식 프로세스는 부모가 만든 인스턴스(소켓, 스레드, 이벤트 루프에 묶인 객체)를 닫지 않고 버린 뒤 새로 생성
+"""
+import inspect
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ServiceContainer:
+    """키별 인스턴스를 지연 생성하는 컨테이너 (이벤트 루프 스레드에서 사용)"""
+
+    def __init__(self):
+        self._instances: Dict[str, Any] = {}
+        self._closers: Dict[str, Callable[[Any], Any]] = {}
+
+    def resolve(self, key: str, factory: Callable[[], T], close: Optional[Callable[[T], Any]] = None) -> T:
+        """
+        key에 해당하는 인스턴스를 반환하고, 없으면 factory로 생성합니다.
+
+        Args:
+            key: 인스턴스 이름
+            factory: 생성 함수 (다른 인스턴스를 resolve해도 됨)
+            close: 종료 시 호출할 정리 함수 (코루틴 함수도 가능)
+        """
+        instance = self._instances.get(key)
+        if instance is None:
+            instance = factory()
+            self._instances[key] = instance
+            if close is not None:
+                self._closers[key] = close
+            logger.debug(f"🧩 인스턴스 생성: {key}")
+        return instance
+
+    def created(self) -> List[str]:
+        """생성된 인스턴스 이름 (생성 순서)"""
+        return list(self._instances)
+
+    async def close(self) -> None:
+        """생성 역순으로 정리 함수 호출 (하나가 실패해도 나머지는 계속 정리)"""
+        for key in reversed(list(self._instances)):
+            close = self._closers.get(key)
+            if close is None:
+                continue
+            try:
+                result = close(self._instances[key])
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"⚠️ {key} 정리 실패: {e}")
+        self._instances.clear()
+        self._closers.clear()
+
+    def reset(self) -> None:
+        """fork 후 부모 프로세스의 인스턴스를 정리 없이 버림"""
+        self._instances.clear()
+        self._closers.clear()
+
+
+_container: Optional[ServiceContainer] = None
+
+
+def get_container() -> ServiceContainer:
+    """프로세스 전역 컨테이너 (lifespan 밖에서 사용하는 스크립트는 처음 호출 시 생성)"""
+    global _container
+    if _container is None:
+        _container = ServiceContainer()
+    return _container
+
+
+async def close_container() -> None:
+    """컨테이너의 모든 인스턴스 정리"""
+    global _container
+    if _container is not None:
+        await _container.close()
+        logger.info("🔌 서비스 컨테이너 종료")
+    _container = None
+
+
+def _reset_after_fork() -> None:
+    if _container is not None:
+        _container.reset()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
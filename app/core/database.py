@@ -1,39 +1,298 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from beanie import init_beanie
+import threading
+import time
+from typing import Any, Dict, List, Tuple, Type
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from beanie import Document, init_beanie
+from pymongo import IndexModel, monitoring
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
 from app.core.config import settings
-from app.models.models import Conversation, User
+from app.core.metrics import MONGO_POOL_CHECKOUT, MONGO_POOL_CONNECTIONS, MONGO_POOL_WAIT_QUEUE
+from app.models.models import Conversation, User, Report, ReportJob, TranscriptionCache
 import logging
 
 logger = logging.getLogger(__name__)
 
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+class MongoPoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    커넥션 풀 이벤트를 서버 주소별로 집계하고 Prometheus 지표로 내보냄
+    (pymongo 백그라운드 스레드에서도 호출되므로 잠금 사용)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: Dict[str, Dict[str, int]] = {}
+
+    def _update(self, address, **deltas: int) -> None:
+        key = f"{address[0]}:{address[1]}"
+        with self._lock:
+            pool = self._pools.setdefault(
+                key, {"open": 0, "checked_out": 0, "wait_queue": 0, "checkout_failed": 0}
+            )
+            for name, delta in deltas.items():
+                pool[name] += delta
+
+    def pool_created(self, event):
+        self._update(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        logger.warning(f"⚠️ MongoDB 커넥션 풀 초기화: {event.address}")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._update(event.address, open=1)
+        MONGO_POOL_CONNECTIONS.labels(state="open").inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(event.address, open=-1)
+        MONGO_POOL_CONNECTIONS.labels(state="open").dec()
+
+    def connection_check_out_started(self, event):
+        self._update(event.address, wait_queue=1)
+        MONGO_POOL_WAIT_QUEUE.inc()
+
+    def connection_checked_out(self, event):
+        self._update(event.address, wait_queue=-1, checked_out=1)
+        MONGO_POOL_WAIT_QUEUE.dec()
+        MONGO_POOL_CONNECTIONS.labels(state="checked_out").inc()
+        if event.duration is not None:
+            MONGO_POOL_CHECKOUT.labels(outcome="success").observe(event.duration)
+
+    def connection_check_out_failed(self, event):
+        self._update(event.address, wait_queue=-1, checkout_failed=1)
+        MONGO_POOL_WAIT_QUEUE.dec()
+        if event.duration is not None:
+            MONGO_POOL_CHECKOUT.labels(outcome=event.reason).observe(event.duration)
+
+    def connection_checked_in(self, event):
+        self._update(event.address, checked_out=-1)
+        MONGO_POOL_CONNECTIONS.labels(state="checked_out").dec()
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {address: dict(pool) for address, pool in self._pools.items()}
+
+
 class Database:
     client: AsyncIOMotorClient = None
+    pool_monitor: MongoPoolMonitor = None
     
 db = Database()
 
-async def connect_to_mongo():
-    """MongoDB 연결"""
+DOCUMENT_MODELS: List[Type[Document]] = [Conversation, User, Report, ReportJob, TranscriptionCache]
+LEGACY_CONVERSATION_INDEX = "user_id_1_conversation_date_1"
+LEGACY_CONVERSATION_LISTING_INDEX = "user_id_conversation_date_id_listing"
+CONVERSATION_DAY_KEYS = [("user_id", 1), ("conversation_date", 1)]
+DUPLICATE_EXAMPLE_LIMIT = 5
+
+
+def duplicate_conversations_pipeline() -> List[Dict[str, Any]]:
+    """(user_id, conversation_date)가 같은 Conversation 묶음 (고유 인덱스 생성 전 확인 / 정리 명령어에서 공용)"""
+    return [
+        {"$group": {
+            "_id": {"user_id": "$user_id", "conversation_date": "$conversation_date"},
+            "ids": {"$push": "$_id"},
+            "count": {"$sum": 1},
+        }},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+
+def build_client_options() -> Dict[str, Any]:
+    """설정값으로 커넥션 풀 / 타임아웃 / 쓰기 확인 옵션 구성"""
+    write_concern = settings.MONGODB_WRITE_CONCERN
+    return {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": int(settings.MONGODB_MAX_IDLE_SECONDS * 1000),
+        "waitQueueTimeoutMS": int(settings.MONGODB_WAIT_QUEUE_TIMEOUT_SECONDS * 1000),
+        "serverSelectionTimeoutMS": int(settings.MONGODB_SERVER_SELECTION_TIMEOUT_SECONDS * 1000),
+        "connectTimeoutMS": int(settings.MONGODB_CONNECT_TIMEOUT_SECONDS * 1000),
+        "socketTimeoutMS": int(settings.MONGODB_SOCKET_TIMEOUT_SECONDS * 1000),
+        "w": int(write_concern) if write_concern.isdigit() else write_concern,
+        "wTimeoutMS": int(settings.MONGODB_WRITE_TIMEOUT_SECONDS * 1000),
+        "appname": settings.PROJECT_NAME,
+    }
+
+def read_preference(mode: str):
+    """
+    읽기 선호도 이름을 pymongo 객체로 변환 (secondary 계열은 MONGODB_MAX_STALENESS_SECONDS 적용)
+
+    Raises:
+        ValueError: 지원하지 않는 이름
+    """
+    if mode not in READ_PREFERENCES:
+        raise ValueError(f"지원하지 않는 읽기 선호도: {mode} ({', '.join(READ_PREFERENCES)})")
+    if mode == "primary":
+        return Primary()
+    return READ_PREFERENCES[mode](max_staleness=settings.MONGODB_MAX_STALENESS_SECONDS)
+
+def collection_for_read(model: Type[Document], mode: str) -> AsyncIOMotorCollection:
+    """읽기 선호도를 적용한 model 컬렉션 (쓰기에는 사용하지 않음)"""
+    if mode == "primary":
+        return model.get_motor_collection()
+    return model.get_motor_collection().with_options(read_preference=read_preference(mode))
+
+async def check_mongo_ready() -> float:
+    """
+    ping으로 서버 선택 / 연결이 가능한지 확인합니다.
+    (MONGODB_SERVER_SELECTION_TIMEOUT_SECONDS 안에 응답이 없으면 예외)
+
+    Returns:
+        float: ping 응답 시간 (초)
+    """
+    started = time.perf_counter()
+    await db.client.admin.command("ping")
+    return time.perf_counter() - started
+
+async def connect_to_mongo(manage_indexes: bool = True):
+    """
+    MongoDB 연결 (연결 / 인덱스 확인에 실패하면 예외를 전달해 시작을 중단)
+
+    Args:
+        manage_indexes: False면 인덱스 교체 / 생성 / 확인을 건너뜀 (인덱스를 만들 수 없는 상태를 정리하는 명령어용)
+    """
     try:
-        db.client = AsyncIOMotorClient(settings.MONGODB_URL)
+        read_preference(settings.MONGODB_REPORT_LIST_READ_PREFERENCE)
+        db.pool_monitor = MongoPoolMonitor()
+        db.client = AsyncIOMotorClient(
+            settings.MONGODB_URL,
+            event_listeners=[db.pool_monitor],
+            **build_client_options()
+        )
+        elapsed = await check_mongo_ready()
+        logger.info(f"🏓 MongoDB ping {elapsed * 1000:.1f}ms")
         
         database = db.client[settings.MONGODB_DATABASE]
+        legacy_dropped = await _drop_legacy_indexes(database) if manage_indexes else False
         
-        await init_beanie(
-            database=database,
-            document_models=[Conversation, User]
-        )
+        try:
+            await init_beanie(
+                database=database,
+                document_models=DOCUMENT_MODELS,
+                skip_indexes=not manage_indexes
+            )
+        except Exception:
+            if legacy_dropped:
+                await _restore_legacy_index(database)
+            raise
+        if manage_indexes:
+            await verify_indexes(DOCUMENT_MODELS)
         
         logger.info("✅ MongoDB 연결 성공")
         
     except Exception as e:
         logger.error(f"❌ MongoDB 연결 실패: {e}")
+        await close_mongo_connection()
+        raise
+
+async def _drop_legacy_indexes(database) -> bool:
+    """
+    더 이상 사용하지 않는 conversations 인덱스 제거
+    - 고유 인덱스로 교체된 비고유 인덱스 (같은 키 패턴은 옵션만 바꿔 재생성할 수 없음)
+      중복 대화가 있으면 고유 인덱스를 만들 수 없으므로 제거하지 않고 시작을 중단
+    - reports 컬렉션으로 옮겨간 목록 조회 인덱스
+
+    Returns:
+        bool: 비고유 인덱스를 제거했는지 여부 (고유 인덱스 생성이 실패하면 되돌림)
+    """
+    collection = database[Conversation.Settings.name]
+    index_info = await collection.index_information()
+    
+    dropped = False
+    legacy = index_info.get(LEGACY_CONVERSATION_INDEX)
+    if legacy and not legacy.get("unique"):
+        await _ensure_no_duplicate_conversations(collection)
+        await collection.drop_index(LEGACY_CONVERSATION_INDEX)
+        dropped = True
+        logger.info(f"🗂️ 기존 비고유 인덱스 제거: {LEGACY_CONVERSATION_INDEX}")
+    
+    if LEGACY_CONVERSATION_LISTING_INDEX in index_info:
+        await collection.drop_index(LEGACY_CONVERSATION_LISTING_INDEX)
+        logger.info(f"🗂️ 기존 목록 조회 인덱스 제거: {LEGACY_CONVERSATION_LISTING_INDEX}")
+    return dropped
+
+async def _ensure_no_duplicate_conversations(collection):
+    """
+    고유 인덱스 생성 전 중복 확인
+
+    Raises:
+        RuntimeError: (user_id, conversation_date)가 같은 Conversation이 있는 경우
+    """
+    pipeline = [*duplicate_conversations_pipeline(), {"$limit": DUPLICATE_EXAMPLE_LIMIT}]
+    duplicates = await collection.aggregate(pipeline, allowDiskUse=True).to_list(None)
+    if duplicates:
+        examples = ", ".join(
+            f"{group['_id']['user_id']}/{group['_id']['conversation_date']:%Y-%m-%d}({group['count']}건)"
+            for group in duplicates
+        )
+        raise RuntimeError(
+            f"conversations에 (user_id, conversation_date) 중복이 있어 고유 인덱스를 만들 수 없습니다. "
+            f"기존 인덱스는 유지합니다. python -m app.commands.dedupe_conversations로 정리 후 다시 시작하세요. "
+            f"(예: {examples})"
+        )
+
+async def _restore_legacy_index(database):
+    """고유 인덱스 생성이 실패하면 조회용 비고유 인덱스를 다시 만듦 (다음 시작 때 다시 교체)"""
+    try:
+        await database[Conversation.Settings.name].create_index(CONVERSATION_DAY_KEYS, name=LEGACY_CONVERSATION_INDEX)
+        logger.warning(f"↩️ 고유 인덱스 생성 실패로 기존 비고유 인덱스 복구: {LEGACY_CONVERSATION_INDEX}")
+    except Exception as e:
+        logger.error(f"❌ 기존 비고유 인덱스 복구 실패: {e}")
+
+def _index_keys(index) -> Tuple:
+    """Settings.indexes 항목을 (필드, 방향) 튜플로 정규화"""
+    if isinstance(index, IndexModel):
+        return tuple(index.document["key"].items())
+    if isinstance(index, str):
+        return ((index, 1),)
+    return tuple((field, direction) for field, direction in index)
+
+async def verify_indexes(document_models: List[Type[Document]]):
+    """모든 Beanie 문서의 선언된 인덱스가 실제로 존재하는지 확인"""
+    for model in document_models:
+        declared = [_index_keys(index) for index in getattr(model.Settings, "indexes", [])]
+        if not declared:
+            continue
+        
+        index_info = await model.get_motor_collection().index_information()
+        existing = {tuple(info["key"]) for info in index_info.values()}
+        missing = [keys for keys in declared if keys not in existing]
+        
+        if missing:
+            raise RuntimeError(f"{model.Settings.name} 컬렉션 인덱스 누락: {missing}")
+        logger.info(f"🗂️ {model.Settings.name} 인덱스 확인 완료 ({len(declared)}개)")
 
 async def close_mongo_connection():
     """MongoDB 연결 종료"""
     if db.client:
         db.client.close()
+        db.client = None
         logger.info("🔌 MongoDB 연결 종료")
 
+def get_mongo_pool_stats() -> Dict[str, Any]:
+    """서버 주소별 커넥션 풀 상태 (열린 연결 / 사용 중 / 대기 / 확보 실패 수)"""
+    return {
+        "max_pool_size": settings.MONGODB_MAX_POOL_SIZE,
+        "min_pool_size": settings.MONGODB_MIN_POOL_SIZE,
+        "pools": db.pool_monitor.get_stats() if db.pool_monitor else {},
+    }
+
 def get_database():
     """데이터베이스 인스턴스 반환"""
     return db.client[settings.MONGODB_DATABASE]
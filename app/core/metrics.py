@@ -0,0 +1,190 @@
+"""
+단계별 지연 시간 계측 (Prometheus 히스토그램 + Server-Timing 헤더)
+"""
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+
+# STT / LLM 호출이 수십 초까지 걸리므로 기본 버킷보다 넓게 설정
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+STAGE_LATENCY = Histogram(
+    "moa_stage_duration_seconds",
+    "처리 단계별 소요 시간",
+    ["stage", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+AI_REQUEST_LATENCY = Histogram(
+    "moa_ai_request_duration_seconds",
+    "AI 제공자 API 호출 소요 시간",
+    ["provider", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+AI_STREAM_FIRST_CHUNK = Histogram(
+    "moa_ai_stream_first_chunk_seconds",
+    "AI 스트리밍 응답의 첫 조각까지 걸린 시간",
+    ["provider"],
+    buckets=LATENCY_BUCKETS,
+)
+AI_RESPONSE_CHARACTERS = Counter(
+    "moa_ai_response_characters_total",
+    "AI 응답 텍스트 길이 합계",
+    ["provider", "operation"],
+)
+RATE_LIMIT_QUEUE_DEPTH = Gauge(
+    "moa_rate_limit_queue_depth",
+    "속도 제한기 대기 중인 요청 수",
+    ["limiter"],
+    multiprocess_mode="livesum",
+)
+RATE_LIMIT_THROTTLED = Counter(
+    "moa_rate_limit_throttled_total",
+    "429 응답 수",
+    ["limiter"],
+)
+
+MONGO_POOL_CONNECTIONS = Gauge(
+    "moa_mongo_pool_connections",
+    "MongoDB 커넥션 풀 연결 수 (open: 열린 연결, checked_out: 사용 중)",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+MONGO_POOL_WAIT_QUEUE = Gauge(
+    "moa_mongo_pool_wait_queue",
+    "MongoDB 커넥션을 기다리는 작업 수",
+    multiprocess_mode="livesum",
+)
+MONGO_POOL_CHECKOUT = Histogram(
+    "moa_mongo_pool_checkout_seconds",
+    "MongoDB 커넥션 확보까지 걸린 시간",
+    ["outcome"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+_server_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("server_timings", default=None)
+
+
+@contextmanager
+def track_stage(stage: str) -> Iterator[None]:
+    """
+    블록 실행 시간을 단계 히스토그램에 기록하고, 요청 처리 중이면 Server-Timing 항목으로도 남깁니다.
+
+    Args:
+        stage: 단계 이름 (Server-Timing 토큰으로 쓰이므로 공백 없이)
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_LATENCY.labels(stage=stage, outcome=outcome).observe(elapsed)
+        timings = _server_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+
+@contextmanager
+def track_ai_request(provider: str, operation: str) -> Iterator[None]:
+    """AI API 호출 시간을 제공자/작업별로 기록"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        AI_REQUEST_LATENCY.labels(provider=provider, operation=operation, outcome=outcome).observe(
+            time.perf_counter() - started
+        )
+
+
+class AIStreamTimer:
+    """
+    스트리밍 AI 응답의 첫 조각까지 시간과 전체 시간을 기록합니다.
+    (속도 제한 대기 시간을 빼기 위해 실제 요청 직전에 start 호출)
+    """
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self._started: Optional[float] = None
+        self._first_chunk_seen = False
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+
+    def chunk(self, text: str) -> None:
+        if self._started is None:
+            return
+        if not self._first_chunk_seen:
+            self._first_chunk_seen = True
+            AI_STREAM_FIRST_CHUNK.labels(provider=self.provider).observe(time.perf_counter() - self._started)
+        AI_RESPONSE_CHARACTERS.labels(provider=self.provider, operation="chat_stream").inc(len(text))
+
+    def finish(self, success: bool) -> None:
+        if self._started is None:
+            return
+        AI_REQUEST_LATENCY.labels(
+            provider=self.provider,
+            operation="chat_stream",
+            outcome="success" if success else "error"
+        ).observe(time.perf_counter() - self._started)
+
+
+class ServerTimingMiddleware:
+    """
+    요청 중 기록된 단계 시간을 Server-Timing 응답 헤더로 전달하는 ASGI 미들웨어
+    (SERVER_TIMING_ENABLED일 때만 등록)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: List[Tuple[str, float]] = []
+        token = _server_timings.set(timings)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                entries = [f"{name};dur={elapsed * 1000:.1f}" for name, elapsed in timings]
+                entries.append(f"total;dur={(time.perf_counter() - started) * 1000:.1f}")
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", ", ".join(entries).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _server_timings.reset(token)
+
+
+def _multiprocess_enabled() -> bool:
+    return bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render_metrics() -> bytes:
+    """
+    /metrics 응답 본문
+    워커가 여러 개면(PROMETHEUS_MULTIPROC_DIR) 모든 워커 프로세스의 지표 파일을 합쳐서 반환합니다.
+    """
+    if not _multiprocess_enabled():
+        return generate_latest()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def mark_worker_stopped() -> None:
+    """정상 종료하는 워커의 live 게이지 값 제거 (livesum 게이지에서 빠지도록)"""
+    if _multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
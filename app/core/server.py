@@ -0,0 +1,95 @@
+"""
+uvicorn 실행 옵션 구성
+
+- DEBUG: 단일 프로세스 + 코드 변경 시 자동 재시작
+- 운영: WORKERS 개수만큼 프로세스 실행, uvloop / httptools가 설치되어 있으면 사용
+- 여러 워커가 Prometheus 지표를 함께 내보내도록 PROMETHEUS_MULTIPROC_DIR 준비
+"""
+import importlib.util
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, Dict
+
+from app.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+APP_IMPORT_STRING = "app.main:app"
+
+
+def resolve_worker_count(settings: Settings) -> int:
+    """WORKERS 설정값 (0이면 CPU 코어 수)"""
+    if settings.WORKERS > 0:
+        return settings.WORKERS
+    return os.cpu_count() or 1
+
+
+def _resolve_implementation(value: str, module: str, fallback: str) -> str:
+    """auto이면 module 설치 여부에 따라 선택"""
+    if value != "auto":
+        return value
+    return module if importlib.util.find_spec(module) is not None else fallback
+
+
+def prepare_multiprocess_metrics(workers: int, port: int) -> None:
+    """
+    워커가 여러 개면 Prometheus 지표 디렉터리를 비우고 환경 변수로 전달합니다.
+    (prometheus_client가 import 시점에 읽으므로 워커 프로세스 시작 전에 호출)
+
+    Args:
+        workers: 워커 프로세스 수
+        port: 서버 포트 (디렉터리를 지정하지 않았을 때 포트별 고정 경로 사용)
+    """
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not directory:
+        if workers <= 1:
+            return
+        directory = os.path.join(tempfile.gettempdir(), f"moa-prometheus-{port}")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+
+    # 이전 실행에서 남은 지표 파일 제거
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+    logger.info(f"📈 Prometheus 멀티프로세스 지표 디렉터리: {directory}")
+
+
+def build_server_options(settings: Settings) -> Dict[str, Any]:
+    """
+    설정값으로 uvicorn.run 인자를 만듭니다.
+
+    Returns:
+        Dict[str, Any]: uvicorn.run 키워드 인자 (앱은 APP_IMPORT_STRING으로 전달)
+    """
+    options: Dict[str, Any] = {
+        "host": settings.HOST,
+        "port": settings.PORT,
+        "loop": _resolve_implementation(settings.SERVER_LOOP, "uvloop", "asyncio"),
+        "http": _resolve_implementation(settings.SERVER_HTTP, "httptools", "h11"),
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_SECONDS,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        "limit_concurrency": settings.SERVER_LIMIT_CONCURRENCY or None,
+        "proxy_headers": True,
+        "forwarded_allow_ips": settings.FORWARDED_ALLOW_IPS,
+        "access_log": settings.ACCESS_LOG,
+    }
+    if settings.DEBUG:
+        options.update(reload=True, reload_dirs=["./app"])
+    else:
+        options["workers"] = resolve_worker_count(settings)
+    return options
+
+
+def log_server_options(options: Dict[str, Any]) -> None:
+    """실행 옵션 요약 로그"""
+    logger.info(
+        f"🚀 서버 시작: {options['host']}:{options['port']} "
+        f"workers={options.get('workers', 1)} reload={options.get('reload', False)} "
+        f"loop={options['loop']} http={options['http']} "
+        f"keep-alive={options['timeout_keep_alive']}s backlog={options['backlog']}"
+    )
+    if options.get("workers", 1) > 1 and options["loop"] == "asyncio":
+        # 워커가 여러 개면 uvicorn이 직접 만든 소켓(proto=0)을 넘겨받아 asyncio가 TCP_NODELAY를 설정하지 않음
+        logger.warning("⚠️ asyncio 루프 + 다중 워커는 응답마다 Nagle 지연(~40ms)이 생길 수 있으니 uvloop 사용을 권장합니다")
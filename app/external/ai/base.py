@@ -2,7 +2,9 @@
 AI 클라이언트 기본 추상 클래스
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional, Type
+
+from pydantic import BaseModel, ValidationError
 
 
 class AIClient(ABC):
@@ -21,20 +23,62 @@ class AIClient(ABC):
         """
         pass
     
+    async def generate_content_stream(
+        self,
+        prompt: str,
+        response_model: Optional[Type[BaseModel]] = None
+    ) -> AsyncIterator[str]:
+        """
+        AI 응답을 생성되는 대로 조각 단위로 반환합니다.
+        (스트리밍을 지원하지 않는 클라이언트는 전체 응답을 한 번에 반환)
+        
+        Args:
+            prompt (str): AI에게 전달할 프롬프트
+            response_model: 지정 시 제공자의 JSON 출력 모드 사용
+            
+        Yields:
+            str: 새로 생성된 응답 텍스트 조각
+        """
+        yield await self.generate_content(prompt)
+    
     @abstractmethod
-    async def generate_structured_content(self, prompt: str, expected_format: str = "json") -> Dict[str, Any]:
+    async def generate_structured_content(
+        self,
+        prompt: str,
+        expected_format: str = "json",
+        response_model: Optional[Type[BaseModel]] = None
+    ) -> Dict[str, Any]:
         """
         구조화된 응답을 생성합니다.
         
         Args:
             prompt (str): AI에게 전달할 프롬프트
             expected_format (str): 기대하는 응답 형식 (json, xml 등)
+            response_model: 응답 형식을 정의한 pydantic 모델 (제공자 응답 스키마 및 검증에 사용)
             
         Returns:
             Dict[str, Any]: 구조화된 응답 데이터
         """
         pass
     
+    def _validate_response(
+        self,
+        data: Dict[str, Any],
+        response_model: Optional[Type[BaseModel]]
+    ) -> Dict[str, Any]:
+        """
+        구조화된 응답을 response_model로 검증합니다.
+        
+        Raises:
+            ValueError: 응답이 response_model과 맞지 않는 경우
+        """
+        if response_model is None:
+            return data
+        try:
+            return response_model.model_validate(data).model_dump()
+        except ValidationError as e:
+            raise ValueError(f"AI 응답이 응답 스키마와 맞지 않습니다: {e}")
+    
     @abstractmethod
     def is_available(self) -> bool:
         """
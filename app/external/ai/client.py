@@ -2,10 +2,11 @@
 AI 클라이언트 팩토리
 """
 import logging
-from typing import Optional
+import os
 
+from app.core.config import settings
 from app.external.ai.base import AIClient
-from app.external.ai.gemini import GeminiClient
+from app.external.ai.composite import CompositeAIClient, get_served_provider
 from app.external.ai.openai import OpenAIClient
 
 logger = logging.getLogger(__name__)
@@ -22,7 +23,8 @@ class AIClientFactory:
         AI 클라이언트 인스턴스를 반환합니다.
         
         Args:
-            client_type (str): 클라이언트 타입 ("openai", "gemini")
+            client_type (str): 클라이언트 타입 ("openai", "gemini", "composite")
+                composite는 AI_PROVIDERS의 제공자들을 지연 시간/서킷 상태에 따라 라우팅
             
         Returns:
             AIClient: AI 클라이언트 인스턴스
@@ -31,7 +33,13 @@ class AIClientFactory:
             if client_type == "openai":
                 cls._instances[client_type] = OpenAIClient()
             elif client_type == "gemini":
+                # google.generativeai import가 무거우므로 Gemini를 사용할 때만 불러옴
+                from app.external.ai.gemini import GeminiClient
                 cls._instances[client_type] = GeminiClient()
+            elif client_type == "composite":
+                cls._instances[client_type] = CompositeAIClient(
+                    {name: cls.get_client(name) for name in settings.AI_PROVIDERS}
+                )
             else:
                 raise ValueError(f"지원하지 않는 AI 클라이언트 타입: {client_type}")
         
@@ -43,13 +51,17 @@ class AIClientFactory:
         cls._instances = {}
 
 
+# fork된 워커는 부모의 클라이언트(gRPC 채널 등)를 공유하지 않고 새로 생성
+os.register_at_fork(after_in_child=AIClientFactory.reset_clients)
+
+
 # 편의 함수
-def get_ai_client(client_type: str = "openai") -> AIClient:
+def get_ai_client(client_type: str = settings.AI_CLIENT_TYPE) -> AIClient:
     """
     기본 AI 클라이언트를 반환합니다.
     
     Args:
-        client_type (str): 클라이언트 타입 (기본값: "openai")
+        client_type (str): 클라이언트 타입 (기본값: AI_CLIENT_TYPE 설정)
         
     Returns:
         AIClient: AI 클라이언트 인스턴스
@@ -0,0 +1,350 @@
+"""
+여러 AI 제공자를 묶는 복합 클라이언트 (지연 시간 기반 라우팅 + 서킷 브레이커 + 헤징)
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.external.ai.base import AIClient
+from app.external.rate_limiter import get_queue_wait_seconds
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_NO_PROVIDER_MESSAGE = "사용 가능한 AI 제공자가 없습니다."
+
+_served_provider: ContextVar[Optional[str]] = ContextVar("ai_served_provider", default=None)
+
+
+def get_served_provider() -> Optional[str]:
+    """현재 요청(태스크)에서 마지막으로 응답한 AI 제공자 이름"""
+    return _served_provider.get()
+
+
+def _elapsed(started: float, queued_before: float) -> float:
+    """started 이후 경과 시간 (클라이언트 측 속도 제한 대기열에서 기다린 시간은 제외)"""
+    return time.monotonic() - started - (get_queue_wait_seconds() - queued_before)
+
+
+async def _close_stream(stream: AsyncIterator[str]) -> None:
+    """사용하지 않는 스트림 정리 (연결 반환)"""
+    close = getattr(stream, "aclose", None)
+    if close is not None:
+        await close()
+
+
+class ProviderHealth:
+    """제공자별 최근 호출 윈도우 (지연 시간 / 오류율) 및 서킷 상태"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.served = 0
+        self.hedged = 0
+        self._window: Deque[Tuple[float, bool]] = deque(maxlen=settings.AI_ROUTER_WINDOW_SIZE)
+        self._probe_started_at: Optional[float] = None
+
+    def may_allow(self) -> bool:
+        """allow_request가 허용할지 상태를 바꾸지 않고 확인 (후보 선정용, 시험 요청을 소비하지 않음)"""
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            return now - self.opened_at >= settings.AI_CIRCUIT_COOLDOWN_SECONDS
+        # 시험 요청이 결과 없이 쿨다운을 넘기면 (취소됨) 다시 허용
+        return (
+            self._probe_started_at is None
+            or now - self._probe_started_at >= settings.AI_CIRCUIT_COOLDOWN_SECONDS
+        )
+
+    def allow_request(self) -> bool:
+        """
+        서킷 상태에 따라 요청 허용 여부 판단 (쿨다운이 지나면 시험 요청 1건 허용)
+        실제로 요청을 보낼 때만 호출합니다. (반열림 상태에서는 시험 요청을 소비)
+        """
+        if not self.may_allow():
+            return False
+        if self.state != self.CLOSED:
+            self.state = self.HALF_OPEN
+            self._probe_started_at = time.monotonic()
+        return True
+
+    def record(self, latency: float, success: bool) -> None:
+        """호출 결과 기록 (느린 호출도 서킷 판단에서는 실패로 간주)"""
+        healthy = success and latency <= settings.AI_CIRCUIT_SLOW_CALL_SECONDS
+        self._window.append((latency, healthy))
+
+        if self.state == self.HALF_OPEN:
+            if healthy:
+                self.state = self.CLOSED
+                self._window.clear()
+                self._window.append((latency, healthy))
+                logger.info(f"🟢 AI 제공자 서킷 닫힘: {self.name}")
+            else:
+                self._open()
+            return
+
+        if (
+            self.state == self.CLOSED
+            and len(self._window) >= settings.AI_CIRCUIT_MIN_REQUESTS
+            and self.error_rate() >= settings.AI_CIRCUIT_ERROR_RATE
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self._probe_started_at = None
+        logger.warning(f"🔴 AI 제공자 서킷 열림: {self.name} (오류율 {self.error_rate():.2f})")
+
+    def error_rate(self) -> float:
+        if not self._window:
+            return 0.0
+        return sum(1 for _, healthy in self._window if not healthy) / len(self._window)
+
+    def latency_quantile(self, quantile: float) -> Optional[float]:
+        """성공한 호출의 지연 시간 분위수 (표본이 부족하면 None)"""
+        latencies = sorted(latency for latency, healthy in self._window if healthy)
+        if len(latencies) < settings.AI_CIRCUIT_MIN_REQUESTS:
+            return None
+        index = min(len(latencies) - 1, int(quantile * len(latencies)))
+        return latencies[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "window_size": len(self._window),
+            "error_rate": round(self.error_rate(), 3),
+            "p50_seconds": self.latency_quantile(0.5),
+            "p90_seconds": self.latency_quantile(0.9),
+            "served": self.served,
+            "hedged": self.hedged,
+        }
+
+
+class CompositeAIClient(AIClient):
+    """
+    여러 제공자 중 최근 지연 시간이 가장 짧고 서킷이 닫힌 제공자로 요청을 보내는 클라이언트
+
+    - 실패 시 다음 제공자로 전환 (스트리밍은 첫 조각을 받기 전까지만)
+    - AI_HEDGE_ENABLED이면 첫 제공자가 p90 지연 시간 안에 응답하지 않을 때 다음 제공자에도 요청하고 먼저 온 응답 사용
+      (스트리밍은 첫 조각 기준, 지연 시간 윈도우에도 첫 조각까지의 시간을 기록)
+    - 지연 시간 윈도우(라우팅 / 느린 호출 판단)에는 클라이언트 측 속도 제한 대기열 시간을 제외하고 기록
+    """
+
+    def __init__(self, providers: Dict[str, AIClient]):
+        self.providers = providers
+        self.health = {name: ProviderHealth(name) for name in providers}
+
+    def is_available(self) -> bool:
+        return any(client.is_available() for client in self.providers.values())
+
+    def _candidates(self) -> Tuple[List[str], bool]:
+        """
+        요청 순서대로 정렬된 제공자 목록 (측정값이 없는 제공자는 설정 순서를 유지하며 뒤로)
+        서킷 상태는 확인만 하고, 시험 요청은 실제로 요청을 보낼 때 _admit에서 소비합니다.
+
+        Returns:
+            Tuple[List[str], bool]: 제공자 목록, 모든 서킷이 열려 있어 서킷과 무관하게 시도하는지 여부
+        """
+        available = [name for name, client in self.providers.items() if client.is_available()]
+        allowed = [name for name in available if self.health[name].may_allow()]
+        forced = not allowed
+        if forced:
+            # 모든 서킷이 열려 있으면 실패를 그대로 반환하기보다 시도
+            allowed = available
+
+        order = {name: index for index, name in enumerate(self.providers)}
+
+        def sort_key(name: str):
+            p50 = self.health[name].latency_quantile(0.5)
+            return (p50 if p50 is not None else float("inf"), order[name])
+
+        return sorted(allowed, key=sort_key), forced
+
+    def _admit(self, name: str, forced: bool) -> bool:
+        """이 제공자로 요청을 보내도 되는지 (후보 선정 이후 다른 요청이 시험 요청을 가져갔으면 건너뜀)"""
+        return forced or self.health[name].allow_request()
+
+    def _hedge_delay(self, name: str) -> float:
+        """헤징 요청을 보내기 전 대기 시간 (제공자의 p90, 표본이 부족하면 기본값)"""
+        delay = self.health[name].latency_quantile(settings.AI_HEDGE_QUANTILE)
+        if delay is None:
+            delay = settings.AI_HEDGE_DEFAULT_DELAY_SECONDS
+        return max(delay, settings.AI_HEDGE_MIN_DELAY_SECONDS)
+
+    async def _call(self, name: str, operation: Callable[[AIClient], Awaitable[T]]) -> T:
+        """단일 제공자 호출 및 결과 기록 (취소된 헤징 요청은 기록하지 않음, 속도 제한 대기 시간은 지연 시간에서 제외)"""
+        started, queued_before = time.monotonic(), get_queue_wait_seconds()
+        try:
+            result = await operation(self.providers[name])
+        except Exception:
+            self.health[name].record(_elapsed(started, queued_before), False)
+            raise
+        self.health[name].record(_elapsed(started, queued_before), True)
+        return result
+
+    def _mark_served(self, name: str) -> None:
+        self.health[name].served += 1
+        _served_provider.set(name)
+        logger.info(f"🤖 AI 응답 제공자: {name}")
+
+    async def _execute(self, operation: Callable[[AIClient], Awaitable[T]]) -> T:
+        candidates, forced = self._candidates()
+        if not candidates:
+            raise Exception(_NO_PROVIDER_MESSAGE)
+
+        name, result = await self._race(candidates, forced, lambda name: self._call(name, operation))
+        self._mark_served(name)
+        return result
+
+    async def _race(
+        self,
+        candidates: List[str],
+        forced: bool,
+        start: Callable[[str], Awaitable[T]],
+        discard: Optional[Callable[[T], Awaitable[None]]] = None
+    ) -> Tuple[str, T]:
+        """
+        후보 순서대로 요청하고 먼저 성공한 제공자와 결과를 반환 (실패하면 다음 제공자로 전환)
+        AI_HEDGE_ENABLED이면 먼저 보낸 요청이 p90 안에 끝나지 않을 때 다음 제공자에도 요청하고 나머지 요청은 취소
+        (서킷 허가는 요청을 보내는 제공자만, 먼저 끝났지만 선택되지 않은 결과는 discard로 정리)
+        """
+        remaining = list(candidates)
+        running: Dict[asyncio.Task, str] = {}
+        last_error: Optional[Exception] = None
+
+        def launch() -> Optional[str]:
+            while remaining:
+                name = remaining.pop(0)
+                if self._admit(name, forced):
+                    running[asyncio.create_task(start(name))] = name
+                    return name
+            return None
+
+        launch()
+        try:
+            while running or remaining:
+                if not running:
+                    launch()
+                    continue
+
+                primary = next(iter(running.values()))
+                timeout = self._hedge_delay(primary) if settings.AI_HEDGE_ENABLED and remaining else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedge = launch()
+                    if hedge is not None:
+                        logger.info(f"⏱️ AI 응답 지연, 헤징 요청: {hedge} (대기 {timeout:.1f}s)")
+                        self.health[hedge].hedged += 1
+                    continue
+
+                winner: Optional[Tuple[str, T]] = None
+                for task in done:
+                    name = running.pop(task)
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        logger.warning(f"⚠️ AI 제공자 호출 실패, 다음 제공자로 전환: {name} - {last_error}")
+                    elif winner is None:
+                        winner = (name, task.result())
+                    elif discard is not None:
+                        await discard(task.result())
+                if winner is not None:
+                    return winner
+            raise last_error or Exception(_NO_PROVIDER_MESSAGE)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                results = await asyncio.gather(*running, return_exceptions=True)
+                for result in results:
+                    if discard is not None and not isinstance(result, BaseException):
+                        await discard(result)
+
+    async def generate_content(self, prompt: str) -> str:
+        return await self._execute(lambda client: client.generate_content(prompt))
+
+    async def generate_structured_content(
+        self,
+        prompt: str,
+        expected_format: str = "json",
+        response_model: Optional[Type[BaseModel]] = None
+    ) -> Dict[str, Any]:
+        return await self._execute(
+            lambda client: client.generate_structured_content(prompt, expected_format, response_model)
+        )
+
+    async def generate_content_stream(
+        self,
+        prompt: str,
+        response_model: Optional[Type[BaseModel]] = None
+    ) -> AsyncIterator[str]:
+        """
+        첫 조각을 기준으로 제공자를 고르는 스트리밍
+        첫 조각을 받기 전 실패하면 다음 제공자로 전환하고, AI_HEDGE_ENABLED이면 첫 조각이 p90 안에 오지 않을 때 헤징합니다.
+        (첫 조각 이후의 실패는 전환하지 않고 그대로 전달)
+        """
+        candidates, forced = self._candidates()
+        if not candidates:
+            raise Exception(_NO_PROVIDER_MESSAGE)
+
+        name, (stream, first, first_chunk_latency) = await self._race(
+            candidates,
+            forced,
+            lambda name: self._open_stream(name, prompt, response_model),
+            discard=lambda opened: _close_stream(opened[0])
+        )
+        self._mark_served(name)
+        started = time.monotonic() - first_chunk_latency
+        try:
+            if first is not None:
+                yield first
+                async for chunk in stream:
+                    yield chunk
+        except Exception:
+            self.health[name].record(time.monotonic() - started, False)
+            raise
+        finally:
+            await _close_stream(stream)
+        # 스트리밍 호출의 지연 시간은 첫 조각까지 (라우팅 / 헤징 기준)
+        self.health[name].record(first_chunk_latency, True)
+
+    async def _open_stream(
+        self,
+        name: str,
+        prompt: str,
+        response_model: Optional[Type[BaseModel]]
+    ) -> Tuple[AsyncIterator[str], Optional[str], float]:
+        """
+        스트림을 열고 첫 조각까지 받음 (시작 전 실패는 기록, 취소된 헤징 요청은 기록하지 않음)
+
+        Returns:
+            Tuple[AsyncIterator[str], Optional[str], float]: 스트림, 첫 조각 (빈 응답이면 None), 첫 조각까지 걸린 시간 (속도 제한 대기 제외)
+        """
+        started, queued_before = time.monotonic(), get_queue_wait_seconds()
+        stream = self.providers[name].generate_content_stream(prompt, response_model)
+        try:
+            first = await anext(stream, None)
+        except Exception:
+            self.health[name].record(_elapsed(started, queued_before), False)
+            raise
+        return stream, first, _elapsed(started, queued_before)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """제공자별 라우팅 통계"""
+        return {
+            "hedge_enabled": settings.AI_HEDGE_ENABLED,
+            "providers": {name: health.snapshot() for name, health in self.health.items()},
+        }
@@ -1,16 +1,17 @@
 """
 Gemini AI 클라이언트 구현
 """
-import json
-import re
 import logging
-import asyncio
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, Optional, Type
 
 import google.generativeai as genai
+from pydantic import BaseModel
 
 from app.core.config import settings
+from app.core.metrics import AI_RESPONSE_CHARACTERS, AIStreamTimer, track_ai_request
 from app.external.ai.base import AIClient
+from app.external.ai.schema import build_response_schema
+from app.utils.json_stream import extract_json_object
 
 logger = logging.getLogger(__name__)
 
@@ -38,46 +39,101 @@ class GeminiClient(AIClient):
         Returns:
             str: AI 응답 텍스트
         """
+        return await self._generate_text(prompt)
+    
+    async def _generate_text(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        """Gemini 응답 텍스트 생성"""
         try:
             if not self.is_available():
                 raise Exception("Gemini 서비스를 사용할 수 없습니다.")
             
-            loop = asyncio.get_running_loop()
-            
-            # 동기 호출을 executor로 비동기화
-            response = await loop.run_in_executor(None, self._sync_generate_content, prompt)
+            response = await self._request_content(prompt, generation_config)
             
             if not response or not response.text:
                 raise Exception("AI 응답이 비어있습니다.")
             
-            logger.info(f"Gemini 응답 생성 완료: {len(response.text)} 문자")
+            AI_RESPONSE_CHARACTERS.labels(provider="gemini", operation="chat").inc(len(response.text))
+            logger.debug(f"Gemini 응답 생성 완료: {len(response.text)} 문자")
             return response.text
             
         except Exception as e:
             logger.error(f"Gemini 응답 생성 실패: {e}")
             raise
     
-    def _sync_generate_content(self, prompt: str):
-        """동기적으로 Gemini API를 호출합니다."""
-        print("🔵 Gemini generate_content 시작")
-        response = self.model.generate_content(prompt)
-        print("🟢 Gemini 응답 수신 완료")
-        return response
+    async def _request_content(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None):
+        """Gemini API를 네이티브 비동기(gRPC aio)로 호출합니다."""
+        with track_ai_request("gemini", "chat"):
+            return await self.model.generate_content_async(
+                prompt,
+                generation_config=generation_config,
+                request_options={"timeout": settings.AI_REQUEST_TIMEOUT}
+            )
     
-    async def generate_structured_content(self, prompt: str, expected_format: str = "json") -> Dict[str, Any]:
+    def _json_generation_config(self, response_model: Optional[Type[BaseModel]] = None) -> Dict[str, Any]:
+        """JSON 출력 모드 설정 (response_model이 있으면 응답 스키마도 지정)"""
+        config: Dict[str, Any] = {"response_mime_type": "application/json"}
+        if response_model is not None:
+            config["response_schema"] = build_response_schema(response_model)
+        return config
+    
+    async def generate_content_stream(
+        self,
+        prompt: str,
+        response_model: Optional[Type[BaseModel]] = None
+    ) -> AsyncIterator[str]:
         """
-        구조화된 응답을 생성합니다.
+        Gemini 스트리밍으로 응답 텍스트를 도착하는 대로 반환합니다.
+        
+        Args:
+            prompt (str): AI에게 전달할 프롬프트
+            response_model: 지정 시 JSON 출력 모드와 응답 스키마 사용
+                (응답 스키마를 지정하면 필드가 알파벳 순으로 출력되어 프롬프트의 필드 순서와 다를 수 있음)
+            
+        Yields:
+            str: 새로 생성된 응답 텍스트 조각
+        """
+        if not self.is_available():
+            raise Exception("Gemini 서비스를 사용할 수 없습니다.")
+        
+        timer = AIStreamTimer("gemini")
+        timer.start()
+        success = False
+        try:
+            response = await self.model.generate_content_async(
+                prompt,
+                stream=True,
+                generation_config=self._json_generation_config(response_model) if response_model is not None else None,
+                request_options={"timeout": settings.AI_REQUEST_TIMEOUT}
+            )
+            async for chunk in response:
+                if chunk.parts:
+                    timer.chunk(chunk.text)
+                    yield chunk.text
+            success = True
+        finally:
+            timer.finish(success)
+    
+    async def generate_structured_content(
+        self,
+        prompt: str,
+        expected_format: str = "json",
+        response_model: Optional[Type[BaseModel]] = None
+    ) -> Dict[str, Any]:
+        """
+        JSON 출력 모드(응답 스키마 지정)로 구조화된 응답을 생성합니다.
         
         Args:
             prompt (str): AI에게 전달할 프롬프트
             expected_format (str): 기대하는 응답 형식 (현재는 json만 지원)
+            response_model: 응답 스키마 및 검증에 사용할 pydantic 모델
             
         Returns:
             Dict[str, Any]: 구조화된 응답 데이터
         """
         try:
-            response_text = await self.generate_content(prompt)
-            return self._extract_json_from_response(response_text)
+            response_text = await self._generate_text(prompt, self._json_generation_config(response_model))
+            data = extract_json_object(response_text)
+            return self._validate_response(data, response_model)
             
         except Exception as e:
             logger.error(f"구조화된 응답 생성 실패: {e}")
@@ -91,44 +147,3 @@ class GeminiClient(AIClient):
             bool: 사용 가능 여부
         """
         return self._available and bool(settings.GEMINI_API_KEY)
-    
-    def _extract_json_from_response(self, response_text: str) -> Dict[str, Any]:
-        """
-        AI 응답에서 JSON을 추출하고 파싱합니다.
-        
-        Args:
-            response_text (str): AI 응답 텍스트
-            
-        Returns:
-            Dict[str, Any]: 파싱된 JSON 데이터
-        """
-        try:
-            return json.loads(response_text)
-        except json.JSONDecodeError:
-            pass
-        
-        try:
-            # JSON 패턴 매칭
-            json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-            matches = re.findall(json_pattern, response_text, re.DOTALL)
-            
-            for match in matches:
-                try:
-                    return json.loads(match)
-                except json.JSONDecodeError:
-                    continue
-                    
-        except Exception:
-            pass
-        
-        try:
-            # 코드 블록에서 JSON 추출
-            json_block_pattern = r'```(?:json)?\s*(\{.*?\})\s*```'
-            match = re.search(json_block_pattern, response_text, re.DOTALL)
-            if match:
-                return json.loads(match.group(1))
-        except Exception:
-            pass
-        
-        logger.warning(f"JSON 추출 실패. 원본 응답: {response_text[:200]}...")
-        raise ValueError("AI 응답에서 유효한 JSON을 추출할 수 없습니다.") 
\ No newline at end of file
@@ -1,19 +1,39 @@
 """
 OpenAI GPT 클라이언트 구현
 """
-import json
-import re
 import logging
-import asyncio
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, Optional, Type
 
-from openai import OpenAI
+from openai import AsyncOpenAI
+from pydantic import BaseModel
 
 from app.core.config import settings
+from app.core.container import get_container
+from app.core.metrics import AI_RESPONSE_CHARACTERS, AIStreamTimer, track_ai_request
 from app.external.ai.base import AIClient
+from app.external.http_client import get_http_client
+from app.external.rate_limiter import estimate_tokens, get_chat_rate_limiter
+from app.utils.json_stream import extract_json_object
 
 logger = logging.getLogger(__name__)
 
+def _create_async_openai_client() -> AsyncOpenAI:
+    # 모든 호출이 속도 제한기를 거치므로 재시도는 RateLimiter.run이 담당 (SDK 재시도는 한도 계산에서 빠짐)
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        http_client=get_http_client(),
+        timeout=settings.AI_REQUEST_TIMEOUT,
+        max_retries=0,
+    )
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    공유 커넥션 풀을 사용하는 AsyncOpenAI 클라이언트를 반환합니다.
+    (Chat / Audio 호출이 같은 인스턴스를 공유, 커넥션 풀은 컨테이너 종료 시 정리)
+    """
+    return get_container().resolve("async_openai_client", _create_async_openai_client)
+
 
 class OpenAIClient(AIClient):
     """OpenAI GPT 클라이언트"""
@@ -21,7 +41,7 @@ class OpenAIClient(AIClient):
     def __init__(self):
         """OpenAI 클라이언트 초기화"""
         try:
-            self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+            get_async_openai_client()
             self._available = True
         except Exception as e:
             logger.error(f"OpenAI 클라이언트 초기화 실패: {e}")
@@ -37,55 +57,135 @@ class OpenAIClient(AIClient):
         Returns:
             str: AI 응답 텍스트
         """
+        return await self._generate_text(prompt)
+    
+    async def _generate_text(self, prompt: str, json_mode: bool = False) -> str:
+        """Chat Completions 응답 텍스트 생성 (json_mode이면 JSON 객체만 출력하도록 강제)"""
         try:
             if not self.is_available():
                 raise Exception("OpenAI 서비스를 사용할 수 없습니다.")
             
-            loop = asyncio.get_running_loop()
-            
-            # 동기 호출을 executor로 비동기화
-            response = await loop.run_in_executor(None, self._sync_generate_content, prompt)
+            response = await self._request_completion(prompt, json_mode)
             
             if not response or not response.choices:
                 raise Exception("AI 응답이 비어있습니다.")
             
-            response_text = response.choices[0].message.content
-            logger.info(f"OpenAI 응답 생성 완료: {len(response_text)} 문자")
+            choice = response.choices[0]
+            if choice.finish_reason == "length":
+                logger.warning("OpenAI 응답이 max_tokens에서 잘렸습니다.")
+            
+            response_text = choice.message.content
+            AI_RESPONSE_CHARACTERS.labels(provider="openai", operation="chat").inc(len(response_text))
+            logger.debug(f"OpenAI 응답 생성 완료: {len(response_text)} 문자")
             return response_text
             
         except Exception as e:
             logger.error(f"OpenAI 응답 생성 실패: {e}")
             raise
     
-    def _sync_generate_content(self, prompt: str):
-        """동기적으로 OpenAI API를 호출합니다."""
-        print("🔵 OpenAI generate_content 시작")
-        response = self.client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
+    async def _request_completion(self, prompt: str, json_mode: bool = False):
+        """OpenAI Chat Completions API를 비동기로 호출합니다."""
+        params = self._completion_params(prompt, json_mode)
+        estimated_tokens = self._estimate_tokens(params)
+        rate_limiter = get_chat_rate_limiter()
+
+        async def request():
+            with track_ai_request("openai", "chat"):
+                return await get_async_openai_client().chat.completions.create(**params)
+
+        response = await rate_limiter.run(request, tokens=estimated_tokens)
+        rate_limiter.record_usage(estimated_tokens, response.usage.total_tokens if response.usage else None)
+        return response
+    
+    def _estimate_tokens(self, params: Dict[str, Any]) -> int:
+        """분당 토큰 한도 계산용 예상 토큰 수 (입력 + 최대 출력)"""
+        return estimate_tokens(*(message["content"] for message in params["messages"])) + params["max_tokens"]
+    
+    def _completion_params(self, prompt: str, json_mode: bool = False) -> Dict[str, Any]:
+        """Chat Completions 요청 파라미터"""
+        params = {
+            "model": "gpt-3.5-turbo",
+            "messages": [
                 {"role": "system", "content": "You are a helpful assistant that responds in JSON format when requested. Always return complete, valid JSON."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
-            max_tokens=2000
-        )
-        print("🟢 OpenAI 응답 수신 완료")
-        return response
+            "temperature": 0.7,
+            "max_tokens": 2000,
+        }
+        if json_mode:
+            # gpt-3.5-turbo는 json_schema(strict)를 지원하지 않으므로 JSON 모드 사용, 스키마 검증은 응답 후 수행
+            params["response_format"] = {"type": "json_object"}
+        return params
     
-    async def generate_structured_content(self, prompt: str, expected_format: str = "json") -> Dict[str, Any]:
+    async def generate_content_stream(
+        self,
+        prompt: str,
+        response_model: Optional[Type[BaseModel]] = None
+    ) -> AsyncIterator[str]:
         """
-        구조화된 응답을 생성합니다.
+        Chat Completions 스트리밍으로 응답 토큰을 도착하는 대로 반환합니다.
+        
+        Args:
+            prompt (str): AI에게 전달할 프롬프트
+            response_model: 지정 시 JSON 모드 사용
+            
+        Yields:
+            str: 새로 생성된 응답 텍스트 조각
+        """
+        if not self.is_available():
+            raise Exception("OpenAI 서비스를 사용할 수 없습니다.")
+        
+        params = self._completion_params(prompt, json_mode=response_model is not None)
+        estimated_tokens = self._estimate_tokens(params)
+        rate_limiter = get_chat_rate_limiter()
+        timer = AIStreamTimer("openai")
+
+        async def open_stream():
+            timer.start()
+            return await get_async_openai_client().chat.completions.create(
+                **params,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+
+        success = False
+        try:
+            stream = await rate_limiter.run(open_stream, tokens=estimated_tokens)
+            async for chunk in stream:
+                # 마지막 조각(choices 없음)의 usage로 max_tokens 기준 예약분 보정
+                if chunk.usage:
+                    rate_limiter.record_usage(estimated_tokens, chunk.usage.total_tokens)
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    timer.chunk(content)
+                    yield content
+            success = True
+        finally:
+            timer.finish(success)
+    
+    async def generate_structured_content(
+        self,
+        prompt: str,
+        expected_format: str = "json",
+        response_model: Optional[Type[BaseModel]] = None
+    ) -> Dict[str, Any]:
+        """
+        JSON 모드로 구조화된 응답을 생성합니다.
         
         Args:
             prompt (str): AI에게 전달할 프롬프트
             expected_format (str): 기대하는 응답 형식 (현재는 json만 지원)
+            response_model: 응답 검증에 사용할 pydantic 모델
             
         Returns:
             Dict[str, Any]: 구조화된 응답 데이터
         """
         try:
-            response_text = await self.generate_content(prompt)
-            return self._extract_json_from_response(response_text)
+            response_text = await self._generate_text(prompt, json_mode=True)
+            data = extract_json_object(response_text)
+            return self._validate_response(data, response_model)
             
         except Exception as e:
             logger.error(f"구조화된 응답 생성 실패: {e}")
@@ -99,44 +199,3 @@ class OpenAIClient(AIClient):
             bool: 사용 가능 여부
         """
         return self._available and bool(settings.OPENAI_API_KEY)
-    
-    def _extract_json_from_response(self, response_text: str) -> Dict[str, Any]:
-        """
-        AI 응답에서 JSON을 추출하고 파싱합니다.
-        
-        Args:
-            response_text (str): AI 응답 텍스트
-            
-        Returns:
-            Dict[str, Any]: 파싱된 JSON 데이터
-        """
-        try:
-            return json.loads(response_text)
-        except json.JSONDecodeError:
-            pass
-        
-        try:
-            # JSON 패턴 매칭
-            json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-            matches = re.findall(json_pattern, response_text, re.DOTALL)
-            
-            for match in matches:
-                try:
-                    return json.loads(match)
-                except json.JSONDecodeError:
-                    continue
-                    
-        except Exception:
-            pass
-        
-        try:
-            # 코드 블록에서 JSON 추출
-            json_block_pattern = r'```(?:json)?\s*(\{.*?\})\s*```'
-            match = re.search(json_block_pattern, response_text, re.DOTALL)
-            if match:
-                return json.loads(match.group(1))
-        except Exception:
-            pass
-        
-        logger.warning(f"JSON 추출 실패. 원본 응답: {response_text[:200]}...")
-        raise ValueError("AI 응답에서 유효한 JSON을 추출할 수 없습니다.") 
\ No newline at end of file
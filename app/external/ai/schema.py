@@ -0,0 +1,39 @@
+"""
+AI 구조화 출력용 응답 스키마 변환
+"""
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel
+
+# 제공자 응답 스키마(OpenAPI 부분집합)에서 공통으로 지원하는 키워드
+_SUPPORTED_KEYWORDS = ("type", "format", "description", "enum")
+
+
+def build_response_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    pydantic 모델의 JSON Schema를 AI 제공자 응답 스키마로 변환합니다.
+    ($ref는 인라인으로 풀고, 지원하지 않는 title/minimum 등은 제거 — 범위 검증은 응답 후 pydantic이 담당)
+
+    Args:
+        model: 응답 형식을 정의한 pydantic 모델
+
+    Returns:
+        Dict[str, Any]: 응답 스키마
+    """
+    schema = model.model_json_schema()
+    return _simplify(schema, schema.get("$defs", {}))
+
+
+def _simplify(node: Dict[str, Any], defs: Dict[str, Any]) -> Dict[str, Any]:
+    if "$ref" in node:
+        node = defs[node["$ref"].split("/")[-1]]
+
+    result = {key: node[key] for key in _SUPPORTED_KEYWORDS if key in node}
+    if "properties" in node:
+        result["properties"] = {
+            name: _simplify(child, defs) for name, child in node["properties"].items()
+        }
+        result["required"] = list(node.get("required", []))
+    if "items" in node:
+        result["items"] = _simplify(node["items"], defs)
+    return result
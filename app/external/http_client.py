@@ -0,0 +1,41 @@
+"""
+외부 API 호출용 공유 HTTP 커넥션 풀
+"""
+import logging
+
+import httpx
+
+from app.core.config import settings
+from app.core.container import get_container
+
+logger = logging.getLogger(__name__)
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            settings.AI_REQUEST_TIMEOUT,
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+        ),
+    )
+
+
+async def _close_http_client(client: httpx.AsyncClient) -> None:
+    await client.aclose()
+    logger.info("🔌 HTTP 커넥션 풀 종료")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    keep-alive 커넥션 풀을 공유하는 비동기 HTTP 클라이언트를 반환합니다.
+    (서비스 컨테이너 종료 시 함께 닫힘)
+
+    Returns:
+        httpx.AsyncClient: 프로세스 전역 HTTP 클라이언트
+    """
+    return get_container().resolve("http_client", _create_http_client, close=_close_http_client)
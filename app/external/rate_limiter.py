@@ -0,0 +1,220 @@
+"""
+외부 AI API 호출용 클라이언트 측 속도 제한 (분당 요청 수 / 분당 토큰 수 토큰 버킷)
+"""
+import asyncio
+import logging
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import openai
+
+from app.core.config import settings
+from app.core.container import get_container
+from app.core.metrics import RATE_LIMIT_QUEUE_DEPTH, RATE_LIMIT_THROTTLED
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_queue_wait_seconds: ContextVar[float] = ContextVar("rate_limit_queue_wait_seconds", default=0.0)
+
+
+def get_queue_wait_seconds() -> float:
+    """
+    현재 요청(태스크)이 속도 제한 대기열에서 기다린 누적 시간 (초)
+    호출 전후 값의 차이로 제공자 지연 시간에서 대기열 시간을 뺄 때 사용
+    """
+    return _queue_wait_seconds.get()
+
+
+class TokenBucket:
+    """분당 한도를 초당 보충 속도로 환산한 토큰 버킷 (한도 0이면 무제한)"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.refill_rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount만큼 사용 가능해질 때까지 남은 시간 (초)"""
+        if self.unlimited:
+            return 0.0
+        self._refill(time.monotonic())
+        # 버킷보다 큰 요청은 가득 찼을 때 통과시킴
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) / self.refill_rate)
+
+    def consume(self, amount: float) -> None:
+        if not self.unlimited:
+            self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """예상보다 적게 사용한 토큰 반환 (음수면 추가 차감)"""
+        if not self.unlimited:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateLimiter:
+    """
+    요청 수 / 토큰 수 버킷을 함께 검사하는 비동기 속도 제한기
+
+    - 한도를 넘는 요청은 실패시키지 않고 도착 순서대로 대기열에서 기다림
+    - 429 응답을 받으면 Retry-After만큼 전체 대기열을 멈춘 뒤 재시도
+    - 연결 오류 / 시간 초과 / 5xx는 해당 요청만 지수 백오프 후 재시도 (SDK 재시도는 끄고 여기서 담당)
+    - 한도는 프로세스 단위이므로 워커가 여러 개면 계정 한도를 워커 수로 나눠 설정
+    """
+
+    def __init__(self, name: str, requests_per_minute: int, tokens_per_minute: int = 0):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock = asyncio.Lock()
+        self._blocked_until = 0.0
+        self.waiting = 0
+        self.in_flight = 0
+        self.throttled = 0
+        self.total_wait_seconds = 0.0
+        self._queue_depth = RATE_LIMIT_QUEUE_DEPTH.labels(limiter=name)
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """요청 1건과 tokens만큼의 한도를 확보할 때까지 대기"""
+        started = time.monotonic()
+        self.waiting += 1
+        self._queue_depth.inc()
+        try:
+            async with self._lock:
+                while True:
+                    delay = max(
+                        self._blocked_until - time.monotonic(),
+                        self.requests.wait_time(1),
+                        self.tokens.wait_time(tokens),
+                    )
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+                self.requests.consume(1)
+                self.tokens.consume(tokens)
+        finally:
+            self.waiting -= 1
+            self._queue_depth.dec()
+            self.total_wait_seconds += time.monotonic() - started
+
+    def block_for(self, seconds: float) -> None:
+        """429 응답 후 seconds 동안 새 요청을 보내지 않음"""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    async def run(self, operation: Callable[[], Awaitable[T]], tokens: int = 0) -> T:
+        """
+        한도 안에서 operation을 실행하고, 429 응답이면 Retry-After를 반영해 재시도합니다.
+        일시적인 오류(연결 오류 / 시간 초과 / 5xx)는 AI_MAX_RETRIES까지 재시도하며, 재시도할 때마다 한도를 다시 확보합니다.
+
+        Args:
+            operation: 실제 API 호출
+            tokens: 예상 사용 토큰 수 (분당 토큰 한도 계산용)
+
+        Raises:
+            openai.RateLimitError: 재시도 횟수를 모두 사용한 경우
+            openai.APIConnectionError, openai.InternalServerError: 일시적인 오류가 재시도 후에도 계속된 경우
+        """
+        transient_errors = 0
+        attempt = 0
+        while True:
+            # wait_for는 별도 태스크에서 실행되므로 대기 시간은 호출 측 컨텍스트에서 기록
+            queued_at = time.monotonic()
+            try:
+                await asyncio.wait_for(self.acquire(tokens), timeout=settings.RATE_LIMIT_MAX_QUEUE_SECONDS)
+            finally:
+                _queue_wait_seconds.set(_queue_wait_seconds.get() + time.monotonic() - queued_at)
+            self.in_flight += 1
+            try:
+                return await operation()
+            except (openai.APIConnectionError, openai.InternalServerError) as e:
+                if transient_errors >= settings.AI_MAX_RETRIES:
+                    raise
+                delay = settings.RATE_LIMIT_RETRY_BASE_SECONDS * (2 ** transient_errors) * (1 + random.random() * 0.2)
+                transient_errors += 1
+                logger.warning(f"🔁 {self.name} 일시적 오류, {delay:.1f}초 후 재시도 ({transient_errors}/{settings.AI_MAX_RETRIES}): {e}")
+            except openai.RateLimitError as e:
+                self.throttled += 1
+                RATE_LIMIT_THROTTLED.labels(limiter=self.name).inc()
+                if attempt >= settings.RATE_LIMIT_MAX_RETRIES:
+                    raise
+                delay = _retry_after_seconds(e)
+                if delay is None:
+                    delay = settings.RATE_LIMIT_RETRY_BASE_SECONDS * (2 ** attempt) * (1 + random.random() * 0.2)
+                self.block_for(delay)
+                attempt += 1
+                logger.warning(f"⏳ {self.name} 속도 제한(429), {delay:.1f}초 후 재시도 ({attempt}/{settings.RATE_LIMIT_MAX_RETRIES})")
+                continue
+            finally:
+                self.in_flight -= 1
+            # 일시적 오류는 대기열 전체가 아니라 이 요청만 대기
+            await asyncio.sleep(delay)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """응답의 실제 사용량으로 토큰 버킷 보정"""
+        if actual_tokens is not None:
+            self.tokens.refund(estimated_tokens - actual_tokens)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "throttled": self.throttled,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+            "requests_available": None if self.requests.unlimited else round(self.requests.tokens, 1),
+            "tokens_available": None if self.tokens.unlimited else round(self.tokens.tokens, 1),
+        }
+
+
+def _retry_after_seconds(error: openai.APIStatusError) -> Optional[float]:
+    """429 응답 헤더의 retry-after-ms / retry-after 값 (초)"""
+    headers = error.response.headers if error.response is not None else {}
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+def estimate_tokens(*texts: str) -> int:
+    """
+    요청 토큰 수 추정 (한국어는 대략 글자당 1토큰으로 계산)
+    정확한 값은 응답의 usage로 record_usage에서 보정
+    """
+    return sum(len(text) for text in texts)
+
+
+def get_chat_rate_limiter() -> RateLimiter:
+    """OpenAI Chat Completions 속도 제한기"""
+    return get_container().resolve(
+        "chat_rate_limiter",
+        lambda: RateLimiter("openai-chat", settings.OPENAI_CHAT_RPM, settings.OPENAI_CHAT_TPM)
+    )
+
+
+def get_audio_rate_limiter() -> RateLimiter:
+    """OpenAI Audio(Whisper) 속도 제한기"""
+    return get_container().resolve(
+        "audio_rate_limiter",
+        lambda: RateLimiter("openai-audio", settings.OPENAI_AUDIO_RPM)
+    )
+
+
+def get_rate_limiter_stats() -> Dict[str, Any]:
+    """속도 제한기별 대기열 통계"""
+    return {limiter.name: limiter.get_stats() for limiter in (get_chat_rate_limiter(), get_audio_rate_limiter())}
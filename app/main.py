@@ -1,17 +1,35 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from prometheus_client import CONTENT_TYPE_LATEST
 
 from app.core.config import settings
-from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.container import close_container, get_container
+from app.core.database import connect_to_mongo, close_mongo_connection, get_mongo_pool_stats
+from app.core.metrics import ServerTimingMiddleware, mark_worker_stopped, render_metrics
+from app.external.ai.client import get_ai_client
+from app.external.ai.composite import CompositeAIClient
+from app.external.rate_limiter import get_rate_limiter_stats
+from app.services.health import get_health_service
+from app.services.report_cache import get_report_response_cache
+from app.services.report_job import get_report_job_service
+from app.services.transcription_cache import get_transcription_cache_service
+from app.services.user_cache import get_user_profile_cache
 from app.api import users, reports, answers
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """애플리케이션 라이프사이클 관리"""
+    """애플리케이션 라이프사이클 관리 (서비스 / 외부 클라이언트는 컨테이너에서 처음 사용할 때 생성)"""
+    app.state.container = get_container()
     await connect_to_mongo()
+    report_job_service = get_report_job_service()
+    report_job_service.start()
     yield
+    await report_job_service.stop()
+    await close_container()
     await close_mongo_connection()
+    mark_worker_stopped()
 
 def create_app() -> FastAPI:
     """FastAPI 애플리케이션 생성"""
@@ -28,7 +46,10 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["Server-Timing"],
     )
+    if settings.SERVER_TIMING_ENABLED:
+        app.add_middleware(ServerTimingMiddleware)
 
     app.include_router(users.router, prefix="/api")
     app.include_router(reports.router, prefix="/api")
@@ -45,6 +66,45 @@ def create_app() -> FastAPI:
     @app.get("/health")
     async def health_check():
         return {"status": "healthy"}
+    
+    @app.get("/health/live")
+    async def liveness_check():
+        return get_health_service().check_liveness()
+    
+    @app.get("/health/ready")
+    async def readiness_check():
+        """의존성 확인 결과 (준비되지 않았으면 503, 결과는 HEALTH_CACHE_SECONDS 동안 재사용)"""
+        result = await get_health_service().check_readiness()
+        return JSONResponse(status_code=200 if result["status"] == "ready" else 503, content=result)
+    
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+    
+    @app.get("/stats/transcription-cache")
+    async def transcription_cache_stats():
+        return get_transcription_cache_service().get_stats()
+    
+    @app.get("/stats/user-cache")
+    async def user_cache_stats():
+        return get_user_profile_cache().get_stats()
+    
+    @app.get("/stats/report-cache")
+    async def report_cache_stats():
+        return get_report_response_cache().get_stats()
+    
+    @app.get("/stats/rate-limits")
+    async def rate_limit_stats():
+        return get_rate_limiter_stats()
+    
+    @app.get("/stats/mongo-pool")
+    async def mongo_pool_stats():
+        return get_mongo_pool_stats()
+    
+    @app.get("/stats/ai-providers")
+    async def ai_provider_stats():
+        ai_client = get_ai_client()
+        return ai_client.get_stats() if isinstance(ai_client, CompositeAIClient) else {"providers": {}}
 
     return app
 
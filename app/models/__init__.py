@@ -2,6 +2,6 @@
 데이터베이스 모델 패키지
 """
 
-from .models import Conversation, User
+from .models import Conversation, User, Report, ReportJob, TranscriptionCache
 
-__all__ = ["Conversation", "User"]
+__all__ = ["Conversation", "User", "Report", "ReportJob", "TranscriptionCache"]
@@ -1,14 +1,19 @@
 from datetime import datetime, date
-from typing import Optional
-from pymongo import ASCENDING
-from app.schemas.common import Gender, DementiaStage, FamilyRelationship
+from typing import Any, Dict, Optional
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from app.schemas.common import Gender, DementiaStage, FamilyRelationship, ReportStatus
 from app.schemas.reports import ConversationReport
 from app.utils.common import get_korea_now, get_korea_today_date
+from app.core.config import settings
 from app.core.constants import Defaults
 from beanie import Document, PydanticObjectId
 from pydantic import BaseModel, Field
 
 
+# 리포트 목록 조회(covered query)용 인덱스 이름
+REPORT_LISTING_INDEX = "user_id_report_date_id_listing"
+
+
 class Conversation(Document):
     """대화 기록 모델 - 사용자 메시지와 AI 응답을 하나로 관리"""
     user_id: str
@@ -20,23 +25,99 @@ class Conversation(Document):
     audio_uri_1: Optional[str] = None
     audio_uri_2: Optional[str] = None
     audio_uri_3: Optional[str] = None
+    transcript_1: Optional[str] = None
+    transcript_2: Optional[str] = None
+    transcript_3: Optional[str] = None
+    transcript_model: Optional[str] = None  # 재전사 배치가 사용한 STT 모델
 
     ai_sentiment: str
     ai_score: float
     ai_comfort_message: str
     ai_timestamp: datetime = Field(default_factory=get_korea_now)
     
-    report: Optional[ConversationReport] = None
+    report: Optional[ConversationReport] = None  # 레거시: 새 리포트는 reports 컬렉션에 저장
+    report_status: Optional[ReportStatus] = None
+    report_error: Optional[str] = None
+    
+    async def set_fields(self, fields: Dict[str, Any]) -> None:
+        """지정한 필드만 $set으로 갱신하고 로컬 객체에 반영 (전체 문서 재저장/재조회 없음)"""
+        await Conversation.find_one(Conversation.id == self.id).update({"$set": fields})
+        for field, value in fields.items():
+            setattr(self, field, value)
     
     class Settings:
         name = "conversations"
         indexes = [
-            [("user_id", ASCENDING), ("conversation_date", ASCENDING)]
+            IndexModel([("user_id", ASCENDING), ("conversation_date", ASCENDING)], unique=True)
+        ]
+
+class ReportJob(Document):
+    """리포트 생성 작업 큐 모델 - conversation당 하나의 작업"""
+    conversation_id: PydanticObjectId
+    user_id: str
+    status: ReportStatus = ReportStatus.PENDING
+    attempts: int = 0
+    max_attempts: int
+    next_run_at: datetime = Field(default_factory=get_korea_now)
+    locked_at: Optional[datetime] = None
+    lease_token: Optional[PydanticObjectId] = None  # 가져갈 때마다 새로 발급, 완료/실패 기록 시 소유 확인
+    progress: Optional[Dict[str, Any]] = None  # 생성 중인 리포트의 진행 상황 (token, fields, text)
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=get_korea_now)
+    updated_at: datetime = Field(default_factory=get_korea_now)
+
+    class Settings:
+        name = "report_jobs"
+        indexes = [
+            IndexModel([("conversation_id", ASCENDING)], unique=True),
+            [("status", ASCENDING), ("next_run_at", ASCENDING)]
+        ]
+
+class TranscriptionCache(Document):
+    """오디오 내용 해시 + STT 설정 기준 전사 결과 캐시 (TTL 만료)"""
+    cache_key: str
+    content_hash: str
+    model: str
+    language: str
+    temperature: float
+    text: str
+    created_at: datetime = Field(default_factory=get_korea_now)
+
+    class Settings:
+        name = "transcription_cache"
+        indexes = [
+            IndexModel([("cache_key", ASCENDING)], unique=True),
+            IndexModel(
+                [("created_at", ASCENDING)],
+                expireAfterSeconds=settings.TRANSCRIPTION_CACHE_TTL_SECONDS
+            )
+        ]
+
+class Report(Document):
+    """조회 전용 경량 리포트 모델 - 생성 완료된 리포트만 저장 (_id는 Conversation의 _id와 동일)"""
+    user_id: str
+    report_date: date
+    report: ConversationReport
+    provider: Optional[str] = None                 # 리포트를 생성한 AI 제공자
+    created_at: datetime = Field(default_factory=get_korea_now)
+
+    class Settings:
+        name = "reports"
+        indexes = [
+            IndexModel(
+                [("user_id", ASCENDING), ("report_date", DESCENDING), ("_id", ASCENDING)],
+                name=REPORT_LISTING_INDEX
+            )
         ]
 
-class ConversationSummary(BaseModel):
-    id: PydanticObjectId = Field(alias="_id")      # Mongo _id
-    conversation_date: date
+class ReportSummary(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")      # Mongo _id (= Conversation _id)
+    report_date: date
+
+class ConversationReportState(BaseModel):
+    """리포트 생성 진행 상태만 조회하는 projection"""
+    id: PydanticObjectId = Field(alias="_id")
+    report_status: Optional[ReportStatus] = None
 
 class User(Document):
     """사용자 정보 모델 (부양자 + 부양받는 가족 정보 포함)"""
@@ -61,3 +142,12 @@ class User(Document):
     
     class Settings:
         name = "users"
+        indexes = [
+            IndexModel([("user_id", ASCENDING)], unique=True)
+        ]
+
+class UserQuestionProfile(BaseModel):
+    """질문 개인화에 필요한 사용자 필드만 조회하는 projection"""
+    user_id: str
+    family_relationship: FamilyRelationship
+    family_member_gender: Gender
@@ -7,13 +7,13 @@ from .responses import (
     OnboardingResponse, ConversationItem, ReportsListResponse,
     FamilyMemberResponse, AudioAnswerResponse, AnalysisResponse
 )
-from .common import Gender, DementiaStage, FamilyRelationship
+from .common import Gender, DementiaStage, FamilyRelationship, ReportStatus
 from .reports import ConversationReport, ConversationReportEmotion
 
 __all__ = [
     "CompleteOnboardingRequest", "FamilyMemberInfo", "MessageRequest", "WebSocketMessage",
     "OnboardingResponse", "ConversationItem", "ReportsListResponse",
     "FamilyMemberResponse", "AudioAnswerResponse", "AnalysisResponse",
-    "Gender", "DementiaStage", "FamilyRelationship",
+    "Gender", "DementiaStage", "FamilyRelationship", "ReportStatus",
     "ConversationReport", "ConversationReportEmotion"
 ] 
\ No newline at end of file
@@ -17,4 +17,11 @@ class FamilyRelationship(str, Enum):
     CHILD = "자녀"
     SPOUSE = "배우자"
     IN_LAW = "며느리/사위"
-    GRANDCHILD = "손주"
\ No newline at end of file
+    GRANDCHILD = "손주"
+
+class ReportStatus(str, Enum):
+    """리포트 생성 작업 상태 Enum"""
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from datetime import datetime, date
 from typing import List, Optional
 
+from app.schemas.common import ReportStatus
 from app.schemas.reports import ConversationReport, ConversationReportEmotion
 
 
@@ -44,6 +45,7 @@ class AudioAnswerResponse(BaseModel):
     
     user_message: Optional[str] = None
     report: Optional[ConversationReport] = None
+    report_status: Optional[ReportStatus] = None
     
     user_id: str
     error: Optional[str] = None
@@ -73,6 +75,12 @@ class ReportsListResponse(BaseModel):
     """리포트 목록 응답"""
     total_count: int
     reports: List[ReportSummaryResponse]
+    next_cursor: Optional[str] = None
+
+class ReportStatusResponse(BaseModel):
+    """리포트 생성 진행 상태 응답 (생성 완료 전)"""
+    report_id: str
+    report_status: ReportStatus
 
 class ReportDetailResponse(BaseModel):
     """리포트 상세보기 응답"""
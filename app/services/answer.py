@@ -1,15 +1,26 @@
-from typing import Dict, List, Tuple
-from fastapi import UploadFile, HTTPException
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from beanie import PydanticObjectId
+from beanie.odm.utils.encoder import Encoder
+from beanie.odm.utils.parsing import parse_obj
+from pymongo import ReturnDocument
+import asyncio
 import logging
 
-from app.models.models import Conversation, User
-from app.schemas.reports import ConversationReport
+from app.core.config import settings
+from app.core.container import get_container
+from app.core.metrics import track_stage
+from app.models.models import Conversation, User, UserQuestionProfile
+from app.schemas.common import ReportStatus
 from app.services.gcp_storage import get_gcp_storage_service
 from app.services.speech_to_text import get_speech_to_text_service
 from app.services.question import get_question_service
-from app.services.report import get_report_service
+from app.services.report_cache import get_report_response_cache
+from app.services.report_job import get_report_job_service
+from app.services.user_cache import get_user_profile_cache
+from app.utils.audio_stream import StreamingAudioForm
 from app.utils.common import (
-    get_korea_now, format_message,
+    get_korea_now, format_message, format_answer_lines,
     create_success_response, create_error_response, safe_get_error_message, get_korea_today_date
 )
 from app.core.constants import (
@@ -27,68 +38,91 @@ class AnswerService:
         self.gcp_storage_service = get_gcp_storage_service()
         self.speech_to_text_service = get_speech_to_text_service()
         self.question_service = get_question_service()
-        self.report_service = get_report_service()
+        self.report_job_service = get_report_job_service()
+        self.user_cache = get_user_profile_cache()
+        self.report_cache = get_report_response_cache()
+        self._background_transcriptions: Dict[str, asyncio.Task] = {}
+    
+    async def stop(self, drain_timeout: float = settings.STT_BACKGROUND_DRAIN_SECONDS) -> None:
+        """
+        진행 중인 백그라운드 STT를 drain_timeout까지 기다리고, 끝나지 않은 작업은 취소합니다.
+        (취소된 질문은 transcript가 비어 있으므로 최종 답변 처리 시 다시 변환)
+        """
+        tasks = list(self._background_transcriptions.values())
+        if not tasks:
+            return
+        logger.info(format_message(Messages.STT_BACKGROUND_DRAINING, count=len(tasks), timeout=drain_timeout))
+        _, pending = await asyncio.wait(tasks, timeout=drain_timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if pending:
+            logger.warning(format_message(Messages.STT_BACKGROUND_CANCELLED, count=len(pending)))
     
     async def process_audio_answer(
         self, 
-        audio_file: UploadFile, 
-        question_number: int, 
+        audio_form: StreamingAudioForm, 
         user_id: str
     ) -> Dict:
-        """오디오 파일을 처리하여 답변을 저장"""
+        """스트리밍 중인 오디오 폼을 처리하여 답변을 저장"""
+        question_number = audio_form.question_number
         try:
-            if not self.question_service.is_valid_question_number(question_number):
-                raise HTTPException(
-                    status_code=400,
-                    detail=format_message(
-                        ErrorMessages.INVALID_QUESTION_NUMBER,
-                        max_questions=self.question_service.get_total_questions()
-                    )
+            # 오디오 파트보다 먼저 전송된 경우 업로드 전에 검증
+            if question_number is not None:
+                self._validate_question_number(question_number)
+            
+            with track_stage("user_lookup"):
+                user = await self._ensure_user_exists(user_id)
+            with track_stage("upload"):
+                gcs_uri = await self.gcp_storage_service.upload_audio_stream(
+                    audio_form.audio_chunks(),
+                    user_id,
+                    audio_form.filename,
+                    audio_form.content_type
                 )
+                await audio_form.finish()
+            
+            question_number = audio_form.question_number
+            if question_number is None or not self.question_service.is_valid_question_number(question_number):
+                await self.gcp_storage_service.delete_audio_file(gcs_uri)
+                self._validate_question_number(question_number)
             
-            user = await self._ensure_user_exists(user_id)
             question_text = self.question_service.get_question_text(question_number, user)
-            gcs_uri = await self.gcp_storage_service.upload_audio_file(audio_file, user_id)
-            conversation = await self._find_or_create_conversation(user_id)
+            with track_stage("conversation_upsert"):
+                conversation = await self._save_audio_uri(user_id, question_number, gcs_uri)
             # 디버깅: 이미 확보한 인스턴스 확인
             logger.debug(f"최종 처리 대상 conversation 확인: id={conversation.id}, date={conversation.conversation_date}")
-
-            await self._save_audio_uri(conversation, question_number, gcs_uri)
+            
+            if question_number != FINAL_QUESTION_NUMBER:
+                self._schedule_background_transcription(conversation, question_number, gcs_uri)
             
             if question_number == FINAL_QUESTION_NUMBER:
-                await self._process_all_audio_to_text(conversation, user)
-                report_response = None
-
-                try:
-                    report_response = await self.report_service.generate_emotion_report(
-                        user_answers=conversation.user_message, 
-                        user_id=conversation.user_id
+                with track_stage("stt"):
+                    stt_fields = await self._process_all_audio_to_text(conversation, user)
+                # 최종 단계 쓰기: 대화 문서 1회 + 사용자 활동 시간 1회를 동시에 수행
+                with track_stage("final_save"):
+                    await asyncio.gather(
+                        conversation.set_fields({
+                            **stt_fields,
+                            "report_status": ReportStatus.PENDING,
+                            "report_error": None
+                        }),
+                        self._update_user_last_active(user_id)
                     )
-                    await self._save_report(conversation, report_response)
-                    logger.info(format_message(Messages.REPORT_GENERATION_SUCCESS, user_id=user_id))
-                except Exception as report_error:
-                    logger.error(format_message(ErrorMessages.REPORT_GENERATION_FAILED, error=report_error))
-                    logger.exception(ErrorMessages.REPORT_GENERATION_EXCEPTION)
-
-                report_obj = None
-                if report_response and report_response.get("report_data"):
-                    try:
-                        report_obj = ConversationReport(**report_response.get("report_data"))
-                    except Exception as e:
-                        logger.error(f"리포트 객체 변환 실패: {e}")
-                        report_obj = None
+                with track_stage("report_enqueue"):
+                    await self._enqueue_report(conversation)
 
                 return create_success_response(
                     conversation_id=str(conversation.id),
                     question_number=question_number,
                     question_text=question_text,
-                    message=Messages.ALL_ANSWERS_COMPLETE,
+                    message=Messages.REPORT_GENERATION_QUEUED,
                     user_id=user_id,
                     user_message=conversation.user_message,
                     audio_uri_1=conversation.audio_uri_1,
                     audio_uri_2=conversation.audio_uri_2,
                     audio_uri_3=conversation.audio_uri_3,
-                    report=report_obj
+                    report_status=conversation.report_status
                 )
             else:
                 return create_success_response(
@@ -114,40 +148,35 @@ class AnswerService:
                 user_id=user_id
             )
 
-    async def _save_report(self, conversation: Conversation, report_response: Dict):
-        """리포트 저장"""
+    async def _enqueue_report(self, conversation: Conversation) -> None:
+        """
+        리포트 작업 등록 (등록에 실패하면 대화를 FAILED로 기록해 PENDING에 머물지 않게 함)
+        
+        작업을 먼저 등록하면 전사 결과 저장 전에 워커가 가져갈 수 있으므로 PENDING 기록 후 등록합니다.
+        """
         try:
-            if report_response and report_response.get("report_data"):
-                report_data = report_response.get("report_data")
-
-                if report_response and report_response.get("report_data"):
-                    report_data = report_response.get("report_data")
-
-                if not isinstance(report_data.get("actions"), str) or not report_data["actions"].strip():
-                    report_data["actions"] = (
-                        "오늘 하루를 마무리하며 자신을 돌보는 시간을 가져보세요. "
-                        "10분 정도 깊게 호흡하고 따뜻한 차 한 잔을 마시며 "
-                        "스스로에게 '오늘도 정말 수고했어'라고 말해보세요."
-                    )
-
-                if not isinstance(report_data.get("letter"), str) or not report_data["letter"].strip():
-                    report_data["letter"] = (
-                        "오늘도 최선을 다한 당신, 정말 수고하셨어요. "
-                        "스스로를 조금 더 따뜻하게 돌보는 시간을 가져보길 바라요."
-                    )
-
-                report_obj = ConversationReport(**report_data)
-                conversation.report = report_obj
-                await conversation.save()
-                logger.info("리포트 저장 완료")
-
+            await self.report_job_service.enqueue(conversation)
         except Exception as e:
-            logger.error(f"리포트 저장 실패: {e}")
-            raise e
+            await conversation.set_fields({
+                "report_status": ReportStatus.FAILED,
+                "report_error": format_message(ErrorMessages.REPORT_JOB_ENQUEUE_FAILED, error=safe_get_error_message(e))
+            })
+            raise
     
-    async def _ensure_user_exists(self, user_id: str) -> User:
-        """사용자가 존재하는지 확인하고, 없으면 오류 발생"""
-        user = await User.find_one(User.user_id == user_id)
+    def _validate_question_number(self, question_number: Optional[int]) -> None:
+        """질문 번호 유효성 검사"""
+        if question_number is None or not self.question_service.is_valid_question_number(question_number):
+            raise HTTPException(
+                status_code=400,
+                detail=format_message(
+                    ErrorMessages.INVALID_QUESTION_NUMBER,
+                    max_questions=self.question_service.get_total_questions()
+                )
+            )
+    
+    async def _ensure_user_exists(self, user_id: str) -> UserQuestionProfile:
+        """사용자가 존재하는지 확인하고, 없으면 오류 발생 (질문 개인화 필드만 조회)"""
+        user = await self.user_cache.get_user(user_id, UserQuestionProfile)
         if not user:
             raise HTTPException(
                 status_code=404,
@@ -155,45 +184,72 @@ class AnswerService:
             )
         return user
     
-    async def _find_or_create_conversation(self, user_id: str) -> Conversation:
-        """사용자의 오늘 날짜 Conversation 찾기 또는 새로 생성"""
+    async def _find_or_create_conversation(
+        self,
+        user_id: str,
+        fields: Optional[Dict[str, Any]] = None
+    ) -> Conversation:
+        """
+        사용자의 오늘 날짜 Conversation을 원자적으로 찾거나 생성 (find-one-and-update upsert)
+        
+        (user_id, conversation_date) 고유 인덱스와 함께 동시 업로드에도 문서가 하나만 생성됩니다.
+        fields가 주어지면 같은 연산에서 $set으로 함께 갱신합니다.
+        """
         today = get_korea_today_date()
+        fields = fields or {}
+        new_id = PydanticObjectId()
+        
+        on_insert = Conversation(
+            id=new_id,
+            user_id=user_id,
+            conversation_date=today,
+            user_message=Defaults.USER_MESSAGE_EMPTY,
+            ai_sentiment=DEFAULT_AI_SENTIMENT,
+            ai_score=DEFAULT_AI_SCORE,
+            ai_comfort_message=Messages.DEFAULT_COMFORT_MESSAGE
+        ).model_dump(by_alias=True, exclude={"revision_id", *fields.keys()})
         
-        conversation = await Conversation.find_one(
-            Conversation.user_id == user_id,
-            Conversation.conversation_date == today
+        update = {"$setOnInsert": on_insert}
+        if fields:
+            update["$set"] = fields
+        
+        document = await Conversation.get_motor_collection().find_one_and_update(
+            Encoder().encode({"user_id": user_id, "conversation_date": today}),
+            Encoder().encode(update),
+            upsert=True,
+            return_document=ReturnDocument.AFTER
         )
+        conversation = parse_obj(Conversation, document)
         
-        if not conversation:
-            conversation = Conversation(
-                user_id=user_id,
-                conversation_date=today,
-                user_message=Defaults.USER_MESSAGE_EMPTY,
-                ai_sentiment=DEFAULT_AI_SENTIMENT,
-                ai_score=DEFAULT_AI_SCORE,
-                ai_comfort_message=Messages.DEFAULT_COMFORT_MESSAGE
-            )
-            await conversation.save()
+        if conversation.id == new_id:
+            self.report_cache.invalidate_user_lists(user_id)
             logger.info(format_message(Messages.CONVERSATION_CREATED, user_id=user_id, date=today))
         return conversation
     
-    async def _save_audio_uri(self, conversation: Conversation, question_number: int, audio_uri: str):
-        """오디오 URI 저장"""
+    async def _save_audio_uri(self, user_id: str, question_number: int, audio_uri: str) -> Conversation:
+        """오늘 Conversation에 오디오 URI 저장 (없으면 생성, 한 번의 왕복)"""
         try:
-            audio_field = f"audio_uri_{question_number}"
-            setattr(conversation, audio_field, audio_uri)
-            await conversation.save()
+            # 새 오디오가 들어오면 이전 STT 결과는 무효화
+            conversation = await self._find_or_create_conversation(user_id, {
+                f"audio_uri_{question_number}": audio_uri,
+                f"transcript_{question_number}": None
+            })
             logger.info(format_message(
                 Messages.AUDIO_URI_SAVE_SUCCESS, 
                 question_number=question_number, 
                 audio_uri=audio_uri
             ))
+            return conversation
         except Exception as e:
             logger.error(format_message(Messages.AUDIO_URI_SAVE_FAILED, error=e))
             raise e
     
-    async def _process_all_audio_to_text(self, conversation: Conversation, user: User):
-        """모든 오디오 파일을 STT 처리하여 통합된 텍스트로 변환"""
+    async def _process_all_audio_to_text(
+        self,
+        conversation: Conversation,
+        user: UserQuestionProfile
+    ) -> Dict[str, Optional[str]]:
+        """모든 오디오 파일을 STT 처리하여 통합된 텍스트로 변환 (저장할 필드 반환)"""
         try:
             logger.info(Messages.STT_START)
             
@@ -201,48 +257,129 @@ class AnswerService:
             
             if not audio_uris:
                 logger.warning(Messages.STT_NO_FILES)
-                return
+                return {}
             
             logger.info(format_message(Messages.STT_PROCESSING, count=len(audio_uris)))
             
+            semaphore = asyncio.Semaphore(settings.STT_MAX_CONCURRENCY)
+            results = await asyncio.gather(*[
+                self._resolve_transcript(semaphore, conversation, question_num, audio_uri)
+                for question_num, audio_uri in audio_uris
+            ])
+
             message_parts = []
-            
-            for question_num, audio_uri in audio_uris:
-                try:
-                    question_text = self.question_service.get_question_text(question_num, user)
-                    transcribed_text = self.speech_to_text_service.transcribe_audio(audio_uri)
-                    
-                    if question_text and transcribed_text:
-                        message_parts.extend([
-                            f"Q{question_num}: {question_text}",
-                            f"A{question_num}: {transcribed_text}"
-                        ])
-                    
-                    logger.info(format_message(
-                        Messages.STT_QUESTION_SUCCESS,
-                        question_num=question_num,
-                        text=transcribed_text[:Defaults.TEXT_PREVIEW_LENGTH]
-                    ))
-                    
-                except Exception as e:
-                    logger.error(format_message(Messages.STT_QUESTION_FAILED, question_num=question_num, error=e))
-                    question_text = self.question_service.get_question_text(question_num, user)
+            fields: Dict[str, Optional[str]] = {}
+
+            for question_num, transcribed_text, error in results:
+                question_text = self.question_service.get_question_text(question_num, user)
+
+                if error is not None:
+                    logger.error(format_message(Messages.STT_QUESTION_FAILED, question_num=question_num, error=error))
                     if question_text:
-                        message_parts.extend([
-                            f"Q{question_num}: {question_text}",
-                            f"A{question_num}: {format_message(ErrorMessages.STT_CONVERSION_FAILED_ANSWER, error=str(e))}"
-                        ])
-            
-            conversation.user_message = '\n'.join(message_parts)
+                        message_parts.extend(format_answer_lines(
+                            question_num,
+                            question_text,
+                            format_message(ErrorMessages.STT_CONVERSION_FAILED_ANSWER, error=str(error))
+                        ))
+                    continue
+
+                fields[f"transcript_{question_num}"] = transcribed_text
+
+                if question_text and transcribed_text:
+                    message_parts.extend(format_answer_lines(question_num, question_text, transcribed_text))
+
+                logger.info(format_message(
+                    Messages.STT_QUESTION_SUCCESS,
+                    question_num=question_num,
+                    text=transcribed_text[:Defaults.TEXT_PREVIEW_LENGTH]
+                ))
             
-            await self._update_user_last_active(conversation.user_id)
-            await conversation.save()
+            fields["user_message"] = '\n'.join(message_parts)
             logger.info(Messages.STT_COMPLETE)
+            return fields
             
         except Exception as e:
             logger.error(format_message(Messages.STT_FAILED, error=e))
             raise e
     
+    async def _resolve_transcript(
+        self,
+        semaphore: asyncio.Semaphore,
+        conversation: Conversation,
+        question_num: int,
+        audio_uri: str
+    ) -> Tuple[int, Optional[str], Optional[Exception]]:
+        """저장된/진행 중인 STT 결과를 우선 사용하고, 없을 때만 새로 변환 (실패는 결과로 반환)"""
+        with track_stage(f"stt_q{question_num}"):
+            return await self._wait_or_transcribe(semaphore, conversation, question_num, audio_uri)
+
+    async def _wait_or_transcribe(
+        self,
+        semaphore: asyncio.Semaphore,
+        conversation: Conversation,
+        question_num: int,
+        audio_uri: str
+    ) -> Tuple[int, Optional[str], Optional[Exception]]:
+        stored_text = getattr(conversation, f"transcript_{question_num}")
+        if stored_text:
+            logger.info(format_message(Messages.STT_TRANSCRIPT_REUSED, question_num=question_num))
+            return question_num, stored_text, None
+
+        pending = self._background_transcriptions.get(audio_uri)
+        if pending is not None:
+            pending_text = await asyncio.shield(pending)
+            if pending_text:
+                logger.info(format_message(Messages.STT_TRANSCRIPT_REUSED, question_num=question_num))
+                return question_num, pending_text, None
+
+        async with semaphore:
+            try:
+                transcribed_text = await self.speech_to_text_service.transcribe_audio(audio_uri)
+                return question_num, transcribed_text, None
+            except Exception as e:
+                return question_num, None, e
+
+    def _schedule_background_transcription(
+        self,
+        conversation: Conversation,
+        question_number: int,
+        audio_uri: str
+    ) -> None:
+        """업로드 직후 해당 오디오의 STT를 백그라운드로 시작"""
+        task = asyncio.create_task(
+            self._transcribe_and_store(conversation.id, question_number, audio_uri)
+        )
+        self._background_transcriptions[audio_uri] = task
+        task.add_done_callback(lambda _: self._background_transcriptions.pop(audio_uri, None))
+        logger.info(format_message(
+            Messages.STT_BACKGROUND_SCHEDULED,
+            question_num=question_number,
+            audio_uri=audio_uri
+        ))
+
+    async def _transcribe_and_store(
+        self,
+        conversation_id,
+        question_number: int,
+        audio_uri: str
+    ) -> Optional[str]:
+        """오디오를 STT 처리하고, 오디오가 교체되지 않은 경우에만 결과를 저장"""
+        try:
+            with track_stage("stt_background"):
+                transcribed_text = await self.speech_to_text_service.transcribe_audio(audio_uri)
+            result = await Conversation.get_motor_collection().update_one(
+                {"_id": conversation_id, f"audio_uri_{question_number}": audio_uri},
+                {"$set": {f"transcript_{question_number}": transcribed_text}}
+            )
+            if result.matched_count:
+                logger.info(format_message(Messages.STT_BACKGROUND_SAVED, question_num=question_number))
+            else:
+                logger.warning(format_message(Messages.STT_BACKGROUND_STALE, question_num=question_number))
+            return transcribed_text
+        except Exception as e:
+            logger.error(format_message(Messages.STT_BACKGROUND_FAILED, question_num=question_number, error=e))
+            return None
+    
     def _collect_audio_uris(self, conversation: Conversation) -> List[Tuple[int, str]]:
         """Conversation에서 오디오 URI들을 수집"""
         audio_uris = []
@@ -255,17 +392,15 @@ class AnswerService:
     async def _update_user_last_active(self, user_id: str) -> None:
         """사용자 마지막 활동 시간 업데이트"""
         try:
-            user = await User.find_one(User.user_id == user_id)
-            if user:
-                user.last_active = get_korea_now()
-                await user.save()
-                logger.debug(format_message(Messages.USER_LAST_ACTIVE_DEBUG, user_id=user_id))
+            await User.find_one(User.user_id == user_id).update(
+                {"$set": {"last_active": get_korea_now()}}
+            )
+            self.user_cache.invalidate(user_id)
+            logger.debug(format_message(Messages.USER_LAST_ACTIVE_DEBUG, user_id=user_id))
         except Exception as e:
             logger.error(format_message(ErrorMessages.USER_LAST_ACTIVE_UPDATE_FAILED, error=e))
 
 
-answer_service = AnswerService()
-
 def get_answer_service() -> AnswerService:
     """Answer 서비스 인스턴스 반환"""
-    return answer_service
+    return get_container().resolve("answer_service", AnswerService, close=lambda service: service.stop())
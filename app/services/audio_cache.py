@@ -0,0 +1,204 @@
+import os
+import hashlib
+import logging
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+from app.core.container import get_container
+
+logger = logging.getLogger(__name__)
+
+WORKER_DIR_PREFIX = "worker-"
+
+
+@dataclass
+class CachedAudio:
+    """캐시에 저장된 오디오 파일 정보"""
+    path: str
+    size: int
+    content_hash: Optional[str] = None
+    readers: int = 0  # 파일을 사용 중인 요청 수 (0이 될 때까지 삭제 보류)
+    evicted: bool = False
+
+
+class AudioCacheWriter:
+    """업로드 스트림을 캐시 파일로 기록하며 해시를 함께 계산"""
+
+    def __init__(self, cache: "AudioCacheService", gcs_uri: str, path: str):
+        self._cache = cache
+        self._gcs_uri = gcs_uri
+        self._path = path
+        self._file = open(path, "wb")
+        self._hash = hashlib.sha256()
+        self._size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self._hash.update(chunk)
+        self._size += len(chunk)
+
+    def commit(self) -> None:
+        """기록 완료 후 캐시에 등록"""
+        self._file.close()
+        self._cache.put(self._gcs_uri, CachedAudio(self._path, self._size, self._hash.hexdigest()))
+
+    def abort(self) -> None:
+        """기록 중단 시 파일 정리"""
+        self._file.close()
+        self._cache.remove_file(self._path)
+
+
+class AudioCacheService:
+    """
+    GCS URI를 키로 하는 디스크 기반 오디오 캐시 (LRU + 전체 용량 제한)
+
+    - 인덱스는 프로세스 메모리에만 있으므로 워커 프로세스마다 전용 하위 디렉터리와 용량(max_bytes)을 사용
+    - 시작 시 자기 디렉터리와 종료된 프로세스가 남긴 디렉터리를 비움 (재시작 / 배포마다 디스크가 늘지 않도록)
+    - acquire로 사용 중인 파일은 release될 때까지 제거를 미룸
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = settings.AUDIO_CACHE_DIR,
+        max_bytes: int = settings.AUDIO_CACHE_MAX_BYTES
+    ):
+        self.root_dir = cache_dir
+        self.cache_dir = os.path.join(cache_dir, f"{WORKER_DIR_PREFIX}{os.getpid()}")
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedAudio]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._prepare_directories()
+
+    def _prepare_directories(self) -> None:
+        """이 프로세스의 디렉터리를 새로 만들고, 이전 실행이 남긴 파일 정리"""
+        os.makedirs(self.root_dir, exist_ok=True)
+        removed = 0
+        for name in os.listdir(self.root_dir):
+            path = os.path.join(self.root_dir, name)
+            if name.startswith(WORKER_DIR_PREFIX) and os.path.isdir(path):
+                pid = name[len(WORKER_DIR_PREFIX):]
+                if path != self.cache_dir and pid.isdigit() and _process_alive(int(pid)):
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+            elif os.path.isfile(path):
+                # 워커별 디렉터리를 쓰기 전 버전이 남긴 파일
+                self.remove_file(path)
+                removed += 1
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if removed:
+            logger.info(f"🧹 이전 실행의 오디오 캐시 정리: {removed}개 항목 ({self.root_dir})")
+
+    def close(self) -> None:
+        """종료 시 이 프로세스의 캐시 디렉터리 삭제"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def new_path(self, gcs_uri: str) -> str:
+        """캐시 디렉터리에 새 파일 경로 생성 (확장자 유지)"""
+        _, ext = os.path.splitext(gcs_uri)
+        fd, path = tempfile.mkstemp(suffix=ext or ".bin", dir=self.cache_dir)
+        os.close(fd)
+        return path
+
+    def open_writer(self, gcs_uri: str) -> Optional[AudioCacheWriter]:
+        """업로드와 동시에 캐시를 채우기 위한 writer 반환 (캐시 비활성 시 None)"""
+        if not self.enabled:
+            return None
+        return AudioCacheWriter(self, gcs_uri, self.new_path(gcs_uri))
+
+    def get(self, gcs_uri: str) -> Optional[CachedAudio]:
+        """캐시 조회 (적중 시 최근 사용으로 갱신)"""
+        with self._lock:
+            return self._lookup(gcs_uri)
+
+    def acquire(self, gcs_uri: str) -> Optional[CachedAudio]:
+        """
+        캐시 조회 후 파일을 사용 중으로 표시합니다.
+        반환된 항목은 사용이 끝나면 반드시 release로 반환해야 합니다. (그 전까지는 제거되어도 파일 유지)
+        """
+        with self._lock:
+            entry = self._lookup(gcs_uri)
+            if entry is not None:
+                entry.readers += 1
+            return entry
+
+    def release(self, entry: CachedAudio) -> None:
+        """acquire한 항목 반환 (사용 중에 제거된 항목이면 마지막 사용자가 파일 삭제)"""
+        with self._lock:
+            entry.readers -= 1
+            remove = entry.evicted and entry.readers == 0
+        if remove:
+            self.remove_file(entry.path)
+
+    def _lookup(self, gcs_uri: str) -> Optional[CachedAudio]:
+        entry = self._entries.get(gcs_uri)
+        if entry is None:
+            return None
+        if not os.path.exists(entry.path):
+            self._entries.pop(gcs_uri)
+            self._total_bytes -= entry.size
+            return None
+        self._entries.move_to_end(gcs_uri)
+        return entry
+
+    def put(self, gcs_uri: str, entry: CachedAudio) -> None:
+        """캐시 등록 후 용량 초과분을 오래된 순으로 제거"""
+        if not self.enabled or entry.size > self.max_bytes:
+            self.remove_file(entry.path)
+            return
+
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(gcs_uri, None)
+            if previous is not None:
+                self._total_bytes -= previous.size
+                evicted.append(previous)
+            self._entries[gcs_uri] = entry
+            self._total_bytes += entry.size
+            while self._total_bytes > self.max_bytes:
+                _, oldest = self._entries.popitem(last=False)
+                self._total_bytes -= oldest.size
+                evicted.append(oldest)
+            # 사용 중인 파일은 release 시점에 삭제
+            removable = []
+            for old in evicted:
+                old.evicted = True
+                if old.readers == 0:
+                    removable.append(old)
+
+        for old in removable:
+            self.remove_file(old.path)
+
+    def remove_file(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def get_audio_cache_service() -> AudioCacheService:
+    """오디오 캐시 서비스 인스턴스 반환"""
+    return get_container().resolve("audio_cache_service", AudioCacheService, close=lambda cache: cache.close())
@@ -1,10 +1,13 @@
 import uuid
 import logging
 import asyncio
+from typing import AsyncIterator, Optional
 from google.cloud import storage
-from fastapi import UploadFile
 
 from app.core.config import settings
+from app.core.container import get_container
+from app.services.audio_cache import AudioCacheWriter, get_audio_cache_service
+from app.utils.common import parse_gcs_uri
 
 logger = logging.getLogger(__name__)
 
@@ -13,42 +16,77 @@ class GCPStorageService:
     """GCP Cloud Storage 관리 서비스"""
     
     def __init__(self):
-        self.client = storage.Client()
+        self.client = get_storage_client()
         self.bucket_name = settings.GCP_BUCKET_NAME
         self.bucket = self.client.bucket(self.bucket_name)
+        self.audio_cache = get_audio_cache_service()
     
-    async def upload_audio_file(self, audio_file: UploadFile, user_id: str) -> str:
+    async def upload_audio_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        user_id: str,
+        filename: str,
+        content_type: str
+    ) -> str:
         """
-        오디오 파일을 GCP Storage에 업로드
+        오디오 청크 스트림을 GCP Storage에 resumable 업로드
         
         Args:
-            audio_file: 업로드할 오디오 파일
+            chunks: 검증된 오디오 데이터 청크 스트림
             user_id: 사용자 ID
+            filename: 원본 파일명 (확장자 추출용)
+            content_type: 오디오 MIME 타입
             
         Returns:
             str: 업로드된 파일의 GCS URI
         """
+        file_extension = filename.split('.')[-1] if '.' in filename else 'wav'
+        unique_filename = f"audio/{user_id}/{uuid.uuid4()}.{file_extension}"
+        gcs_uri = f"gs://{self.bucket_name}/{unique_filename}"
+        blob = self.bucket.blob(unique_filename)
+        
+        # 첫 청크(형식 검증 완료)를 받기 전에는 업로드를 시작하지 않음
+        chunks = aiter(chunks)
+        first_chunk = await anext(chunks, b"")
+        
+        # 로컬 사본 없이 GCS_UPLOAD_CHUNK_SIZE 단위로 버퍼링하며 바로 전송 (STT용 로컬 캐시도 함께 채움)
+        writer = blob.open("wb", chunk_size=settings.GCS_UPLOAD_CHUNK_SIZE, content_type=content_type)
+        cache_writer = self.audio_cache.open_writer(gcs_uri)
         try:
-            file_extension = audio_file.filename.split('.')[-1] if '.' in audio_file.filename else 'wav'
-            unique_filename = f"audio/{user_id}/{uuid.uuid4()}.{file_extension}"
-            
-            # 파일 전체를 메모리에 올리지 않고 스트리밍 업로드
-            audio_file.file.seek(0)
-            blob = self.bucket.blob(unique_filename)
-            await asyncio.to_thread(
-                blob.upload_from_file,
-                audio_file.file,
-                content_type=audio_file.content_type,
-            )
-
-            gcs_uri = f"gs://{self.bucket_name}/{unique_filename}"
-            logger.info(f"✅ 오디오 파일 업로드 완료: {gcs_uri}")
-            
-            return gcs_uri
-            
+            await asyncio.to_thread(self._write_chunk, writer, cache_writer, first_chunk)
+            async for chunk in chunks:
+                await asyncio.to_thread(self._write_chunk, writer, cache_writer, chunk)
+            await asyncio.to_thread(writer.close)
         except Exception as e:
             logger.error(f"❌ 오디오 파일 업로드 실패: {e}")
+            if cache_writer:
+                cache_writer.abort()
+            # close()는 받은 만큼을 객체로 확정하므로 호출하지 않고 세션을 취소
+            await asyncio.to_thread(self._cancel_upload, writer)
             raise e
+
+        if cache_writer:
+            cache_writer.commit()
+        logger.info(f"✅ 오디오 파일 업로드 완료: {gcs_uri}")
+        return gcs_uri
+    
+    def _write_chunk(self, writer, cache_writer: Optional[AudioCacheWriter], chunk: bytes):
+        """GCS 업로드 버퍼와 로컬 캐시에 청크 기록"""
+        writer.write(chunk)
+        if cache_writer:
+            cache_writer.write(chunk)
+    
+    def _cancel_upload(self, writer):
+        """중단된 resumable 업로드 세션 취소 (세션을 열기 전이면 버퍼만 정리, 객체는 생성되지 않음)"""
+        try:
+            writer.terminate()
+        except Exception as e:
+            logger.warning(f"⚠️ 중단된 업로드 세션 취소 실패 (확정되지 않은 세션은 만료 후 삭제됨): {e}")
+    
+    async def delete_audio_file(self, gcs_uri: str):
+        """GCS에 업로드된 오디오 파일 삭제"""
+        _, blob_name = parse_gcs_uri(gcs_uri)
+        await asyncio.to_thread(self.bucket.blob(blob_name).delete)
     
     def get_public_url(self, gcs_uri: str) -> str:
         """GCS URI를 공개 URL로 변환"""
@@ -57,8 +95,10 @@ class GCPStorageService:
         return blob.public_url
 
 
-gcp_storage_service = GCPStorageService()
+def get_storage_client() -> storage.Client:
+    """GCS 클라이언트 (업로드와 STT 다운로드가 같은 인스턴스 / 커넥션 풀 공유, 첫 사용 시 자격 증명 조회)"""
+    return get_container().resolve("storage_client", storage.Client, close=lambda client: client.close())
 
 def get_gcp_storage_service() -> GCPStorageService:
     """GCP Storage 서비스 인스턴스 반환"""
-    return gcp_storage_service
+    return get_container().resolve("gcp_storage_service", GCPStorageService)
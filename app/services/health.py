@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.constants import GCS_REQUIRED_PERMISSIONS, ErrorMessages, Messages
+from app.core.container import get_container
+from app.core.database import check_mongo_ready, db
+from app.external.ai.client import get_ai_client
+from app.external.ai.composite import CompositeAIClient
+from app.services.gcp_storage import get_storage_client
+from app.utils.common import format_message, safe_get_error_message
+
+logger = logging.getLogger(__name__)
+
+_PROCESS_STARTED_AT = time.monotonic()
+
+
+class DependencyCheckError(Exception):
+    """의존성이 응답했지만 사용할 수 없는 상태"""
+
+
+class HealthService:
+    """
+    liveness / readiness 확인 서비스
+
+    - liveness: 프로세스와 이벤트 루프가 응답하는지만 확인 (의존성 장애로 재시작되지 않도록)
+    - readiness: MongoDB ping, GCS 버킷 권한, AI 제공자 사용 가능 여부를 동시에 확인
+    - 확인 결과는 HEALTH_CACHE_SECONDS 동안 재사용하고, 동시에 들어온 probe는 한 번의 확인을 공유
+    """
+
+    def __init__(
+        self,
+        cache_seconds: float = settings.HEALTH_CACHE_SECONDS,
+        timeout_seconds: float = settings.HEALTH_CHECK_TIMEOUT_SECONDS
+    ):
+        self.cache_seconds = cache_seconds
+        self.timeout_seconds = timeout_seconds
+        self._lock = asyncio.Lock()
+        self._cached: Optional[Dict[str, Any]] = None
+        self._cached_until = 0.0
+        self._ready: Optional[bool] = None
+
+    def check_liveness(self) -> Dict[str, Any]:
+        return {"status": "alive", "uptime_seconds": round(time.monotonic() - _PROCESS_STARTED_AT, 1)}
+
+    async def check_readiness(self) -> Dict[str, Any]:
+        """
+        의존성 상태를 확인합니다. (캐시된 결과가 있으면 그대로 반환)
+
+        Returns:
+            Dict[str, Any]: status(ready / not_ready), 의존성별 status / latency_ms / error, cached
+        """
+        if self._cached is not None and time.monotonic() < self._cached_until:
+            return {**self._cached, "cached": True}
+
+        async with self._lock:
+            if self._cached is not None and time.monotonic() < self._cached_until:
+                return {**self._cached, "cached": True}
+
+            names = ("mongo", "gcs", "ai")
+            results = await asyncio.gather(
+                self._run_check(self._check_mongo),
+                self._run_check(self._check_gcs),
+                self._run_check(self._check_ai),
+            )
+            checks = dict(zip(names, results))
+            ready = all(check["status"] == "ok" for check in checks.values())
+            self._log_transition(ready, checks)
+
+            self._cached = {"status": "ready" if ready else "not_ready", "checks": checks}
+            self._cached_until = time.monotonic() + self.cache_seconds
+            return {**self._cached, "cached": False}
+
+    async def _run_check(self, check: Callable[[], Awaitable[Optional[Dict[str, Any]]]]) -> Dict[str, Any]:
+        """check를 제한 시간 안에 실행하고 결과와 소요 시간 반환"""
+        started = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(check(), timeout=self.timeout_seconds)
+            result: Dict[str, Any] = {"status": "ok", **(details or {})}
+        except asyncio.TimeoutError:
+            result = {
+                "status": "error",
+                "error": format_message(ErrorMessages.HEALTH_CHECK_TIMEOUT, timeout=self.timeout_seconds),
+            }
+        except Exception as e:
+            result = {"status": "error", "error": safe_get_error_message(e)}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    async def _check_mongo(self) -> None:
+        if db.client is None:
+            raise DependencyCheckError(ErrorMessages.HEALTH_MONGO_NOT_CONNECTED)
+        await check_mongo_ready()
+
+    async def _check_gcs(self) -> None:
+        """자격 증명으로 버킷 권한 확인 (testIamPermissions는 별도 권한 없이 호출 가능)"""
+        bucket = get_storage_client().bucket(settings.GCP_BUCKET_NAME)
+        granted = await asyncio.to_thread(
+            bucket.test_iam_permissions,
+            GCS_REQUIRED_PERMISSIONS,
+            timeout=self.timeout_seconds,
+            retry=None,
+        )
+        missing = [permission for permission in GCS_REQUIRED_PERMISSIONS if permission not in granted]
+        if missing:
+            raise DependencyCheckError(
+                format_message(ErrorMessages.HEALTH_GCS_PERMISSION_MISSING, permissions=", ".join(missing))
+            )
+
+    async def _check_ai(self) -> Dict[str, Any]:
+        """API 키 / 초기화 상태만 확인 (외부 호출 없음)"""
+        ai_client = get_ai_client()
+        if isinstance(ai_client, CompositeAIClient):
+            providers = {name: client.is_available() for name, client in ai_client.providers.items()}
+        else:
+            providers = {settings.AI_CLIENT_TYPE: ai_client.is_available()}
+        if not any(providers.values()):
+            raise DependencyCheckError(ErrorMessages.HEALTH_AI_UNAVAILABLE)
+        return {"providers": providers}
+
+    def _log_transition(self, ready: bool, checks: Dict[str, Dict[str, Any]]) -> None:
+        """상태가 바뀔 때만 로그 (probe마다 반복 기록하지 않음)"""
+        if ready == self._ready:
+            return
+        if ready:
+            if self._ready is not None:
+                logger.info(Messages.HEALTH_READY)
+        else:
+            failed = {name: check.get("error") for name, check in checks.items() if check["status"] != "ok"}
+            logger.warning(format_message(Messages.HEALTH_NOT_READY, failed=failed))
+        self._ready = ready
+
+
+def get_health_service() -> HealthService:
+    """상태 확인 서비스 인스턴스 반환"""
+    return get_container().resolve("health_service", HealthService)
@@ -1,13 +1,18 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from app.core.constants import QUESTIONS, FAMILY_MEMBER_TITLES, DEFAULT_FAMILY_TITLE
+from app.core.container import get_container
 from app.schemas.common import FamilyRelationship, Gender
-from app.models.models import User
+from app.models.models import User, UserQuestionProfile
 
 class QuestionService:
     """질문 관리 서비스"""
     
     @classmethod
-    def get_question_text(cls, question_number: int, user: Optional[User] = None) -> Optional[str]:
+    def get_question_text(
+        cls,
+        question_number: int,
+        user: Optional[Union[User, UserQuestionProfile]] = None
+    ) -> Optional[str]:
         """질문 번호로 질문 내용 조회 (사용자 정보에 따라 동적 생성)"""
         question_template = QUESTIONS.get(question_number)
         if not question_template:
@@ -41,8 +46,6 @@ class QuestionService:
         return len(QUESTIONS)
 
 
-question_service = QuestionService()
-
 def get_question_service() -> QuestionService:
     """Question 서비스 인스턴스 반환"""
-    return question_service
+    return get_container().resolve("question_service", QuestionService)
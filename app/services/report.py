@@ -1,20 +1,24 @@
-import uuid
-from datetime import datetime
-from zoneinfo import ZoneInfo
-from app.core.constants import KOREA_TIMEZONE
+import asyncio
+from datetime import date, datetime
 from fastapi import HTTPException
-from typing import Dict, Optional
+from fastapi.responses import JSONResponse
+from typing import AsyncIterator, Dict, List, Optional, Union
 import logging
 from beanie import PydanticObjectId
 
+from app.core.config import settings
+from app.core.container import get_container
+from app.core.database import collection_for_read
 from app.external.ai.client import get_ai_client
-from app.models import Conversation
-from app.models.models import ConversationSummary
+from app.models import Conversation, Report
+from app.models.models import ConversationReportState, ReportSummary, REPORT_LISTING_INDEX
 from app.prompts.report import EmotionReportPrompt
-from app.core.constants import ErrorMessages
-from app.schemas import ConversationReportEmotion, ConversationReport
-from app.schemas.responses import ReportDetailResponse
+from app.core.constants import Defaults, ErrorMessages
+from app.schemas import ConversationReport, ReportStatus
+from app.schemas.responses import ReportDetailResponse, ReportStatusResponse
+from app.services.report_cache import get_report_response_cache
 from app.utils.common import format_message, format_date_for_display
+from app.utils.json_stream import IncrementalJSONParser, JSONStreamEvent
 
 logger = logging.getLogger(__name__)
 
@@ -22,147 +26,247 @@ logger = logging.getLogger(__name__)
 class ReportService:
     """감정 리포트 생성 서비스"""
     
+    # 토큰 단위로 스트리밍할 긴 문자열 필드
+    STREAM_FIELDS = ("actions", "letter")
+    
     def __init__(self):
         self.ai_client = get_ai_client()
         self.report_prompt = EmotionReportPrompt()
+        self.report_cache = get_report_response_cache()
     
-    async def generate_emotion_report(
-        self, 
-        user_answers: str, 
-        user_id: Optional[str] = None
-    ) -> Dict:
+    async def stream_emotion_report(self, user_answers: str) -> AsyncIterator[JSONStreamEvent]:
         """
-        감정 리포트를 생성합니다.
+        감정 리포트를 스트리밍으로 생성합니다.
         
         Args:
             user_answers: Q&A 형식의 사용자 답변 텍스트
-                예: "Q1: 질문\nA1: 답변\nQ2: 질문\nA2: 답변..."
-            user_id: 사용자 ID (선택사항)
             
-        Returns:
-            Dict: 리포트 생성 결과
-                - user_id: 사용자 ID
-                - report_data: 생성된 리포트 데이터 (성공시)
-                - error: 오류 메시지 (실패시)
-                - generated_at: 생성 시간 (ISO 형식)
+        Yields:
+            JSONStreamEvent: 완성된 필드 값(value) 또는 actions/letter의 부분 텍스트(delta).
+                마지막 이벤트는 path=""인 전체 리포트 데이터 (ConversationReport로 검증됨)
+        
+        Raises:
+            ValueError: 응답이 완전한 JSON으로 끝나지 않았거나 스키마와 맞지 않는 경우
         """
+        prompt = self.report_prompt.generate(user_answers=user_answers)
+        parser = IncrementalJSONParser(stream_fields=self.STREAM_FIELDS)
+        
+        async for chunk in self.ai_client.generate_content_stream(prompt, response_model=ConversationReport):
+            for event in parser.feed(chunk):
+                if event.path == "":
+                    event.value = ConversationReport.model_validate(event.value).model_dump()
+                yield event
+            if parser.done:
+                return
+        
+        raise ValueError(ErrorMessages.REPORT_STREAM_INCOMPLETE)
+
+    async def save_report(self, conversation: Conversation, report_response: Dict):
+        """생성된 리포트를 reports 컬렉션에 저장하고 Conversation 상태를 완료로 변경"""
         try:
-            if not user_id:
-                user_id = str(uuid.uuid4())
-            
-            # 프롬프트 생성
-            prompt = self.report_prompt.generate(user_answers=user_answers)
-            
-            # AI 응답 생성
-            result_data = await self.ai_client.generate_structured_content(prompt)
-            
-            return {
-                "user_id": user_id,
-                "report_data": result_data,
-                "generated_at": datetime.now().isoformat()
-            }
-            
+            report_data = report_response.get("report_data")
+
+            if not isinstance(report_data.get("actions"), str) or not report_data["actions"].strip():
+                report_data["actions"] = (
+                    "오늘 하루를 마무리하며 자신을 돌보는 시간을 가져보세요. "
+                    "10분 정도 깊게 호흡하고 따뜻한 차 한 잔을 마시며 "
+                    "스스로에게 '오늘도 정말 수고했어'라고 말해보세요."
+                )
+
+            if not isinstance(report_data.get("letter"), str) or not report_data["letter"].strip():
+                report_data["letter"] = (
+                    "오늘도 최선을 다한 당신, 정말 수고하셨어요. "
+                    "스스로를 조금 더 따뜻하게 돌보는 시간을 가져보길 바라요."
+                )
+
+            report_obj = ConversationReport(**report_data)
+            # 재시도 시에도 같은 _id로 덮어쓰므로 멱등
+            await Report(
+                id=conversation.id,
+                user_id=conversation.user_id,
+                report_date=conversation.conversation_date,
+                report=report_obj,
+                provider=report_response.get("provider")
+            ).save()
+            await conversation.set_fields({
+                "report_status": ReportStatus.DONE,
+                "report_error": None
+            })
+            self.report_cache.invalidate_report(conversation.user_id, str(conversation.id))
+            logger.info("리포트 저장 완료")
+
         except Exception as e:
-            logger.error(format_message(ErrorMessages.REPORT_SERVICE_GENERATION_ERROR, error=e))
-            logger.exception(ErrorMessages.REPORT_SERVICE_GENERATION_EXCEPTION)
-            
-            if not user_id:
-                user_id = str(uuid.uuid4())
-            
-            return {
-                "user_id": user_id,
-                "error": ErrorMessages.REPORT_SERVICE_FALLBACK_ERROR,
-                "generated_at": datetime.now().isoformat()
-            }
+            logger.error(format_message(ErrorMessages.REPORT_SAVE_FAILED, error=e))
+            raise e
 
     async def get_user_reports(
             self,
             user_id: str,
-            year: int,
-            month: int
+            year: Optional[int] = None,
+            month: Optional[int] = None,
+            cursor: Optional[str] = None,
+            limit: int = Defaults.REPORT_PAGE_SIZE
     ) -> dict:
-        try:
-            tz = ZoneInfo(KOREA_TIMEZONE)
-            start = datetime(year, month, 1, tzinfo=tz)
-            if month == 12:
-                end = datetime(year + 1, 1, 1, tzinfo=tz)
-            else:
-                end = datetime(year, month + 1, 1, tzinfo=tz)
+        """
+        사용자 리포트 목록을 최신순으로 조회합니다.
 
-            query = {
-                "user_id": user_id,
-                "user_timestamp": {"$gte": start, "$lt": end}
-            }
+        reports 컬렉션의 (user_id, report_date, _id) 인덱스만으로 처리되는 covered query이며,
+        cursor(마지막 항목의 날짜) 기반 페이지네이션으로 페이지 크기만큼만 읽습니다.
+        MONGODB_REPORT_LIST_READ_PREFERENCE에 따라 secondary에서 읽을 수 있습니다. (목록 캐시 TTL과 같은 수준의 지연 허용)
 
-            rows: list[ConversationSummary] = (
-                await Conversation.find(query)
-                .sort(-Conversation.conversation_date)
-                .project(ConversationSummary)
-                .to_list()
-            )
+        Args:
+            user_id: 사용자 ID
+            year: 조회할 연도 (None이면 전체 기간)
+            month: 조회할 월 (None이면 연도 전체, year 필요)
+            cursor: 이전 페이지 응답의 next_cursor
+            limit: 페이지 크기
 
-            summaries = [
-                {
-                    "report_id": str(r.id),
-                    "report_date": format_date_for_display(r.conversation_date)
-                }
-                for r in rows
-            ]
-
-            return {
-                "total_count": len(rows),
-                "reports": summaries,
-            }
+        Returns:
+            dict: total_count(조회 기간 전체 리포트 수, cursor와 무관), reports, next_cursor
+        """
+        query = self._build_report_list_query(user_id, year, month, cursor)
+        count_query = self._build_report_list_query(user_id, year, month, None)
 
+        try:
+            rows, total_count = await asyncio.gather(
+                self._fetch_report_summaries(query, limit + 1),
+                collection_for_read(Report, settings.MONGODB_REPORT_LIST_READ_PREFERENCE).count_documents(
+                    count_query,
+                    hint=REPORT_LISTING_INDEX,
+                ),
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=format_message(ErrorMessages.HISTORY_QUERY_ERROR, error=str(e)),
             )
 
-    async def get_report_detail(self, user_id: str, report_id: str) -> ReportDetailResponse:
-        # 1) report_id 검증
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        summaries = [
+            {
+                "report_id": str(r.id),
+                "report_date": format_date_for_display(r.report_date)
+            }
+            for r in rows
+        ]
+
+        return {
+            "total_count": total_count,
+            "reports": summaries,
+            "next_cursor": rows[-1].report_date.isoformat() if has_more else None,
+        }
+
+    def _report_list_cursor(self, query: dict, limit: int):
+        """목록 조회 커서 (인덱스만으로 처리되도록 hint / projection / 정렬 지정, explain 검증에도 사용)"""
+        return collection_for_read(Report, settings.MONGODB_REPORT_LIST_READ_PREFERENCE).find(
+            query,
+            {"_id": 1, "report_date": 1},
+            hint=REPORT_LISTING_INDEX,
+            sort=[("report_date", -1)],
+            limit=limit,
+        )
+
+    async def _fetch_report_summaries(self, query: dict, limit: int) -> List[ReportSummary]:
+        return [ReportSummary.model_validate(doc) async for doc in self._report_list_cursor(query, limit)]
+
+    def _build_report_list_query(
+            self,
+            user_id: str,
+            year: Optional[int],
+            month: Optional[int],
+            cursor: Optional[str]
+    ) -> dict:
+        """목록 조회 조건 생성 (report_date 범위 + cursor 이전 날짜)"""
+        if month is not None and year is None:
+            raise HTTPException(status_code=400, detail=ErrorMessages.REPORT_MONTH_WITHOUT_YEAR)
+
+        date_range: dict = {}
+        if year is not None:
+            # report_date는 자정 기준 naive datetime으로 저장됨
+            if month is None:
+                date_range = {"$gte": datetime(year, 1, 1), "$lt": datetime(year + 1, 1, 1)}
+            elif month == 12:
+                date_range = {"$gte": datetime(year, 12, 1), "$lt": datetime(year + 1, 1, 1)}
+            else:
+                date_range = {"$gte": datetime(year, month, 1), "$lt": datetime(year, month + 1, 1)}
+
+        if cursor:
+            try:
+                cursor_date = date.fromisoformat(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=ErrorMessages.REPORT_INVALID_CURSOR)
+            cursor_at = datetime.combine(cursor_date, datetime.min.time())
+            date_range["$lt"] = min(date_range.get("$lt", cursor_at), cursor_at)
+
+        query: dict = {"user_id": user_id}
+        if date_range:
+            query["report_date"] = date_range
+        return query
+
+    async def get_report_version(self, user_id: str, report_id: str) -> Optional[str]:
+        """
+        저장된 리포트의 버전(created_at)을 조회합니다. (저장할 때마다 갱신, 응답 캐시 검증용)
+
+        Returns:
+            Optional[str]: 리포트가 아직 없으면 None
+        """
+        document = await Report.get_motor_collection().find_one(
+            {"_id": self._parse_report_id(report_id), "user_id": user_id},
+            {"created_at": 1}
+        )
+        if document is None:
+            return None
+        return str(document.get("created_at"))
+
+    def _parse_report_id(self, report_id: str) -> PydanticObjectId:
         try:
-            oid = PydanticObjectId(report_id)
+            return PydanticObjectId(report_id)
         except Exception:
             raise HTTPException(status_code=400, detail="invalid report_id")
 
-        # 2) 본인 소유 문서 조회
-        conv = await Conversation.find_one({"_id": oid, "user_id": user_id})
-        if not conv:
-            raise HTTPException(status_code=404, detail="report not found")
-
-        if not conv.report:
-            raise HTTPException(status_code=404, detail="report not ready")
-
-        if isinstance(conv.report, ConversationReport):
-            rep: ConversationReport = conv.report
-        elif isinstance(conv.report, dict):
-            rep = ConversationReport(**conv.report)
-        else:
-            rep = ConversationReport(**conv.report.model_dump())
+    async def get_report_detail(self, user_id: str, report_id: str) -> Union[ReportDetailResponse, JSONResponse]:
+        # 1) report_id 검증
+        oid = self._parse_report_id(report_id)
 
-        if isinstance(rep.emotion_analysis, ConversationReportEmotion):
-            analysis = rep.emotion_analysis
-        elif isinstance(rep.emotion_analysis, dict):
-            analysis = ConversationReportEmotion(**rep.emotion_analysis)
-        else:
-            analysis = ConversationReportEmotion(**rep.emotion_analysis.model_dump())
+        # 2) 본인 소유 리포트 조회
+        report = await Report.find_one({"_id": oid, "user_id": user_id})
+        if not report:
+            return await self._report_not_ready_response(user_id, oid)
 
-        date_str = conv.conversation_date
+        rep: ConversationReport = report.report
 
-        # 7) 응답
+        # 3) 응답
         return ReportDetailResponse(
-            report_id=str(conv.id),
-            report_date = format_date_for_display(conv.conversation_date),
+            report_id=str(report.id),
+            report_date = format_date_for_display(report.report_date),
             actions = rep.actions,
             letter = rep.letter,
             emotion_score = rep.emotion_score,
             daily_summary = rep.daily_summary,
-            emotion_analysis = analysis,
+            emotion_analysis = rep.emotion_analysis,
         )
 
+    async def _report_not_ready_response(self, user_id: str, oid: PydanticObjectId) -> JSONResponse:
+        """아직 리포트가 없는 경우 Conversation의 생성 상태로 응답 (진행 중이면 202)"""
+        state = await Conversation.find_one({"_id": oid, "user_id": user_id}).project(ConversationReportState)
+        if not state:
+            raise HTTPException(status_code=404, detail="report not found")
+
+        if state.report_status in (ReportStatus.PENDING, ReportStatus.RUNNING):
+            return JSONResponse(
+                status_code=202,
+                content=ReportStatusResponse(
+                    report_id=str(state.id),
+                    report_status=state.report_status
+                ).model_dump(mode="json")
+            )
+        if state.report_status == ReportStatus.FAILED:
+            raise HTTPException(status_code=500, detail=ErrorMessages.REPORT_SERVICE_FALLBACK_ERROR)
+        raise HTTPException(status_code=404, detail="report not ready")
+
 # 의존성 주입을 위한 함수
 def get_report_service() -> ReportService:
-    """ReportService 인스턴스를 반환합니다."""
-    return ReportService()
\ No newline at end of file
+    """ReportService 인스턴스를 반환합니다. (요청마다 새로 만들지 않고 공유)"""
+    return get_container().resolve("report_service", ReportService)
\ No newline at end of file
@@ -0,0 +1,126 @@
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.container import get_container
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """직렬화된 응답 본문과 ETag (version: 본문을 만들 때의 저장본 버전, verified_at: 저장본 버전을 마지막으로 확인한 시각)"""
+
+    def __init__(self, body: bytes, version: Optional[str] = None):
+        self.body = body
+        self.version = version
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        self.verified_at = time.monotonic()
+
+
+class ReportResponseCache:
+    """
+    리포트 조회 응답 캐시 (직렬화된 JSON + ETag)
+
+    - 상세: (user_id, report_id) 키, 요청마다 저장된 리포트의 버전(created_at)과 비교해 사용
+      (Q3 재제출로 같은 _id에 다시 저장되면 다른 워커 프로세스의 캐시도 다음 요청에서 무효화, TTL은 메모리 상한 용도)
+      If-None-Match 요청은 version_check_seconds 안에 확인한 버전이면 저장본 조회 없이 비교
+      (다른 워커 프로세스의 재저장은 최대 version_check_seconds 늦게 반영)
+    - 목록: (user_id, year, month) 키, 다른 워커 프로세스의 저장은 무효화할 수 없으므로 짧은 TTL
+    """
+
+    def __init__(
+        self,
+        detail_ttl_seconds: float = settings.REPORT_DETAIL_CACHE_TTL_SECONDS,
+        list_ttl_seconds: float = settings.REPORT_LIST_CACHE_TTL_SECONDS,
+        max_size: int = settings.REPORT_CACHE_MAX_SIZE,
+        version_check_seconds: float = settings.REPORT_VERSION_CHECK_SECONDS
+    ):
+        self.detail_ttl_seconds = detail_ttl_seconds
+        self.list_ttl_seconds = list_ttl_seconds
+        self.max_size = max_size
+        self.version_check_seconds = version_check_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._user_keys: Dict[str, Set[Tuple]] = {}
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "not_modified": 0, "version_checks_skipped": 0}
+
+    @staticmethod
+    def detail_key(user_id: str, report_id: str) -> Tuple:
+        return ("detail", user_id, report_id)
+
+    @staticmethod
+    def list_key(user_id: str, *params: Hashable) -> Tuple:
+        return ("list", user_id, *params)
+
+    def get(self, key: Tuple, version: Optional[str] = None) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic() or entry[1].version != version:
+            if entry is not None:
+                self._discard(key)
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        entry[1].verified_at = time.monotonic()
+        return entry[1]
+
+    def get_verified(self, key: Tuple) -> Optional[CachedResponse]:
+        """
+        version_check_seconds 안에 저장본 버전을 확인한 응답 (저장본 버전 조회 없이 If-None-Match 비교용)
+        같은 워커의 저장은 invalidate_report로 바로 제거되므로 다른 워커의 재저장만 확인 간격만큼 늦게 반영
+        """
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is None or entry[0] < now or now - entry[1].verified_at >= self.version_check_seconds:
+            return None
+        self._entries.move_to_end(key)
+        self._stats["version_checks_skipped"] += 1
+        return entry[1]
+
+    def put(self, key: Tuple, body: bytes, version: Optional[str] = None) -> CachedResponse:
+        ttl = self.detail_ttl_seconds if key[0] == "detail" else self.list_ttl_seconds
+        cached = CachedResponse(body, version)
+        self._discard(key)
+        self._entries[key] = (time.monotonic() + ttl, cached)
+        self._user_keys.setdefault(key[1], set()).add(key)
+        while len(self._entries) > self.max_size:
+            oldest_key = next(iter(self._entries))
+            self._discard(oldest_key)
+        return cached
+
+    def record_not_modified(self) -> None:
+        self._stats["not_modified"] += 1
+
+    def invalidate_user_lists(self, user_id: str) -> None:
+        """사용자의 목록 캐시 제거 (리포트/대화 생성 시)"""
+        for key in [key for key in self._user_keys.get(user_id, ()) if key[0] == "list"]:
+            self._discard(key)
+
+    def invalidate_report(self, user_id: str, report_id: str) -> None:
+        """리포트 저장 시 해당 상세와 사용자 목록 캐시 제거"""
+        self._discard(self.detail_key(user_id, report_id))
+        self.invalidate_user_lists(user_id)
+
+    def get_stats(self) -> Dict[str, float]:
+        total = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_ratio": round(self._stats["hits"] / total, 4) if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def _discard(self, key: Tuple) -> None:
+        if self._entries.pop(key, None) is None:
+            return
+        user_keys = self._user_keys.get(key[1])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                self._user_keys.pop(key[1])
+
+
+def get_report_response_cache() -> ReportResponseCache:
+    """리포트 응답 캐시 인스턴스 반환"""
+    return get_container().resolve("report_response_cache", ReportResponseCache)
@@ -0,0 +1,428 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import AsyncIterator, List, Optional
+
+from beanie import PydanticObjectId
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.core.constants import Messages, ErrorMessages
+from app.core.container import get_container
+from app.core.metrics import track_stage
+from app.external.ai.client import get_served_provider
+from app.models.models import Conversation, ReportJob
+from app.schemas.common import ReportStatus
+from app.services.report import get_report_service
+from app.services.report_progress import get_report_progress_hub
+from app.utils.common import format_message, get_korea_now, safe_get_error_message
+from app.utils.json_stream import JSONStreamEvent
+
+logger = logging.getLogger(__name__)
+
+
+class ReportJobService:
+    """Mongo 컬렉션 기반 리포트 생성 작업 큐 서비스"""
+
+    def __init__(self):
+        self.report_service = get_report_service()
+        self.progress_hub = get_report_progress_hub()
+        self._workers: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._active_jobs = 0
+
+    async def enqueue(self, conversation: Conversation) -> None:
+        """
+        conversation의 리포트 생성 작업을 등록합니다.
+        같은 conversation에 대한 작업이 이미 있으면 대기 상태로 재설정합니다.
+        실행 중이던 작업은 lease_token을 비워 이전 실행(이전 user_message 기준)의 완료/실패 기록이 반영되지 않게 합니다.
+        (Conversation.report_status는 호출 측에서 PENDING으로 기록)
+
+        Args:
+            conversation: 리포트를 생성할 Conversation
+        """
+        now = get_korea_now()
+        await ReportJob.get_motor_collection().update_one(
+            {"conversation_id": conversation.id},
+            {
+                "$set": {
+                    "user_id": conversation.user_id,
+                    "status": ReportStatus.PENDING.value,
+                    "attempts": 0,
+                    "max_attempts": settings.REPORT_JOB_MAX_ATTEMPTS,
+                    "next_run_at": now,
+                    "locked_at": None,
+                    "lease_token": None,
+                    "progress": None,
+                    "last_error": None,
+                    "updated_at": now,
+                },
+                "$setOnInsert": {"created_at": now},
+            },
+            upsert=True,
+        )
+        self._wakeup.set()
+        logger.info(format_message(Messages.REPORT_JOB_ENQUEUED, conversation_id=conversation.id))
+
+    def start(self, worker_count: int = settings.REPORT_WORKER_COUNT) -> None:
+        """워커 코루틴 시작"""
+        self._stopping = False
+        for _ in range(worker_count):
+            self._workers.append(asyncio.create_task(self._worker_loop()))
+        logger.info(format_message(Messages.REPORT_WORKERS_STARTED, count=worker_count))
+
+    async def stop(self, drain_timeout: float = settings.REPORT_JOB_DRAIN_SECONDS) -> None:
+        """
+        워커 코루틴 종료
+        새 작업은 가져오지 않고 진행 중인 작업은 drain_timeout까지 완료를 기다리며,
+        그 안에 끝나지 않은 작업은 취소 후 즉시 대기 상태로 반환합니다. (다른 프로세스가 lease 만료 전에 이어서 처리)
+        """
+        self._stopping = True
+        self._wakeup.set()
+        if self._workers:
+            if self._active_jobs:
+                logger.info(format_message(
+                    Messages.REPORT_WORKERS_DRAINING,
+                    count=self._active_jobs,
+                    timeout=drain_timeout
+                ))
+            _, pending = await asyncio.wait(self._workers, timeout=drain_timeout)
+            for worker in pending:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info(Messages.REPORT_WORKERS_STOPPED)
+
+    async def _worker_loop(self) -> None:
+        """대기 중인 작업을 하나씩 가져와 처리"""
+        while not self._stopping:
+            try:
+                job = await self._claim_next_job()
+                if job is None:
+                    await self._wait_for_work()
+                    continue
+                self._active_jobs += 1
+                try:
+                    await self._run_job(job)
+                finally:
+                    self._active_jobs -= 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(ErrorMessages.REPORT_WORKER_EXCEPTION)
+                await asyncio.sleep(settings.REPORT_JOB_POLL_INTERVAL)
+
+    async def _wait_for_work(self) -> None:
+        """새 작업 알림 또는 폴링 주기까지 대기"""
+        self._wakeup.clear()
+        if self._stopping:
+            return
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=settings.REPORT_JOB_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _claim_next_job(self) -> Optional[dict]:
+        """실행 가능한 작업 하나를 원자적으로 RUNNING 상태로 가져옴 (lease 만료 작업 포함)"""
+        now = get_korea_now()
+        return await self._claim(
+            {
+                "$or": [
+                    {"status": ReportStatus.PENDING.value, "next_run_at": {"$lte": now}},
+                    {"status": ReportStatus.RUNNING.value, "locked_at": {"$lte": self._lease_expired_at(now)}},
+                ]
+            },
+            now
+        )
+
+    async def claim_job(self, conversation_id: PydanticObjectId) -> Optional[dict]:
+        """
+        특정 conversation의 작업을 즉시 RUNNING 상태로 가져옵니다.
+        사용자가 결과를 기다리는 중이므로 재시도 대기(next_run_at)는 무시합니다.
+
+        Returns:
+            Optional[dict]: 가져온 작업 (다른 워커가 처리 중이면 None)
+        """
+        now = get_korea_now()
+        return await self._claim(
+            {
+                "conversation_id": conversation_id,
+                "$or": [
+                    {"status": ReportStatus.PENDING.value},
+                    {"status": ReportStatus.RUNNING.value, "locked_at": {"$lte": self._lease_expired_at(now)}},
+                ]
+            },
+            now
+        )
+
+    def _lease_expired_at(self, now):
+        return now - timedelta(seconds=settings.REPORT_JOB_LEASE_SECONDS)
+
+    async def _claim(self, query: dict, now) -> Optional[dict]:
+        """작업을 가져오면서 새 lease_token 발급 (이전 소유자의 기록은 토큰 불일치로 무시됨)"""
+        return await ReportJob.get_motor_collection().find_one_and_update(
+            query,
+            {
+                "$set": {
+                    "status": ReportStatus.RUNNING.value,
+                    "locked_at": now,
+                    "lease_token": PydanticObjectId(),
+                    "progress": None,
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("next_run_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _start_job(self, job: dict) -> Optional[Conversation]:
+        """작업 대상 Conversation을 RUNNING으로 표시 (대상이 없으면 작업을 실패 처리하고 None)"""
+        conversation_id = job["conversation_id"]
+        conversation = await Conversation.get(conversation_id)
+        if conversation is None:
+            await self._finish_job(
+                job,
+                ReportStatus.FAILED,
+                format_message(ErrorMessages.REPORT_JOB_CONVERSATION_MISSING, conversation_id=conversation_id)
+            )
+            return None
+
+        await conversation.set_fields({"report_status": ReportStatus.RUNNING})
+        return conversation
+
+    async def _run_job(self, job: dict) -> None:
+        """단일 리포트 작업 실행"""
+        conversation = await self._start_job(job)
+        if conversation is None:
+            return
+
+        try:
+            # 스트림 클라이언트가 진행 상황을 받을 수 있도록 워커도 스트리밍으로 생성
+            with track_stage("report_generation"):
+                async for _ in self._generate(job, conversation):
+                    pass
+
+        except asyncio.CancelledError:
+            # 종료 대기 시간 안에 끝나지 않아 취소된 작업
+            await asyncio.shield(self._release_job(job, conversation))
+            raise
+
+        except Exception as e:
+            await self._handle_failure(job, conversation, safe_get_error_message(e))
+
+    async def stream_job(self, job: dict) -> AsyncIterator[JSONStreamEvent]:
+        """
+        claim_job으로 가져온 작업을 스트리밍으로 실행합니다.
+        완성된 리포트는 워커와 같은 방식으로 저장되며, 실패 시 재시도가 예약된 뒤 예외가 전달됩니다.
+        (소유권을 잃어 저장하지 못하면 최상위 문서 이벤트 없이 끝남)
+        (클라이언트 연결이 끊기면 작업을 즉시 대기 상태로 되돌려 워커가 이어서 처리)
+
+        Yields:
+            JSONStreamEvent: 리포트 생성 이벤트
+        """
+        conversation = await self._start_job(job)
+        if conversation is None:
+            raise ValueError(format_message(
+                ErrorMessages.REPORT_JOB_CONVERSATION_MISSING,
+                conversation_id=job["conversation_id"]
+            ))
+
+        logger.info(format_message(Messages.REPORT_JOB_STREAMING, conversation_id=job["conversation_id"]))
+        completed = False
+        try:
+            async for event in self._generate(job, conversation):
+                completed = event.path == ""
+                yield event
+
+        except (asyncio.CancelledError, GeneratorExit):
+            if not completed:
+                await asyncio.shield(self._release_job(job, conversation))
+            raise
+
+        except Exception as e:
+            await self._handle_failure(job, conversation, safe_get_error_message(e))
+            raise
+
+    async def _generate(self, job: dict, conversation: Conversation) -> AsyncIterator[JSONStreamEvent]:
+        """
+        리포트를 스트리밍으로 생성하고 완성되면 저장합니다.
+        소유권을 잃어 저장하지 못하면 최상위 문서 이벤트 없이 종료합니다.
+        진행 상황은 이 프로세스의 스트림 구독자에게 바로 전달하고,
+        다른 워커 프로세스의 구독자를 위해 REPORT_STREAM_PROGRESS_INTERVAL마다 ReportJob.progress에 기록합니다.
+        """
+        progress = self.progress_hub.start(
+            str(job["conversation_id"]),
+            job["lease_token"],
+            self.report_service.STREAM_FIELDS
+        )
+        try:
+            async with self._hold_lease(job):
+                async for event in self.report_service.stream_emotion_report(conversation.user_message):
+                    progress.apply(event)
+                    if event.path == "":
+                        saved = await self._complete_job(
+                            job,
+                            conversation,
+                            {"report_data": event.value, "provider": get_served_provider()}
+                        )
+                        if not saved:
+                            # 재등록 등으로 소유권을 잃어 저장하지 않은 결과는 완료 이벤트로 내보내지 않음
+                            return
+                    elif progress.persist_due():
+                        await self._persist_progress(job, progress.snapshot())
+                    yield event
+        finally:
+            self.progress_hub.finish(progress)
+
+    async def _persist_progress(self, job: dict, snapshot: dict) -> None:
+        """진행 상황 기록 (실패해도 생성은 계속, 소유권을 잃었으면 완료 시점에 처리)"""
+        try:
+            await ReportJob.get_motor_collection().update_one(self._owned(job), {"$set": {"progress": snapshot}})
+        except Exception as e:
+            logger.warning(format_message(ErrorMessages.REPORT_JOB_PROGRESS_SAVE_FAILED, error=e))
+
+    async def load_progress(self, conversation_id: PydanticObjectId) -> Optional[dict]:
+        """
+        다른 워커 프로세스가 기록한 진행 상황 조회
+
+        Returns:
+            Optional[dict]: status, progress (작업이 없으면 None)
+        """
+        return await ReportJob.get_motor_collection().find_one(
+            {"conversation_id": conversation_id},
+            {"_id": 0, "status": 1, "progress": 1}
+        )
+
+    def _owned(self, job: dict) -> dict:
+        """이 실행이 아직 작업을 소유하고 있을 때만 일치하는 조건"""
+        return {"_id": job["_id"], "lease_token": job["lease_token"]}
+
+    async def _update_owned(self, job: dict, update: dict) -> bool:
+        """소유 중인 작업만 갱신 (소유권을 잃었으면 False)"""
+        result = await ReportJob.get_motor_collection().update_one(self._owned(job), update)
+        if not result.matched_count:
+            logger.warning(format_message(Messages.REPORT_JOB_LEASE_LOST, conversation_id=job["conversation_id"]))
+            return False
+        return True
+
+    async def _renew_lease(self, job: dict) -> bool:
+        now = get_korea_now()
+        return await self._update_owned(job, {"$set": {"locked_at": now, "updated_at": now}})
+
+    @asynccontextmanager
+    async def _hold_lease(self, job: dict):
+        """생성이 lease보다 오래 걸려도 다른 워커가 가져가지 않도록 주기적으로 locked_at 갱신"""
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            yield
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def _heartbeat(self, job: dict) -> None:
+        interval = settings.REPORT_JOB_LEASE_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await self._renew_lease(job):
+                    return
+            except Exception as e:
+                logger.warning(format_message(ErrorMessages.REPORT_JOB_HEARTBEAT_FAILED, error=e))
+
+    async def _complete_job(self, job: dict, conversation: Conversation, report_response: dict) -> bool:
+        """
+        리포트를 저장하고 작업을 완료 처리 (소유권을 잃은 실행은 저장하지 않음)
+
+        Returns:
+            bool: 리포트를 저장했는지 여부
+        """
+        if not await self._renew_lease(job):
+            return False
+        with track_stage("report_save"):
+            await self.report_service.save_report(conversation, report_response)
+        if await self._finish_job(job, ReportStatus.DONE):
+            logger.info(format_message(
+                Messages.REPORT_JOB_DONE,
+                conversation_id=job["conversation_id"],
+                attempts=job["attempts"]
+            ))
+        return True
+
+    async def _release_job(self, job: dict, conversation: Conversation) -> None:
+        """중단된 작업을 시도 횟수 차감 없이 즉시 실행 가능한 대기 상태로 반환"""
+        now = get_korea_now()
+        released = await self._update_owned(
+            job,
+            {
+                "$set": {
+                    "status": ReportStatus.PENDING.value,
+                    "next_run_at": now,
+                    "locked_at": None,
+                    "lease_token": None,
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": -1},
+            }
+        )
+        if not released:
+            return
+        await conversation.set_fields({"report_status": ReportStatus.PENDING})
+        self._wakeup.set()
+        logger.info(format_message(Messages.REPORT_JOB_RELEASED, conversation_id=job["conversation_id"]))
+
+    async def _handle_failure(self, job: dict, conversation: Conversation, error: str) -> None:
+        """실패한 작업을 지수 백오프로 재예약하거나 최종 실패 처리"""
+        if job["attempts"] < job["max_attempts"]:
+            delay = settings.REPORT_JOB_RETRY_BASE_SECONDS * (2 ** (job["attempts"] - 1))
+            now = get_korea_now()
+            rescheduled = await self._update_owned(
+                job,
+                {"$set": {
+                    "status": ReportStatus.PENDING.value,
+                    "next_run_at": now + timedelta(seconds=delay),
+                    "locked_at": None,
+                    "lease_token": None,
+                    "last_error": error,
+                    "updated_at": now,
+                }}
+            )
+            if not rescheduled:
+                return
+            await conversation.set_fields({"report_status": ReportStatus.PENDING})
+            logger.warning(format_message(
+                Messages.REPORT_JOB_RETRY,
+                conversation_id=job["conversation_id"],
+                attempts=job["attempts"],
+                delay=delay
+            ))
+            return
+
+        if not await self._finish_job(job, ReportStatus.FAILED, error):
+            return
+        await conversation.set_fields({"report_status": ReportStatus.FAILED, "report_error": error})
+        logger.error(format_message(
+            ErrorMessages.REPORT_JOB_FAILED,
+            conversation_id=job["conversation_id"],
+            error=error
+        ))
+
+    async def _finish_job(self, job: dict, status: ReportStatus, error: Optional[str] = None) -> bool:
+        """작업을 종료 상태로 기록 (소유권을 잃었으면 False)"""
+        return await self._update_owned(
+            job,
+            {"$set": {
+                "status": status.value,
+                "locked_at": None,
+                "lease_token": None,
+                "last_error": error,
+                "updated_at": get_korea_now(),
+            }}
+        )
+
+
+def get_report_job_service() -> ReportJobService:
+    """리포트 작업 큐 서비스 인스턴스 반환"""
+    return get_container().resolve("report_job_service", ReportJobService)
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.core.config import settings
+from app.core.container import get_container
+from app.utils.json_stream import JSONStreamEvent
+
+
+class ReportProgress:
+    """
+    생성 중인 리포트의 진행 상황 (완성된 필드 값 + 스트리밍 필드의 누적 텍스트)
+
+    token은 작업의 lease_token으로, 재시도 / 다른 워커의 재실행을 구분합니다.
+    snapshot()은 ReportJob.progress에도 그대로 저장되어 다른 워커 프로세스의 스트림이 이어받습니다.
+    """
+
+    def __init__(self, conversation_id: str, token: Any, stream_fields: Sequence[str]):
+        self.conversation_id = conversation_id
+        self.token = token
+        self.stream_fields = tuple(stream_fields)
+        self.fields: Dict[str, Any] = {}
+        self.text: Dict[str, str] = {}
+        self.version = 0
+        self.finished = False
+        self._changed = asyncio.Event()
+        self._persisted_at = time.monotonic()
+
+    def apply(self, event: JSONStreamEvent) -> None:
+        """파서 이벤트 반영 (최상위 문서와 중간 객체는 개별 필드로 이미 반영됨)"""
+        if event.kind == JSONStreamEvent.DELTA:
+            self.text[event.path] = self.text.get(event.path, "") + event.value
+        elif event.path and event.path not in self.stream_fields and not isinstance(event.value, (dict, list)):
+            self.fields[event.path] = event.value
+        else:
+            return
+        self._notify()
+
+    def finish(self) -> None:
+        self.finished = True
+        self._notify()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"token": str(self.token), "fields": dict(self.fields), "text": dict(self.text)}
+
+    def persist_due(self) -> bool:
+        """REPORT_STREAM_PROGRESS_INTERVAL마다 한 번씩 Mongo에 기록"""
+        now = time.monotonic()
+        if now - self._persisted_at < settings.REPORT_STREAM_PROGRESS_INTERVAL:
+            return False
+        self._persisted_at = now
+        return True
+
+    async def wait_changed(self, version: int, timeout: float) -> bool:
+        """version 이후 변경이 있을 때까지 대기 (timeout 안에 변경이 없으면 False)"""
+        if self.version != version:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def _notify(self) -> None:
+        self.version += 1
+        # 대기 중인 구독자는 이전 Event를 들고 있으므로 깨운 뒤 새 Event로 교체
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+class ReportProgressHub:
+    """이 프로세스에서 생성 중인 리포트의 진행 상황 (conversation_id별 최신 실행)"""
+
+    def __init__(self):
+        self._progress: Dict[str, ReportProgress] = {}
+
+    def start(self, conversation_id: str, token: Any, stream_fields: Sequence[str]) -> ReportProgress:
+        progress = ReportProgress(conversation_id, token, stream_fields)
+        previous = self._progress.get(conversation_id)
+        self._progress[conversation_id] = progress
+        if previous is not None:
+            previous.finish()
+        return progress
+
+    def finish(self, progress: ReportProgress) -> None:
+        progress.finish()
+        if self._progress.get(progress.conversation_id) is progress:
+            del self._progress[progress.conversation_id]
+
+    def get(self, conversation_id: str) -> Optional[ReportProgress]:
+        return self._progress.get(conversation_id)
+
+
+class ProgressCursor:
+    """스트림 클라이언트에 이미 보낸 진행 상황 (새로 완성된 필드와 추가된 텍스트만 골라냄)"""
+
+    def __init__(self):
+        self.token: Optional[str] = None
+        self._fields: Dict[str, Any] = {}
+        self._text_lengths: Dict[str, int] = {}
+
+    def advance(self, snapshot: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        snapshot에서 아직 보내지 않은 변경분을 반환합니다.
+
+        Returns:
+            List[Dict[str, Any]]: {"event": restart / field / delta, "data": {...}} 목록
+                (재시도 등으로 실행이 바뀌면 restart 후 처음부터 다시 전달)
+        """
+        if not snapshot:
+            return []
+        changes: List[Dict[str, Any]] = []
+        if snapshot["token"] != self.token:
+            if self.token is not None:
+                changes.append({"event": "restart", "data": {}})
+            self.token = snapshot["token"]
+            self._fields = {}
+            self._text_lengths = {}
+
+        for path, value in snapshot["fields"].items():
+            if path not in self._fields or self._fields[path] != value:
+                self._fields[path] = value
+                changes.append({"event": "field", "data": {"field": path, "value": value}})
+        for field, text in snapshot["text"].items():
+            sent = self._text_lengths.get(field, 0)
+            if len(text) > sent:
+                self._text_lengths[field] = len(text)
+                changes.append({"event": "delta", "data": {"field": field, "text": text[sent:]}})
+        return changes
+
+
+def get_report_progress_hub() -> ReportProgressHub:
+    """리포트 진행 상황 허브 인스턴스 반환"""
+    return get_container().resolve("report_progress_hub", ReportProgressHub)
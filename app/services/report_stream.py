@@ -0,0 +1,165 @@
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict
+
+from beanie import PydanticObjectId
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.constants import ErrorMessages
+from app.core.container import get_container
+from app.schemas.common import ReportStatus
+from app.schemas.responses import ReportDetailResponse
+from app.services.report import get_report_service
+from app.services.report_job import get_report_job_service
+from app.services.report_progress import ProgressCursor, get_report_progress_hub
+from app.utils.common import format_message
+from app.utils.json_stream import JSONStreamEvent
+
+logger = logging.getLogger(__name__)
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events 메시지 형식으로 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class ReportStreamService:
+    """
+    리포트 생성 과정을 SSE로 전달하는 서비스
+
+    이벤트 순서:
+    - status: 생성 시작 (report_status), 재시도로 생성을 처음부터 다시 하면 restarted=true와 함께 다시 전송
+    - field: 완성된 필드 값 (daily_summary, emotion_score, emotion_analysis.* ...)
+    - delta: actions / letter의 새로 생성된 텍스트
+    - done: 저장된 리포트 전체 (ReportDetailResponse)
+    - error: 생성 실패 또는 대기 시간 초과
+
+    작업을 직접 가져오면 생성 이벤트를 그대로 전달하고, 워커가 이미 생성 중이면 그 진행 상황을 전달합니다.
+    (같은 프로세스의 워커는 진행 상황 허브로 바로, 다른 워커 프로세스는 ReportJob.progress 폴링으로)
+    """
+
+    def __init__(self):
+        self.report_service = get_report_service()
+        self.report_job_service = get_report_job_service()
+        self.progress_hub = get_report_progress_hub()
+
+    async def open_stream(self, user_id: str, report_id: str) -> AsyncIterator[str]:
+        """
+        리포트 스트림을 엽니다.
+        존재하지 않거나 이미 실패한 리포트는 스트림 시작 전에 HTTPException으로 응답합니다.
+
+        Returns:
+            AsyncIterator[str]: SSE 메시지 스트림
+        """
+        result = await self.report_service.get_report_detail(user_id=user_id, report_id=report_id)
+        if isinstance(result, ReportDetailResponse):
+            return self._completed_stream(result)
+        return self._generation_stream(user_id, report_id)
+
+    async def _completed_stream(self, detail: ReportDetailResponse) -> AsyncIterator[str]:
+        yield format_sse("done", detail.model_dump(mode="json"))
+
+    async def _generation_stream(self, user_id: str, report_id: str) -> AsyncIterator[str]:
+        """작업을 직접 가져와 스트리밍 생성하고, 워커가 처리 중이면 그 진행 상황을 완료까지 전달"""
+        job = await self.report_job_service.claim_job(PydanticObjectId(report_id))
+        if job is None:
+            async for message in self._follow_report(user_id, report_id):
+                yield message
+            return
+
+        yield self._status_message(report_id)
+        try:
+            async for event in self.report_job_service.stream_job(job):
+                message = self._format_event(event)
+                if message:
+                    yield message
+        except Exception as e:
+            logger.error(format_message(ErrorMessages.REPORT_STREAM_FAILED, report_id=report_id, error=e))
+            yield format_sse("error", {"detail": ErrorMessages.REPORT_SERVICE_FALLBACK_ERROR})
+            return
+
+        try:
+            detail = await self.report_service.get_report_detail(user_id=user_id, report_id=report_id)
+        except HTTPException as e:
+            yield format_sse("error", {"detail": e.detail})
+            return
+        if isinstance(detail, ReportDetailResponse):
+            yield format_sse("done", detail.model_dump(mode="json"))
+            return
+
+        # 생성 중 재등록(답변 재제출)으로 소유권을 잃어 저장되지 않음: 새로 등록된 작업을 이어서 전달
+        async for message in self._follow_report(user_id, report_id, restarted=True):
+            yield message
+
+    def _format_event(self, event: JSONStreamEvent) -> str:
+        if event.kind == JSONStreamEvent.DELTA:
+            return format_sse("delta", {"field": event.path, "text": event.value})
+        # 최상위 문서와 중간 객체는 done / 개별 필드 이벤트로 이미 전달됨
+        if event.path == "" or isinstance(event.value, (dict, list)):
+            return ""
+        if event.path in self.report_service.STREAM_FIELDS:
+            return ""
+        return format_sse("field", {"field": event.path, "value": event.value})
+
+    async def _follow_report(self, user_id: str, report_id: str, restarted: bool = False) -> AsyncIterator[str]:
+        """
+        워커가 생성 중인 리포트의 진행 상황을 전달하고, 저장되면 done으로 종료
+        (이 프로세스에서 생성 중이면 변경될 때마다, 아니면 REPORT_STREAM_POLL_INTERVAL마다 확인)
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.REPORT_STREAM_WAIT_SECONDS
+        conversation_id = PydanticObjectId(report_id)
+        cursor = ProgressCursor()
+        yield self._status_message(report_id, restarted=restarted)
+
+        while loop.time() < deadline:
+            progress = self.progress_hub.get(report_id)
+            if progress is not None:
+                version = progress.version
+                snapshot = progress.snapshot()
+                settled = False
+            else:
+                job = await self.report_job_service.load_progress(conversation_id)
+                snapshot = job.get("progress") if job else None
+                settled = job is None or job["status"] in (ReportStatus.DONE.value, ReportStatus.FAILED.value)
+
+            for change in cursor.advance(snapshot):
+                yield self._format_change(report_id, change)
+
+            if settled:
+                try:
+                    result = await self.report_service.get_report_detail(user_id=user_id, report_id=report_id)
+                except HTTPException as e:
+                    yield format_sse("error", {"detail": e.detail})
+                    return
+                if isinstance(result, ReportDetailResponse):
+                    yield format_sse("done", result.model_dump(mode="json"))
+                    return
+
+            if progress is not None:
+                changed = await progress.wait_changed(version, timeout=settings.REPORT_STREAM_POLL_INTERVAL)
+            else:
+                await asyncio.sleep(settings.REPORT_STREAM_POLL_INTERVAL)
+                changed = False
+            if not changed:
+                yield ": keep-alive\n\n"
+
+        yield format_sse("error", {"detail": ErrorMessages.REPORT_STREAM_TIMEOUT})
+
+    def _status_message(self, report_id: str, restarted: bool = False) -> str:
+        data = {"report_id": report_id, "report_status": ReportStatus.RUNNING.value}
+        if restarted:
+            data["restarted"] = True
+        return format_sse("status", data)
+
+    def _format_change(self, report_id: str, change: Dict[str, Any]) -> str:
+        if change["event"] == "restart":
+            return self._status_message(report_id, restarted=True)
+        return format_sse(change["event"], change["data"])
+
+
+def get_report_stream_service() -> ReportStreamService:
+    """리포트 스트리밍 서비스 인스턴스 반환"""
+    return get_container().resolve("report_stream_service", ReportStreamService)
@@ -1,11 +1,16 @@
 
-from openai import OpenAI
-import tempfile
+import asyncio
 import os
 import hashlib
 import logging
-from google.cloud import storage
 from app.core.config import settings
+from app.core.container import get_container
+from app.core.metrics import track_ai_request
+from app.external.ai.openai import get_async_openai_client
+from app.external.rate_limiter import get_audio_rate_limiter
+from app.services.audio_cache import CachedAudio, get_audio_cache_service
+from app.services.gcp_storage import get_storage_client
+from app.services.transcription_cache import get_transcription_cache_service
 from app.core.constants import STT_MODEL, STT_LANGUAGE, STT_TEMPERATURE, ErrorMessages
 from app.utils.common import parse_gcs_uri, format_message
 
@@ -16,29 +21,41 @@ class SpeechToTextService:
     """OpenAI STT를 사용한 음성-텍스트 변환 서비스"""
 
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.storage_client = storage.Client()
+        self.storage_client = get_storage_client()
         self.bucket_name = settings.GCP_BUCKET_NAME
+        self.audio_cache = get_audio_cache_service()
+        self.transcription_cache = get_transcription_cache_service()
 
-    def transcribe_audio(self, gcs_uri: str) -> str:
-        """GCS에 저장된 오디오 파일을 텍스트로 변환"""
+    async def transcribe_audio(self, gcs_uri: str, refresh_cache: bool = False) -> str:
+        """
+        GCS에 저장된 오디오 파일을 텍스트로 변환 (로컬 캐시 우선)
+
+        Args:
+            gcs_uri: 오디오 파일 GCS URI
+            refresh_cache: 전사 캐시를 건너뛰고 새 결과로 교체 (재전사 배치용)
+        """
         try:
             logger.info(f"🎤 음성 변환 시작: {gcs_uri}")
 
-            bucket_name, blob_name = parse_gcs_uri(gcs_uri)
-            
-            bucket = self.storage_client.bucket(bucket_name)
-            blob = bucket.blob(blob_name)
-
-            temp_file_path = self._create_temp_file(blob_name)
-            blob.download_to_filename(temp_file_path)
-            
-            self._log_file_info(temp_file_path, gcs_uri)
-
-            try:
-                transcribed_text = self._transcribe_with_openai(temp_file_path)
-            finally:
-                self._cleanup_temp_file(temp_file_path)
+            transcribed_text = None
+            cached_audio = self.audio_cache.acquire(gcs_uri)
+            if cached_audio is not None:
+                logger.debug(f"📦 오디오 캐시 적중: {gcs_uri}")
+                try:
+                    transcribed_text = await self._transcribe_file(cached_audio, gcs_uri, refresh_cache)
+                except FileNotFoundError:
+                    # 캐시 디렉터리가 외부에서 정리된 경우 GCS에서 다시 받음
+                    logger.warning(f"⚠️ 오디오 캐시 파일이 없어 GCS에서 다시 다운로드: {gcs_uri}")
+                finally:
+                    self.audio_cache.release(cached_audio)
+
+            if transcribed_text is None:
+                cached_audio = await self._download_audio(gcs_uri)
+                try:
+                    transcribed_text = await self._transcribe_file(cached_audio, gcs_uri, refresh_cache)
+                finally:
+                    # 캐시 비활성/용량 초과 시 put에서 파일이 정리됨
+                    self.audio_cache.put(gcs_uri, cached_audio)
 
             logger.info(f"✅ 음성 변환 완료: {transcribed_text}")
             return transcribed_text
@@ -48,52 +65,76 @@ class SpeechToTextService:
             logger.error(f"❌ 음성 변환 실패: {error_message}")
             raise Exception(error_message)
 
-    def _create_temp_file(self, blob_name: str) -> str:
-        """임시 파일 생성"""
-        _, ext = os.path.splitext(blob_name)
-        if not ext:
-            ext = ".bin"
-        
-        fd, temp_file_path = tempfile.mkstemp(suffix=ext, dir="/tmp")
-        os.close(fd)
-        return temp_file_path
+    async def _transcribe_file(self, cached_audio: CachedAudio, gcs_uri: str, refresh_cache: bool) -> str:
+        """로컬 오디오 파일을 전사 (같은 내용의 전사 결과가 캐시에 있으면 재사용)"""
+        if cached_audio.content_hash is None:
+            cached_audio.content_hash = await asyncio.to_thread(self._hash_file, cached_audio.path)
+        self._log_file_info(cached_audio, gcs_uri)
+
+        if not refresh_cache:
+            transcribed_text = await self.transcription_cache.get(cached_audio.content_hash)
+            if transcribed_text is not None:
+                logger.info(f"♻️ 전사 캐시 적중: {gcs_uri}")
+                return transcribed_text
+
+        transcribed_text = await self._transcribe_with_openai(cached_audio.path)
+        await self.transcription_cache.set(cached_audio.content_hash, transcribed_text, overwrite=refresh_cache)
+        return transcribed_text
+
+    async def prefetch_audio(self, gcs_uri: str) -> None:
+        """오디오를 미리 받아 로컬 캐시에 등록 (다운로드와 변환을 나눠 처리하는 배치용)"""
+        if self.audio_cache.get(gcs_uri) is None:
+            self.audio_cache.put(gcs_uri, await self._download_audio(gcs_uri))
+
+    async def _download_audio(self, gcs_uri: str) -> CachedAudio:
+        """캐시 미스 시 GCS에서 캐시 디렉터리로 오디오 다운로드"""
+        bucket_name, blob_name = parse_gcs_uri(gcs_uri)
+        blob = self.storage_client.bucket(bucket_name).blob(blob_name)
+
+        temp_file_path = self.audio_cache.new_path(gcs_uri)
+        try:
+            await asyncio.to_thread(blob.download_to_filename, temp_file_path)
+        except Exception:
+            self.audio_cache.remove_file(temp_file_path)
+            raise
+
+        return CachedAudio(temp_file_path, os.path.getsize(temp_file_path))
 
-    def _log_file_info(self, temp_file_path: str, gcs_uri: str):
+    def _hash_file(self, file_path: str) -> str:
+        """오디오 파일 내용 해시 (전사 캐시 키)"""
+        with open(file_path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    def _log_file_info(self, cached_audio: CachedAudio, gcs_uri: str):
         """파일 정보 로깅"""
-        file_size = os.path.getsize(temp_file_path)
-        
-        with open(temp_file_path, "rb") as f:
-            file_hash = hashlib.md5(f.read()).hexdigest()
-        
-        logger.debug(f"📁 다운로드된 파일 정보:")
-        logger.debug(f"   - 크기: {file_size} bytes")
-        logger.debug(f"   - 해시: {file_hash}")
+        logger.debug(f"📁 오디오 파일 정보:")
+        logger.debug(f"   - 크기: {cached_audio.size} bytes")
+        logger.debug(f"   - 해시: {cached_audio.content_hash}")
         logger.debug(f"   - GCS URI: {gcs_uri}")
 
-    def _transcribe_with_openai(self, temp_file_path: str) -> str:
-        """OpenAI로 음성 변환"""
-        with open(temp_file_path, "rb") as audio_file:
-            resp = self.client.audio.transcriptions.create(
-                model=STT_MODEL,
-                file=audio_file,
-                language=STT_LANGUAGE,
-                temperature=STT_TEMPERATURE
-            )
+    async def _transcribe_with_openai(self, temp_file_path: str) -> str:
+        """OpenAI로 음성 변환 (공유 커넥션 풀 사용, 분당 요청 한도 내에서 대기 후 호출)"""
+        async def request():
+            # 429 재시도 시 파일을 처음부터 다시 전송
+            with open(temp_file_path, "rb") as audio_file, track_ai_request("openai", "transcription"):
+                return await get_async_openai_client().audio.transcriptions.create(
+                    model=STT_MODEL,
+                    file=audio_file,
+                    language=STT_LANGUAGE,
+                    temperature=STT_TEMPERATURE
+                )
+
+        resp = await get_audio_rate_limiter().run(request)
         return resp.text
 
-    def _cleanup_temp_file(self, temp_file_path: str):
-        """임시 파일 정리"""
-        try:
-            os.remove(temp_file_path)
-        except FileNotFoundError:
-            pass
-
     def _handle_transcription_error(self, error_msg: str) -> str:
         """STT 에러 처리 및 사용자 친화적 메시지 반환"""
         lower_msg = error_msg.lower()
         
         if "not found" in lower_msg or "404" in lower_msg:
             return ErrorMessages.AUDIO_FILE_NOT_FOUND
+        if "rate limit" in lower_msg or "429" in lower_msg:
+            return ErrorMessages.AI_RATE_LIMITED
         if "timeout" in lower_msg:
             return ErrorMessages.STT_TIMEOUT
         if "api key" in lower_msg or "unauthorized" in lower_msg or "invalid api key" in lower_msg:
@@ -104,7 +145,5 @@ class SpeechToTextService:
         return format_message(ErrorMessages.STT_CONVERSION_FAILED, error=error_msg)
 
 
-speech_to_text_service = SpeechToTextService()
-
 def get_speech_to_text_service() -> SpeechToTextService:
-    return speech_to_text_service
\ No newline at end of file
+    return get_container().resolve("speech_to_text_service", SpeechToTextService)
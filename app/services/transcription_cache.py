@@ -0,0 +1,107 @@
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.core.constants import STT_MODEL, STT_LANGUAGE, STT_TEMPERATURE
+from app.core.container import get_container
+from app.models.models import TranscriptionCache
+from app.utils.common import get_korea_now
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionCacheService:
+    """오디오 내용 해시 기반 STT 결과 캐시 (프로세스 LRU + Mongo TTL 컬렉션)"""
+
+    def __init__(self, memory_size: int = settings.TRANSCRIPTION_CACHE_MEMORY_SIZE):
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._stats: Dict[str, int] = {"memory_hits": 0, "db_hits": 0, "misses": 0}
+
+    def build_key(self, content_hash: str) -> str:
+        """내용 해시와 STT 설정(모델/언어/temperature)을 조합한 캐시 키"""
+        return f"{content_hash}:{STT_MODEL}:{STT_LANGUAGE}:{STT_TEMPERATURE}"
+
+    async def get(self, content_hash: str) -> Optional[str]:
+        """
+        캐시된 전사 결과를 조회합니다.
+
+        Args:
+            content_hash: 오디오 파일의 sha256 해시
+
+        Returns:
+            Optional[str]: 캐시된 텍스트 (없으면 None)
+        """
+        cache_key = self.build_key(content_hash)
+
+        text = self._memory.get(cache_key)
+        if text is not None:
+            self._memory.move_to_end(cache_key)
+            self._stats["memory_hits"] += 1
+            return text
+
+        try:
+            cached = await TranscriptionCache.find_one(TranscriptionCache.cache_key == cache_key)
+        except Exception as e:
+            logger.warning(f"⚠️ 전사 캐시 조회 실패: {e}")
+            cached = None
+
+        if cached is None:
+            self._stats["misses"] += 1
+            return None
+
+        self._stats["db_hits"] += 1
+        self._remember(cache_key, cached.text)
+        return cached.text
+
+    async def set(self, content_hash: str, text: str, overwrite: bool = False) -> None:
+        """
+        전사 결과를 캐시에 저장 (실패해도 STT 흐름은 계속)
+
+        Args:
+            content_hash: 오디오 파일의 sha256 해시
+            text: 전사 결과
+            overwrite: 기존 결과를 교체할지 여부 (재전사 배치에서 잘못된 결과를 갱신할 때)
+        """
+        cache_key = self.build_key(content_hash)
+        self._remember(cache_key, text)
+        entry = {
+            "cache_key": cache_key,
+            "content_hash": content_hash,
+            "model": STT_MODEL,
+            "language": STT_LANGUAGE,
+            "temperature": STT_TEMPERATURE,
+            "text": text,
+            "created_at": get_korea_now(),
+        }
+        try:
+            await TranscriptionCache.get_motor_collection().update_one(
+                {"cache_key": cache_key},
+                {"$set": entry} if overwrite else {"$setOnInsert": entry},
+                upsert=True,
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ 전사 캐시 저장 실패: {e}")
+
+    def get_stats(self) -> Dict[str, float]:
+        """적중/미스 카운터와 적중률 반환"""
+        hits = self._stats["memory_hits"] + self._stats["db_hits"]
+        total = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "hits": hits,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def _remember(self, cache_key: str, text: str) -> None:
+        self._memory[cache_key] = text
+        self._memory.move_to_end(cache_key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+
+def get_transcription_cache_service() -> TranscriptionCacheService:
+    """전사 캐시 서비스 인스턴스 반환"""
+    return get_container().resolve("transcription_cache_service", TranscriptionCacheService)
@@ -2,13 +2,18 @@ import uuid
 from typing import Dict
 from fastapi import HTTPException
 from app.core.constants import Defaults, ErrorMessages, Messages
-from app.models.models import User, Conversation
+from app.core.container import get_container
+from app.models.models import User
 from app.schemas.requests import CompleteOnboardingRequest
+from app.services.user_cache import get_user_profile_cache
 from app.utils.common import format_message, get_korea_now
 
 class UserService:
     """사용자 관련 서비스"""
 
+    def __init__(self):
+        self.user_cache = get_user_profile_cache()
+
     def _safe_enum_value(self, enum_value, field_name: str) -> str:
         """
         Enum 값을 안전하게 추출하는 헬퍼 함수
@@ -67,6 +72,7 @@ class UserService:
             )
             
             await user.insert()
+            self.user_cache.put(user)
             
             return {
                 "user_id": user_id,
@@ -101,7 +107,7 @@ class UserService:
             Dict: 사용자 온보딩 정보
         """
         try:
-            user = await User.find_one(User.user_id == user_id)
+            user = await self.user_cache.get_user(user_id)
 
             if not user:
                                 raise HTTPException(status_code=404, detail=ErrorMessages.USER_NOT_FOUND)
@@ -132,8 +138,6 @@ class UserService:
                 detail=format_message(ErrorMessages.ONBOARDING_STATUS_ERROR, error=str(e))
             )
 
-user_service = UserService()
-
 def get_user_service() -> UserService:
     """사용자 서비스 인스턴스 반환"""
-    return user_service
+    return get_container().resolve("user_service", UserService)
@@ -0,0 +1,96 @@
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.container import get_container
+from app.models.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class UserProfileCache:
+    """사용자 프로필 프로세스 내 캐시 (TTL + 최대 크기 LRU, 쓰기 시 무효화)"""
+
+    def __init__(
+        self,
+        ttl_seconds: float = settings.USER_CACHE_TTL_SECONDS,
+        max_size: int = settings.USER_CACHE_MAX_SIZE
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        # user_id -> {조회 형태 이름: (만료 시각, 값)}
+        self._entries: "OrderedDict[str, Dict[str, Tuple[float, BaseModel]]]" = OrderedDict()
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    async def get_user(self, user_id: str, projection: Optional[Type[BaseModel]] = None):
+        """
+        사용자를 캐시에서 조회하고, 없거나 만료됐으면 DB에서 읽어 캐시에 저장합니다.
+
+        Args:
+            user_id: 사용자 ID
+            projection: 필요한 필드만 조회할 projection 모델 (None이면 전체 User)
+
+        Returns:
+            User 또는 projection 인스턴스 (사용자가 없으면 None)
+        """
+        kind = projection.__name__ if projection else User.__name__
+        cached = self._lookup(user_id, kind)
+        if cached is not None:
+            self._stats["hits"] += 1
+            return cached
+
+        self._stats["misses"] += 1
+        query = User.find_one(User.user_id == user_id)
+        if projection is not None:
+            query = query.project(projection)
+        user = await query
+
+        if user is not None:
+            self._store(user_id, kind, user)
+        return user
+
+    def put(self, user: User) -> None:
+        """새로 저장된 사용자 문서를 캐시에 기록 (write-through)"""
+        self.invalidate(user.user_id)
+        self._store(user.user_id, User.__name__, user)
+
+    def invalidate(self, user_id: str) -> None:
+        """사용자 관련 캐시 항목 전체 제거"""
+        if self._entries.pop(user_id, None) is not None:
+            self._stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        """적중/미스 카운터와 적중률 반환"""
+        total = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_ratio": round(self._stats["hits"] / total, 4) if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def _lookup(self, user_id: str, kind: str):
+        views = self._entries.get(user_id)
+        if not views or kind not in views:
+            return None
+        expires_at, value = views[kind]
+        if expires_at < time.monotonic():
+            views.pop(kind)
+            return None
+        self._entries.move_to_end(user_id)
+        return value
+
+    def _store(self, user_id: str, kind: str, value: BaseModel) -> None:
+        views = self._entries.setdefault(user_id, {})
+        views[kind] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+def get_user_profile_cache() -> UserProfileCache:
+    """사용자 프로필 캐시 인스턴스 반환"""
+    return get_container().resolve("user_profile_cache", UserProfileCache)
@@ -0,0 +1,213 @@
+"""오디오 업로드 스트리밍 파싱 유틸리티"""
+
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from app.core.constants import (
+    ALLOWED_AUDIO_TYPES, AUDIO_SNIFF_LENGTH, MAX_AUDIO_FILE_SIZE, ErrorMessages
+)
+from app.utils.common import format_message
+
+
+def detect_audio_content_type(header: bytes) -> Optional[str]:
+    """
+    파일 앞부분(매직 넘버)으로 오디오 컨테이너 형식을 판별합니다.
+
+    Args:
+        header: 파일의 첫 바이트들 (최소 12바이트 권장)
+
+    Returns:
+        Optional[str]: 판별된 MIME 타입 (알 수 없는 형식이면 None)
+    """
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "audio/wav"
+    if header[4:8] == b"ftyp":
+        return "audio/3gpp" if header[8:11] == b"3gp" else "audio/mp4"
+    if header[:4] == b"\x1a\x45\xdf\xa3":
+        return "audio/webm"
+    if header[:4] == b"OggS":
+        return "audio/ogg"
+    if header[:4] == b"fLaC":
+        return "audio/flac"
+    if header[:3] == b"ID3":
+        return "audio/mpeg"
+    if len(header) >= 2 and header[0] == 0xFF and (header[1] & 0xF6) == 0xF0:
+        return "audio/aac"
+    if len(header) >= 2 and header[0] == 0xFF and (header[1] & 0xE0) == 0xE0:
+        return "audio/mpeg"
+    return None
+
+
+def _file_size_exceeded() -> HTTPException:
+    max_size_mb = MAX_AUDIO_FILE_SIZE // (1024 * 1024)
+    return HTTPException(
+        status_code=400,
+        detail=format_message(ErrorMessages.FILE_SIZE_EXCEEDED, max_size=max_size_mb)
+    )
+
+
+def _unsupported_audio_format() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=format_message(
+            ErrorMessages.UNSUPPORTED_AUDIO_FORMAT,
+            formats=', '.join(ALLOWED_AUDIO_TYPES)
+        )
+    )
+
+
+class StreamingAudioForm:
+    """
+    multipart/form-data 요청 본문을 임시 파일에 스풀링하지 않고 순차적으로 파싱합니다.
+
+    오디오 파트 이전의 일반 필드는 `open_audio()`에서, 이후의 필드는 `finish()`에서 수집되며,
+    오디오 데이터는 `audio_chunks()`로 크기/형식 검증을 거쳐 청크 단위로 전달됩니다.
+    """
+
+    def __init__(self, request: Request, file_field: str = "audio_file"):
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_AUDIO_FILE_SIZE * 2:
+            raise _file_size_exceeded()
+
+        _, params = parse_options_header(request.headers.get("content-type"))
+        boundary = params.get(b"boundary")
+        if not boundary:
+            raise HTTPException(status_code=400, detail=ErrorMessages.MULTIPART_BOUNDARY_MISSING)
+
+        self.file_field = file_field
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+
+        self._body = request.stream()
+        self._events: Deque[Tuple] = deque()
+        self._finished = False
+        self._header_name = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": lambda data, start, end: self._events.append(("data", data[start:end])),
+            "on_part_end": lambda: self._events.append(("part_end",)),
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": lambda: self._events.append(("headers_finished", self._headers)),
+            "on_end": lambda: self._events.append(("end",)),
+        })
+
+    def _on_part_begin(self) -> None:
+        # 한 번의 write로 여러 파트가 파싱될 수 있으므로 파트마다 새 헤더 딕셔너리 사용
+        self._headers = {}
+        self._events.append(("part_begin",))
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_name.lower()] = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    async def _next_event(self) -> Optional[Tuple]:
+        """요청 본문을 필요한 만큼만 읽어 다음 파싱 이벤트를 반환"""
+        while not self._events:
+            if self._finished:
+                return None
+            try:
+                chunk = await self._body.__anext__()
+            except StopAsyncIteration:
+                self._parser.finalize()
+                self._finished = True
+                continue
+            if chunk:
+                self._parser.write(chunk)
+        return self._events.popleft()
+
+    async def _consume_fields(self, stop_at_file: bool) -> bool:
+        """
+        일반 필드를 수집합니다.
+
+        Returns:
+            bool: 오디오 파트 시작 지점에서 멈췄으면 True
+        """
+        name: Optional[str] = None
+        value = bytearray()
+        while True:
+            event = await self._next_event()
+            if event is None or event[0] == "end":
+                return False
+            kind = event[0]
+            if kind == "part_begin":
+                name, value = None, bytearray()
+            elif kind == "headers_finished":
+                _, options = parse_options_header(event[1].get(b"content-disposition"))
+                name = options.get(b"name", b"").decode("latin-1")
+                if stop_at_file and name == self.file_field:
+                    filename = options.get(b"filename")
+                    self.filename = filename.decode("utf-8", "replace") if filename else "audio.wav"
+                    self.content_type = event[1].get(b"content-type", b"").decode("latin-1")
+                    return True
+            elif kind == "data":
+                value.extend(event[1])
+            elif kind == "part_end" and name:
+                self.fields[name] = value.decode("utf-8", "replace")
+
+    async def open_audio(self) -> None:
+        """오디오 파트 직전까지 파싱하고 선언된 Content-Type을 검사"""
+        if not await self._consume_fields(stop_at_file=True):
+            raise HTTPException(status_code=400, detail=ErrorMessages.AUDIO_FILE_MISSING)
+        if self.content_type not in ALLOWED_AUDIO_TYPES:
+            raise _unsupported_audio_format()
+
+    async def audio_chunks(self) -> AsyncIterator[bytes]:
+        """
+        오디오 데이터를 청크 단위로 전달합니다.
+        누적 크기가 MAX_AUDIO_FILE_SIZE를 넘거나 매직 넘버가 오디오가 아니면 즉시 중단합니다.
+        """
+        total_size = 0
+        head = bytearray()
+        sniffed = False
+        while True:
+            event = await self._next_event()
+            if event is None or event[0] in ("part_end", "end"):
+                break
+            if event[0] != "data":
+                continue
+
+            chunk = event[1]
+            total_size += len(chunk)
+            if total_size > MAX_AUDIO_FILE_SIZE:
+                raise _file_size_exceeded()
+
+            if not sniffed:
+                head.extend(chunk)
+                if len(head) < AUDIO_SNIFF_LENGTH:
+                    continue
+                if detect_audio_content_type(bytes(head)) is None:
+                    raise _unsupported_audio_format()
+                sniffed = True
+                chunk, head = bytes(head), bytearray()
+
+            yield chunk
+
+        if not sniffed:
+            if not head or detect_audio_content_type(bytes(head)) is None:
+                raise _unsupported_audio_format()
+            yield bytes(head)
+
+    async def finish(self) -> None:
+        """오디오 파트 이후에 남은 일반 필드를 수집"""
+        await self._consume_fields(stop_at_file=False)
+
+    @property
+    def question_number(self) -> Optional[int]:
+        """폼의 question_number 필드 (없거나 정수가 아니면 None)"""
+        value = self.fields.get("question_number", "").strip()
+        return int(value) if value.lstrip("-").isdigit() else None
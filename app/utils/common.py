@@ -1,7 +1,7 @@
 """공통 유틸리티 함수들"""
 
 from datetime import datetime, date
-from typing import Dict, Any, Union
+from typing import Dict, Any, List, Union
 from zoneinfo import ZoneInfo
 from app.core.constants import KOREA_TIMEZONE, FileFormats
 
@@ -46,6 +46,10 @@ def format_message(template: str, **kwargs) -> str:
     """메시지 템플릿 포맷팅"""
     return template.format(**kwargs)
 
+def format_answer_lines(question_number: int, question_text: str, answer: str) -> List[str]:
+    """user_message에 들어가는 질문 / 답변 두 줄"""
+    return [f"Q{question_number}: {question_text}", f"A{question_number}: {answer}"]
+
 def create_success_response(
     conversation_id: str,
     question_number: int,
@@ -0,0 +1,232 @@
+"""스트리밍 JSON 증분 파싱 유틸리티"""
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+_WHITESPACE = " \t\r\n"
+# 객체 시작으로 볼 수 있는 `{` (바로 키나 `}`가 오는 경우만 raw_decode 시도)
+_OBJECT_START = re.compile(r'\{[ \t\r\n]*["}]')
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+@dataclass
+class JSONStreamEvent:
+    """
+    증분 파싱 이벤트
+
+    - kind="value": path의 값이 완성됨 (최상위 문서가 완성되면 path="")
+    - kind="delta": stream_fields에 해당하는 문자열 값의 새로 도착한 부분
+    """
+    kind: str
+    path: str
+    value: Any
+
+    VALUE = "value"
+    DELTA = "delta"
+
+
+@dataclass
+class _Frame:
+    container: Union[dict, list]
+    key: Optional[str] = None
+    expect: str = "value"
+
+
+class IncrementalJSONParser:
+    """
+    LLM 응답처럼 조각으로 도착하는 JSON을 한 글자씩 한 번만 읽어 파싱합니다.
+
+    첫 `{`/`[` 이전의 텍스트(코드 블록 표시 등)와 최상위 문서 이후의 텍스트는 무시하며,
+    완성된 값과 지정된 문자열 필드의 부분 텍스트를 이벤트로 반환합니다.
+    """
+
+    def __init__(self, stream_fields: Iterable[str] = ()):
+        self.stream_fields = set(stream_fields)
+        self.value: Any = None
+        self.done = False
+
+        self._stack: List[_Frame] = []
+        self._string: Optional[List[str]] = None
+        self._string_is_key = False
+        self._string_streamed = False
+        self._delta: List[str] = []
+        self._escape: Optional[str] = None
+        self._high_surrogate: Optional[int] = None
+        self._scalar: Optional[List[str]] = None
+
+    def feed(self, text: str) -> List[JSONStreamEvent]:
+        """
+        새로 도착한 텍스트를 파싱합니다.
+
+        Returns:
+            List[JSONStreamEvent]: 이번 조각에서 발생한 이벤트
+        """
+        events: List[JSONStreamEvent] = []
+        for char in text:
+            if self.done:
+                break
+            if self._string is not None:
+                self._feed_string(char, events)
+            elif self._scalar is not None and char not in _WHITESPACE and char not in ",]}":
+                self._scalar.append(char)
+            else:
+                if self._scalar is not None:
+                    self._finish_scalar(events)
+                self._feed_structure(char, events)
+
+        if self._delta:
+            events.append(JSONStreamEvent(JSONStreamEvent.DELTA, self._path(), "".join(self._delta)))
+            self._delta = []
+        return events
+
+    def _path(self) -> str:
+        parts = []
+        for frame in self._stack:
+            if isinstance(frame.container, dict):
+                parts.append(frame.key or "")
+            else:
+                parts.append(str(len(frame.container)))
+        return ".".join(parts)
+
+    def _feed_structure(self, char: str, events: List[JSONStreamEvent]) -> None:
+        if not self._stack:
+            if char in "{[":
+                self._open_container(char)
+            return
+        if char in _WHITESPACE:
+            return
+
+        frame = self._stack[-1]
+        is_object = isinstance(frame.container, dict)
+        if char == '"' and frame.expect in ("key", "value"):
+            self._string = []
+            self._string_is_key = frame.expect == "key"
+            self._string_streamed = not self._string_is_key and self._path() in self.stream_fields
+        elif char == ":" and frame.expect == "colon":
+            frame.expect = "value"
+        elif char == "," and frame.expect == "comma":
+            frame.expect = "key" if is_object else "value"
+        elif char in "{[" and frame.expect == "value":
+            self._open_container(char)
+        elif char == ("}" if is_object else "]") and self._can_close(frame):
+            closed = self._stack.pop()
+            self._set_value(closed.container, events)
+        elif char not in '":,{}[]' and frame.expect == "value":
+            self._scalar = [char]
+        else:
+            raise ValueError(f"잘못된 JSON 구문: {char!r} (기대: {frame.expect})")
+
+    @staticmethod
+    def _can_close(frame: _Frame) -> bool:
+        """값 다음이거나 빈 컨테이너일 때만 닫을 수 있음 (끝에 붙은 쉼표 거부)"""
+        if frame.expect == "comma":
+            return True
+        opening = "key" if isinstance(frame.container, dict) else "value"
+        return frame.expect == opening and not frame.container
+
+    def _open_container(self, char: str) -> None:
+        container: Union[dict, list] = {} if char == "{" else []
+        self._stack.append(_Frame(container, expect="key" if char == "{" else "value"))
+
+    def _set_value(self, value: Any, events: List[JSONStreamEvent]) -> None:
+        """완성된 값을 부모 컨테이너에 넣고 value 이벤트 발생"""
+        if not self._stack:
+            self.value = value
+            self.done = True
+            events.append(JSONStreamEvent(JSONStreamEvent.VALUE, "", value))
+            return
+
+        path = self._path()
+        parent = self._stack[-1]
+        if isinstance(parent.container, dict):
+            parent.container[parent.key] = value
+        else:
+            parent.container.append(value)
+        parent.expect = "comma"
+        events.append(JSONStreamEvent(JSONStreamEvent.VALUE, path, value))
+
+    def _feed_string(self, char: str, events: List[JSONStreamEvent]) -> None:
+        if self._escape is not None:
+            self._feed_escape(char)
+        elif char == "\\":
+            self._escape = ""
+        elif char == '"':
+            self._finish_string(events)
+        else:
+            self._append_char(char)
+
+    def _feed_escape(self, char: str) -> None:
+        if self._escape == "":
+            if char == "u":
+                self._escape = "u"
+                return
+            self._escape = None
+            self._append_char(_ESCAPES.get(char, char))
+            return
+
+        self._escape += char
+        if len(self._escape) < 5:
+            return
+        code = int(self._escape[1:], 16)
+        self._escape = None
+        if 0xD800 <= code < 0xDC00:
+            self._high_surrogate = code
+            return
+        if self._high_surrogate is not None and 0xDC00 <= code < 0xE000:
+            code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+        self._high_surrogate = None
+        self._append_char(chr(code))
+
+    def _append_char(self, char: str) -> None:
+        self._string.append(char)
+        if self._string_streamed:
+            self._delta.append(char)
+
+    def _finish_string(self, events: List[JSONStreamEvent]) -> None:
+        text = "".join(self._string)
+        self._string = None
+        if self._string_is_key:
+            frame = self._stack[-1]
+            frame.key = text
+            frame.expect = "colon"
+            return
+
+        if self._delta:
+            events.append(JSONStreamEvent(JSONStreamEvent.DELTA, self._path(), "".join(self._delta)))
+            self._delta = []
+        self._set_value(text, events)
+
+    def _finish_scalar(self, events: List[JSONStreamEvent]) -> None:
+        token = "".join(self._scalar)
+        self._scalar = None
+        try:
+            value = json.loads(token)
+        except json.JSONDecodeError:
+            raise ValueError(f"잘못된 JSON 값: {token[:20]}")
+        self._set_value(value, events)
+
+
+def extract_json_object(text: str) -> Dict[str, Any]:
+    """
+    AI 응답 텍스트에서 JSON 객체를 추출합니다. (구조화 출력이 실패했을 때의 대체 경로)
+
+    코드 블록 표시나 앞뒤 설명을 건너뛰고 객체가 시작될 수 있는 첫 `{`부터 파싱합니다.
+    앞쪽 `{`가 JSON이 아니면 파싱이 실패한 위치 이후의 `{`부터 이어서 시도하므로 텍스트를 한 번만 읽습니다.
+
+    Raises:
+        ValueError: 유효한 JSON 객체를 찾을 수 없는 경우
+    """
+    decoder = json.JSONDecoder()
+    match = _OBJECT_START.search(text)
+    while match:
+        start = match.start()
+        try:
+            value, _ = decoder.raw_decode(text, start)
+            return value
+        except json.JSONDecodeError as e:
+            # 실패 위치까지는 이미 읽었으므로 그 이후의 `{`부터 다시 시도 (전체 한 번의 순회)
+            match = _OBJECT_START.search(text, max(e.pos, start + 1))
+
+    raise ValueError("AI 응답에서 유효한 JSON을 추출할 수 없습니다.")
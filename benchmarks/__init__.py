@@ -0,0 +1,3 @@
+"""
+부하 테스트 / 벤치마크 도구 (외부 네트워크 없이 GCS, OpenAI, Gemini, MongoDB 대체 구현 사용)
+"""
@@ -0,0 +1,81 @@
+"""
+벤치마크 대상 애플리케이션 서버
+
+대체 구현(Gemini, mongomock)을 먼저 주입한 뒤 app.main을 불러옵니다.
+워커가 여러 개면 각 워커 프로세스가 create_benchmark_app을 호출하므로 설정은 환경 변수로 전달합니다.
+(mongomock은 프로세스마다 따로 동작하므로 워커가 여러 개면 --mongodb-url을 사용하는 것이 좋습니다)
+OpenAI / GCS 연결 대상은 부모 프로세스가 OPENAI_BASE_URL / STORAGE_EMULATOR_HOST 환경 변수로 지정합니다.
+
+실행: python -m benchmarks.app_server --port 18000 --mongo-mock --workers 2
+"""
+import argparse
+import os
+
+import uvicorn
+
+from benchmarks.fakes import FakeGeminiClient, LatencyProfile
+
+ENV_MONGO_MOCK = "BENCHMARK_MONGO_MOCK"
+ENV_GEMINI_LATENCY = "BENCHMARK_GEMINI_LATENCY"
+ENV_SEED = "BENCHMARK_SEED"
+
+
+def install_mongo_mock():
+    """MongoDB 대신 프로세스 메모리 안의 mongomock 사용 (리포트 목록 조회의 hint는 지원하지 않음)"""
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("mongomock-motor가 설치되어 있지 않습니다. (pip install mongomock-motor 또는 --mongodb-url 사용)")
+
+    from app.core import database
+    database.AsyncIOMotorClient = AsyncMongoMockClient
+
+
+def create_benchmark_app():
+    """대체 구현을 주입한 애플리케이션 (uvicorn factory, 워커 프로세스마다 호출)"""
+    if os.getenv(ENV_MONGO_MOCK) == "1":
+        install_mongo_mock()
+
+    from app.external.ai.client import AIClientFactory
+    latency = LatencyProfile.parse(os.getenv(ENV_GEMINI_LATENCY, "4.0:0.4"))
+    AIClientFactory._instances["gemini"] = FakeGeminiClient(latency, int(os.getenv(ENV_SEED, "0")))
+
+    from app.main import app
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 대상 MoA 백엔드 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18000)
+    parser.add_argument("--mongo-mock", action="store_true", help="MongoDB 대신 mongomock 사용")
+    parser.add_argument("--gemini-latency", default="4.0:0.4", help="중앙값:sigma[:오류율]")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--loop", default="auto", help="auto / uvloop / asyncio")
+    parser.add_argument("--http", default="auto", help="auto / httptools / h11")
+    args = parser.parse_args()
+    LatencyProfile.parse(args.gemini_latency)
+
+    os.environ[ENV_MONGO_MOCK] = "1" if args.mongo_mock else "0"
+    os.environ[ENV_GEMINI_LATENCY] = args.gemini_latency
+    os.environ[ENV_SEED] = str(args.seed)
+
+    from app.core.server import prepare_multiprocess_metrics
+    prepare_multiprocess_metrics(args.workers, args.port)
+
+    uvicorn.run(
+        "benchmarks.app_server:create_benchmark_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=args.loop,
+        http=args.http,
+        log_level="warning",
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""
+벤치마크용 외부 서비스 대체 구현
+
+- OpenAI Chat Completions / Audio Transcriptions API (HTTP, OPENAI_BASE_URL로 연결)
+- GCS JSON API 에뮬레이터 (resumable 업로드 / 다운로드 / 삭제, STORAGE_EMULATOR_HOST로 연결)
+- Gemini 클라이언트 (SDK가 gRPC를 사용하므로 AIClient 구현체로 대체)
+
+실행: python -m benchmarks.fakes --port 18081
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Type
+
+import google_crc32c
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from app.core.metrics import track_ai_request
+from app.external.ai.base import AIClient
+
+FAKE_TRANSCRIPT = "오늘은 어머니가 제 이름을 기억해 주셔서 마음이 따뜻했어요. 그래도 하루 종일 긴장해서 조금 지쳤습니다."
+STREAM_CHUNK_COUNT = 20
+
+
+@dataclass
+class LatencyProfile:
+    """
+    로그정규분포 지연 시간 + 오류 주입 비율
+
+    median 초를 중앙값으로 하고 sigma가 클수록 꼬리가 길어짐 (sigma 0.5 ≈ p99가 중앙값의 3.2배)
+    """
+    median: float
+    sigma: float = 0.5
+    error_rate: float = 0.0
+
+    @classmethod
+    def parse(cls, text: str) -> "LatencyProfile":
+        """'중앙값[:sigma[:오류율]]' 형식 (예: 2.0:0.4:0.01)"""
+        values = [float(value) for value in text.split(":")]
+        if not 1 <= len(values) <= 3:
+            raise argparse.ArgumentTypeError(f"지연 시간 형식이 잘못되었습니다: {text}")
+        return cls(*values)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        return self.median * math.exp(rng.gauss(0, self.sigma))
+
+    def should_fail(self, rng: random.Random) -> bool:
+        return rng.random() < self.error_rate
+
+    def __str__(self) -> str:
+        return f"{self.median}:{self.sigma}:{self.error_rate}"
+
+
+def build_report_text(rng: random.Random) -> str:
+    """ConversationReport 형식의 리포트 JSON 문자열"""
+    stress = rng.randint(30, 80)
+    return json.dumps({
+        "letter": "오늘도 어머니 곁을 지킨 당신에게, 작은 기억의 순간이 큰 위로가 되었길 바라요. " * 4,
+        "actions": "1. 10분간 산책하기\n2. 따뜻한 차 마시기\n3. 오늘의 좋은 순간 기록하기",
+        "emotion_score": rng.randint(20, 90),
+        "daily_summary": "기억의 순간에서 기쁨을 느꼈지만 긴장으로 지친 하루",
+        "emotion_analysis": {
+            "stress": stress,
+            "resilience": rng.randint(30, 80),
+            "stability": 100 - stress,
+        },
+    }, ensure_ascii=False)
+
+
+def _split_text(text: str, count: int):
+    size = max(1, math.ceil(len(text) / count))
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _openai_rate_limited() -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        headers={"retry-after-ms": "200"},
+        content={"error": {"message": "Rate limit reached (benchmark)", "type": "requests", "code": "rate_limit_exceeded"}},
+    )
+
+
+def _object_resource(bucket: str, name: str, data: bytes, content_type: str) -> Dict[str, Any]:
+    """GCS 객체 메타데이터 (클라이언트 체크섬 검증용 md5 / crc32c 포함)"""
+    return {
+        "kind": "storage#object",
+        "id": f"{bucket}/{name}/1",
+        "bucket": bucket,
+        "name": name,
+        "size": str(len(data)),
+        "contentType": content_type,
+        "generation": "1",
+        "metageneration": "1",
+        "md5Hash": base64.b64encode(hashlib.md5(data).digest()).decode(),
+        "crc32c": base64.b64encode(google_crc32c.Checksum(data).digest()).decode(),
+    }
+
+
+def create_fake_app(
+    chat_latency: LatencyProfile,
+    stt_latency: LatencyProfile,
+    gcs_latency: LatencyProfile,
+    seed: int = 0
+) -> FastAPI:
+    """OpenAI API와 GCS JSON API를 한 포트에서 제공하는 대체 서버 (경로가 겹치지 않음)"""
+    app = FastAPI(title="MoA Benchmark Fakes")
+    rng = random.Random(seed)
+    objects: Dict[tuple, Dict[str, Any]] = {}
+    uploads: Dict[str, Dict[str, Any]] = {}
+
+    # ---------- OpenAI ----------
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        latency = chat_latency.sample(rng)
+        if chat_latency.should_fail(rng):
+            await asyncio.sleep(latency * 0.1)
+            return _openai_rate_limited()
+
+        content = build_report_text(rng)
+        completion_id = f"chatcmpl-bench-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        prompt_tokens = sum(len(message.get("content", "")) for message in body.get("messages", []))
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(content), "total_tokens": prompt_tokens + len(content)}
+
+        if not body.get("stream"):
+            await asyncio.sleep(latency)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": body.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            }
+
+        # 전체 지연 시간의 30%를 첫 토큰까지, 나머지를 조각 사이에 나눠 대기
+        pieces = _split_text(content, STREAM_CHUNK_COUNT)
+
+        async def events() -> AsyncIterator[bytes]:
+            await asyncio.sleep(latency * 0.3)
+            for index, piece in enumerate(pieces):
+                if index:
+                    await asyncio.sleep(latency * 0.7 / len(pieces))
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": body.get("model"),
+                    "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode()
+            final = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": body.get("model"),
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            }
+            yield f"data: {json.dumps(final)}\n\n".encode()
+            if (body.get("stream_options") or {}).get("include_usage"):
+                usage_chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": body.get("model"),
+                    "choices": [],
+                    "usage": usage,
+                }
+                yield f"data: {json.dumps(usage_chunk)}\n\n".encode()
+            yield b"data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/audio/transcriptions")
+    async def audio_transcriptions(request: Request):
+        form = await request.form()
+        await form["file"].read()
+        latency = stt_latency.sample(rng)
+        if stt_latency.should_fail(rng):
+            await asyncio.sleep(latency * 0.1)
+            return _openai_rate_limited()
+        await asyncio.sleep(latency)
+        return {"text": FAKE_TRANSCRIPT}
+
+    # ---------- GCS ----------
+
+    async def gcs_delay() -> Optional[Response]:
+        """지연 후 오류 주입 대상이면 503 (클라이언트 재시도 대상) 응답 반환"""
+        await asyncio.sleep(gcs_latency.sample(rng))
+        if gcs_latency.should_fail(rng):
+            return JSONResponse(status_code=503, content={"error": {"code": 503, "message": "Backend Error"}})
+        return None
+
+    @app.post("/upload/storage/v1/b/{bucket}/o")
+    async def start_upload(bucket: str, request: Request):
+        if (error := await gcs_delay()) is not None:
+            return error
+        metadata = json.loads(await request.body() or b"{}")
+        name = metadata.get("name") or request.query_params.get("name")
+        upload_id = uuid.uuid4().hex
+        uploads[upload_id] = {
+            "bucket": bucket,
+            "name": name,
+            "content_type": metadata.get("contentType") or request.headers.get("x-upload-content-type", "application/octet-stream"),
+            "data": bytearray(),
+        }
+        location = f"{request.base_url}upload/storage/v1/b/{bucket}/o?uploadType=resumable&upload_id={upload_id}"
+        return Response(status_code=200, headers={"Location": location})
+
+    @app.put("/upload/storage/v1/b/{bucket}/o")
+    async def upload_chunk(bucket: str, upload_id: str, request: Request):
+        upload = uploads.get(upload_id)
+        if upload is None:
+            return JSONResponse(status_code=404, content={"error": {"code": 404, "message": "No such upload"}})
+        if (error := await gcs_delay()) is not None:
+            return error
+
+        # Content-Range: "bytes 0-262143/*" | "bytes 262144-300000/300001" | "bytes */300001"
+        match = re.match(r"bytes (?:(\d+)-(\d+)|\*)/(\d+|\*)", request.headers.get("content-range", ""))
+        body = await request.body()
+        if match and match.group(1) is not None:
+            start = int(match.group(1))
+            del upload["data"][start:]
+            upload["data"].extend(body)
+        total = match.group(3) if match else str(len(upload["data"]))
+
+        received = len(upload["data"])
+        if total != "*" and received >= int(total):
+            data = bytes(upload["data"])
+            objects[(bucket, upload["name"])] = {"data": data, "content_type": upload["content_type"]}
+            del uploads[upload_id]
+            return _object_resource(bucket, upload["name"], data, upload["content_type"])
+
+        headers = {"Range": f"bytes=0-{received - 1}"} if received else {}
+        return Response(status_code=308, headers=headers)
+
+    @app.delete("/upload/storage/v1/b/{bucket}/o")
+    async def cancel_upload(bucket: str, upload_id: str):
+        """resumable 업로드 세션 취소 (GCS는 499로 응답)"""
+        if uploads.pop(upload_id, None) is None:
+            return JSONResponse(status_code=404, content={"error": {"code": 404, "message": "No such upload"}})
+        return Response(status_code=499)
+
+    @app.get("/download/storage/v1/b/{bucket}/o/{name:path}")
+    async def download_object(bucket: str, name: str):
+        if (error := await gcs_delay()) is not None:
+            return error
+        stored = objects.get((bucket, name))
+        if stored is None:
+            return JSONResponse(status_code=404, content={"error": {"code": 404, "message": "No such object"}})
+        resource = _object_resource(bucket, name, stored["data"], stored["content_type"])
+        return Response(
+            content=stored["data"],
+            media_type=stored["content_type"],
+            headers={
+                "x-goog-hash": f"crc32c={resource['crc32c']},md5={resource['md5Hash']}",
+                "x-goog-generation": resource["generation"],
+            },
+        )
+
+    @app.get("/storage/v1/b/{bucket}/o/{name:path}")
+    async def get_object(bucket: str, name: str):
+        stored = objects.get((bucket, name))
+        if stored is None:
+            return JSONResponse(status_code=404, content={"error": {"code": 404, "message": "No such object"}})
+        return _object_resource(bucket, name, stored["data"], stored["content_type"])
+
+    @app.delete("/storage/v1/b/{bucket}/o/{name:path}")
+    async def delete_object(bucket: str, name: str):
+        if (error := await gcs_delay()) is not None:
+            return error
+        if objects.pop((bucket, name), None) is None:
+            return JSONResponse(status_code=404, content={"error": {"code": 404, "message": "No such object"}})
+        return Response(status_code=204)
+
+    @app.get("/storage/v1/b/{bucket}/iam/testPermissions")
+    async def test_permissions(bucket: str, request: Request):
+        # 모든 권한이 있는 것으로 응답 (준비 상태 확인용)
+        return {"kind": "storage#testIamPermissionsResponse", "permissions": request.query_params.getlist("permissions")}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy", "objects": len(objects), "uploads": len(uploads)}
+
+    return app
+
+
+class FakeGeminiClient(AIClient):
+    """지연 시간 분포를 따르는 Gemini 대체 클라이언트 (AIClientFactory 인스턴스로 주입)"""
+
+    def __init__(self, latency: LatencyProfile, seed: int = 0):
+        self.latency = latency
+        self.rng = random.Random(seed)
+
+    async def _respond(self) -> str:
+        latency = self.latency.sample(self.rng)
+        await asyncio.sleep(latency)
+        if self.latency.should_fail(self.rng):
+            raise Exception("429 Resource has been exhausted (benchmark)")
+        return build_report_text(self.rng)
+
+    async def generate_content(self, prompt: str) -> str:
+        with track_ai_request("gemini", "chat"):
+            return await self._respond()
+
+    async def generate_content_stream(
+        self,
+        prompt: str,
+        response_model: Optional[Type[BaseModel]] = None
+    ) -> AsyncIterator[str]:
+        latency = self.latency.sample(self.rng)
+        if self.latency.should_fail(self.rng):
+            await asyncio.sleep(latency * 0.1)
+            raise Exception("429 Resource has been exhausted (benchmark)")
+        pieces = _split_text(build_report_text(self.rng), STREAM_CHUNK_COUNT)
+        await asyncio.sleep(latency * 0.3)
+        for index, piece in enumerate(pieces):
+            if index:
+                await asyncio.sleep(latency * 0.7 / len(pieces))
+            yield piece
+
+    async def generate_structured_content(
+        self,
+        prompt: str,
+        expected_format: str = "json",
+        response_model: Optional[Type[BaseModel]] = None
+    ) -> Dict[str, Any]:
+        with track_ai_request("gemini", "chat"):
+            text = await self._respond()
+        return self._validate_response(json.loads(text), response_model)
+
+    def is_available(self) -> bool:
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI / GCS 대체 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18081)
+    parser.add_argument("--chat-latency", type=LatencyProfile.parse, default=LatencyProfile(3.0, 0.4))
+    parser.add_argument("--stt-latency", type=LatencyProfile.parse, default=LatencyProfile(1.5, 0.4))
+    parser.add_argument("--gcs-latency", type=LatencyProfile.parse, default=LatencyProfile(0.03, 0.5))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    app = create_fake_app(args.chat_latency, args.stt_latency, args.gcs_latency, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
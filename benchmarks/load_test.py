@@ -0,0 +1,478 @@
+"""
+MoA 백엔드 부하 테스트
+
+대체 서버(OpenAI / GCS)와 애플리케이션 서버를 하위 프로세스로 띄운 뒤,
+3문항 세션(온보딩 → 질문 조회 + 음성 답변 ×3 → 리포트 조회)을 목표 RPS에 맞춰 발생시키고
+엔드포인트별 / 단계별 p50 / p95 / p99를 출력합니다. 외부 네트워크는 사용하지 않습니다.
+
+실행 예:
+    python -m benchmarks.load_test --rps 4 --duration 60
+    python -m benchmarks.load_test --rps 8 --duration 120 --mongodb-url mongodb://localhost:27017 --output bench.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+import wave
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+
+from benchmarks.fakes import LatencyProfile
+
+QUESTION_COUNT = 3
+# 온보딩 1 + (질문 조회 + 답변 업로드) × 3 + 리포트 조회 1 (폴링 재시도는 제외)
+REQUESTS_PER_SESSION = 2 + QUESTION_COUNT * 2
+QUANTILES = (0.5, 0.95, 0.99)
+AUDIO_SAMPLE_RATE = 16000
+
+
+def percentile(values: List[float], quantile: float) -> float:
+    """최근접 순위(nearest-rank) 분위수"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(quantile * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """밀리초 단위 요약 통계"""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        **{f"p{int(q * 100)}": round(percentile(values, q) * 1000, 1) for q in QUANTILES},
+        "max": round(max(values) * 1000, 1),
+    }
+
+
+def parse_server_timing(header: str) -> List[Tuple[str, float]]:
+    """'stage;dur=12.3, total;dur=45.6' → [(stage, 초)]"""
+    entries = []
+    for entry in header.split(","):
+        name, _, params = entry.strip().partition(";")
+        if params.startswith("dur="):
+            entries.append((name, float(params[4:]) / 1000))
+    return entries
+
+
+def histogram_quantiles(metrics_text: str, metric_name: str, label_names: Tuple[str, ...]) -> Dict[str, Dict[str, float]]:
+    """
+    /metrics 히스토그램 버킷에서 분위수를 추정합니다 (Prometheus histogram_quantile과 같은 선형 보간, 성공 건만).
+    요청 경로 밖에서 실행되는 백그라운드 단계는 Server-Timing으로 볼 수 없으므로 이 값을 사용합니다.
+    """
+    buckets: Dict[str, List[Tuple[float, float]]] = defaultdict(list)
+    for family in text_string_to_metric_families(metrics_text):
+        if family.name != metric_name:
+            continue
+        for sample in family.samples:
+            if sample.name != f"{metric_name}_bucket" or sample.labels.get("outcome") != "success":
+                continue
+            key = "/".join(sample.labels[name] for name in label_names)
+            buckets[key].append((float(sample.labels["le"]), sample.value))
+
+    result = {}
+    for key, points in buckets.items():
+        points.sort()
+        total = points[-1][1]
+        if total:
+            result[key] = {
+                "count": int(total),
+                **{f"p{int(q * 100)}": round(_bucket_quantile(points, q * total) * 1000, 1) for q in QUANTILES},
+            }
+    return result
+
+
+def _bucket_quantile(points: List[Tuple[float, float]], rank: float) -> float:
+    lower_bound, lower_count = 0.0, 0.0
+    for upper_bound, count in points:
+        if count >= rank:
+            if upper_bound == float("inf"):
+                return lower_bound
+            if count == lower_count:
+                return upper_bound
+            return lower_bound + (upper_bound - lower_bound) * (rank - lower_count) / (count - lower_count)
+        lower_bound, lower_count = upper_bound, count
+    return lower_bound
+
+
+def build_wav(seconds: float, rng: random.Random) -> bytes:
+    """
+    16kHz 모노 WAV (무작위 샘플)
+    전사 캐시가 내용 해시 기준이므로 업로드마다 다른 내용을 만들어 STT가 매번 실행되도록 함
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(AUDIO_SAMPLE_RATE)
+        wav.writeframes(rng.randbytes(int(seconds * AUDIO_SAMPLE_RATE) * 2))
+    return buffer.getvalue()
+
+
+class LoadTestRecorder:
+    """엔드포인트 / 단계 / 세션별 지연 시간 수집"""
+
+    def __init__(self):
+        self.endpoints: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.stages: Dict[str, List[float]] = defaultdict(list)
+        self.sessions: Dict[str, List[float]] = defaultdict(list)
+        self.failed_sessions = 0
+        self.error_samples: List[str] = []
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """요청 1건을 보내 지연 시간과 Server-Timing 단계를 기록 (2xx가 아니면 오류로 집계)"""
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.record_error(label, f"{type(e).__name__}: {e}")
+            return None
+        self.endpoints[label].append(time.perf_counter() - started)
+        for stage, elapsed in parse_server_timing(response.headers.get("server-timing", "")):
+            if stage != "total":
+                self.stages[stage].append(elapsed)
+        if not response.is_success:
+            self.record_error(label, f"HTTP {response.status_code}: {response.text[:200]}")
+        return response
+
+    def record_error(self, label: str, message: str) -> None:
+        self.errors[label] += 1
+        if len(self.error_samples) < 10:
+            self.error_samples.append(f"{label} - {message}")
+
+
+class LoadTest:
+    """목표 RPS로 세션을 발생시키는 부하 생성기 (도착 간격은 시드 고정 포아송 분포)"""
+
+    def __init__(self, args: argparse.Namespace, base_url: str):
+        self.args = args
+        self.base_url = base_url
+        self.rng = random.Random(args.seed)
+        self.recorder = LoadTestRecorder()
+        self.sessions_started = 0
+
+    async def run(self) -> float:
+        """부하 발생 후 모든 세션 종료까지 대기, 실제 경과 시간(초) 반환"""
+        session_rate = self.args.rps / REQUESTS_PER_SESSION
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+        timeout = httpx.Timeout(self.args.request_timeout, connect=10)
+        async with httpx.AsyncClient(base_url=self.base_url, limits=limits, timeout=timeout) as client:
+            tasks = []
+            started = time.perf_counter()
+            next_arrival = 0.0
+            while next_arrival < self.args.duration:
+                delay = next_arrival - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(self._run_session(client, self.sessions_started)))
+                self.sessions_started += 1
+                next_arrival += self.rng.expovariate(session_rate)
+
+            print(f"⏳ 부하 발생 종료, 진행 중인 세션 {sum(1 for task in tasks if not task.done())}개 대기...")
+            await asyncio.gather(*tasks)
+            return time.perf_counter() - started
+
+    async def _run_session(self, client: httpx.AsyncClient, index: int) -> None:
+        session_started = time.perf_counter()
+        rng = random.Random(f"{self.args.seed}-{index}")
+        try:
+            if await self._session(client, rng):
+                self.recorder.sessions["session_total"].append(time.perf_counter() - session_started)
+            else:
+                self.recorder.failed_sessions += 1
+        except Exception as e:
+            self.recorder.failed_sessions += 1
+            self.recorder.record_error("session", f"{type(e).__name__}: {e}")
+
+    async def _session(self, client: httpx.AsyncClient, rng: random.Random) -> bool:
+        record = self.recorder.request
+        response = await record(client, "POST /api/users/onboarding", "POST", "/api/users/onboarding", json={
+            "user_name": f"부하테스트{rng.randint(1, 9999)}",
+            "user_birth_year": 1975,
+            "user_gender": "여성",
+            "family_relationship": "자녀",
+            "daily_care_hours": 8,
+            "family_member": {"nickname": "어머니", "birth_year": 1945, "gender": "여성", "dementia_stage": "초기"},
+        })
+        if response is None or not response.is_success:
+            return False
+        headers = {"X-User-Id": response.json()["user_id"]}
+
+        conversation_id = None
+        for question_number in range(1, QUESTION_COUNT + 1):
+            await record(client, "GET /api/answers/questions/{n}", "GET", f"/api/answers/questions/{question_number}", headers=headers)
+            # 질문을 읽고 녹음하는 시간
+            await asyncio.sleep(self.args.think_time * rng.uniform(0.5, 1.5))
+
+            label = f"POST /api/answers/audio (q{question_number})"
+            response = await record(
+                client, label, "POST", "/api/answers/audio",
+                headers=headers,
+                data={"question_number": str(question_number)},
+                files={"audio_file": ("answer.wav", build_wav(self.args.audio_seconds, rng), "audio/wav")},
+            )
+            if response is None or not response.is_success:
+                return False
+            body = response.json()
+            if not body.get("success"):
+                self.recorder.record_error(label, body.get("error", ""))
+                return False
+            conversation_id = body["conversation_id"]
+
+        answered_at = time.perf_counter()
+        if self.args.report_mode == "stream":
+            ready = await self._stream_report(client, headers, conversation_id)
+        else:
+            ready = await self._poll_report(client, headers, conversation_id)
+        if ready:
+            self.recorder.sessions["report_ready_after_last_answer"].append(time.perf_counter() - answered_at)
+        return ready
+
+    async def _poll_report(self, client: httpx.AsyncClient, headers: Dict[str, str], report_id: str) -> bool:
+        """202(생성 중)이면 간격을 두고 다시 조회"""
+        deadline = time.perf_counter() + self.args.report_timeout
+        while time.perf_counter() < deadline:
+            response = await self.recorder.request(client, "GET /api/reports/{id}", "GET", f"/api/reports/{report_id}", headers=headers)
+            if response is None or response.status_code not in (200, 202):
+                return False
+            if response.status_code == 200:
+                return True
+            await asyncio.sleep(self.args.report_poll_interval)
+        self.recorder.record_error("GET /api/reports/{id}", "리포트 생성 대기 시간 초과")
+        return False
+
+    async def _stream_report(self, client: httpx.AsyncClient, headers: Dict[str, str], report_id: str) -> bool:
+        """SSE 스트림에서 첫 내용 이벤트까지 시간과 done 이벤트까지 시간 기록"""
+        label = "GET /api/reports/{id}/stream"
+        started = time.perf_counter()
+        first_content_seen = False
+        try:
+            async with client.stream(
+                "GET", f"/api/reports/{report_id}/stream",
+                headers=headers, timeout=self.args.report_timeout
+            ) as response:
+                if not response.is_success:
+                    self.recorder.record_error(label, f"HTTP {response.status_code}")
+                    return False
+                async for line in response.aiter_lines():
+                    if not line.startswith("event: "):
+                        continue
+                    event = line[len("event: "):]
+                    if event in ("field", "delta", "done") and not first_content_seen:
+                        first_content_seen = True
+                        self.recorder.sessions["report_stream_first_event"].append(time.perf_counter() - started)
+                    if event == "done":
+                        self.recorder.endpoints[label].append(time.perf_counter() - started)
+                        return True
+                    if event == "error":
+                        self.recorder.record_error(label, "error 이벤트 수신")
+                        return False
+        except httpx.HTTPError as e:
+            self.recorder.record_error(label, f"{type(e).__name__}: {e}")
+            return False
+        self.recorder.record_error(label, "done 이벤트 없이 스트림 종료")
+        return False
+
+
+def start_process(module: str, arguments: List[str], env: Dict[str, str], log_path: str) -> subprocess.Popen:
+    log_file = open(log_path, "wb")
+    return subprocess.Popen(
+        [sys.executable, "-m", module, *arguments],
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+
+async def wait_until_ready(url: str, process: subprocess.Popen, log_path: str, timeout: float = 60) -> None:
+    """/health가 200을 반환할 때까지 대기 (프로세스가 먼저 종료되면 로그와 함께 실패)"""
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(timeout=2) as client:
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                with open(log_path, encoding="utf-8", errors="replace") as f:
+                    tail = f.read()[-3000:]
+                raise RuntimeError(f"하위 프로세스가 종료되었습니다 ({log_path}):\n{tail}")
+            try:
+                if (await client.get(f"{url}/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"서버 준비 대기 시간 초과: {url}")
+
+
+async def collect_server_stats(base_url: str) -> Dict[str, Any]:
+    """부하 종료 후 /metrics 히스토그램과 /stats 엔드포인트 수집"""
+    async with httpx.AsyncClient(base_url=base_url, timeout=10) as client:
+        metrics_text = (await client.get("/metrics")).text
+        stats = {}
+        for name in ("ai-providers", "rate-limits", "transcription-cache", "user-cache", "report-cache"):
+            stats[name] = (await client.get(f"/stats/{name}")).json()
+    return {
+        "stage_histograms": histogram_quantiles(metrics_text, "moa_stage_duration_seconds", ("stage",)),
+        "ai_request_histograms": histogram_quantiles(metrics_text, "moa_ai_request_duration_seconds", ("provider", "operation")),
+        "stats": stats,
+    }
+
+
+async def drop_database(mongodb_url: str, database_name: str) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    client = AsyncIOMotorClient(mongodb_url)
+    try:
+        await client.drop_database(database_name)
+    finally:
+        client.close()
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]], errors: Optional[Dict[str, int]] = None) -> None:
+    print(f"\n{title}")
+    error_header = f" {'오류':>5}" if errors is not None else ""
+    print(f"  {'이름':<44} {'건수':>6}{error_header} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, row in sorted(rows.items()):
+        if not row.get("count"):
+            continue
+        error_column = f" {errors.get(name, 0):>5}" if errors is not None else ""
+        print(
+            f"  {name:<44} {row['count']:>6}{error_column} "
+            f"{row['p50']:>9.1f} {row['p95']:>9.1f} {row['p99']:>9.1f}"
+        )
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    summary = result["summary"]
+    print("\n" + "=" * 90)
+    print(
+        f"📊 부하 테스트 결과: 세션 {summary['sessions_started']}개 (실패 {summary['sessions_failed']}), "
+        f"요청 {summary['requests']}건, 실제 {summary['achieved_rps']:.2f} RPS (목표 {summary['target_rps']})"
+    )
+    print("   (단위: ms)")
+    print_table("🌐 엔드포인트별 지연 시간", result["endpoints"], result["errors"])
+    print_table("⏱️ 요청 처리 단계 (Server-Timing)", result["stages"])
+    background = {
+        name: row for name, row in result["stage_histograms"].items() if name not in result["stages"]
+    }
+    print_table("🔄 백그라운드 단계 (/metrics 히스토그램 추정)", background)
+    print_table("🤖 AI 제공자 호출 (/metrics 히스토그램 추정)", result["ai_request_histograms"])
+    print_table("🧭 세션", result["sessions"])
+    if result["error_samples"]:
+        print("\n❌ 오류 예시")
+        for sample in result["error_samples"]:
+            print(f"  - {sample}")
+    print("=" * 90)
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    work_dir = tempfile.mkdtemp(prefix="moa-benchmark-")
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    app_url = f"http://127.0.0.1:{args.app_port}"
+    database_name = f"moa_benchmark_{uuid.uuid4().hex[:8]}"
+
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": "benchmark",
+        "OPENAI_BASE_URL": f"{fake_url}/v1",
+        "GEMINI_API_KEY": "benchmark",
+        "STORAGE_EMULATOR_HOST": fake_url,
+        "GOOGLE_APPLICATION_CREDENTIALS": "",
+        "MONGODB_URL": args.mongodb_url or "mongodb://127.0.0.1:27017",
+        "MONGODB_DATABASE": database_name,
+        "SERVER_TIMING_ENABLED": "true",
+        "AUDIO_CACHE_DIR": os.path.join(work_dir, "audio-cache"),
+    }
+    fake_args = [
+        "--port", str(args.fake_port),
+        "--chat-latency", str(args.chat_latency),
+        "--stt-latency", str(args.stt_latency),
+        "--gcs-latency", str(args.gcs_latency),
+        "--seed", str(args.seed),
+    ]
+    app_args = ["--port", str(args.app_port), "--gemini-latency", str(args.gemini_latency), "--seed", str(args.seed)]
+    if not args.mongodb_url:
+        app_args.append("--mongo-mock")
+
+    fake_log = os.path.join(work_dir, "fakes.log")
+    app_log = os.path.join(work_dir, "app.log")
+    print(f"📁 로그 디렉터리: {work_dir}")
+    fake_process = start_process("benchmarks.fakes", fake_args, env, fake_log)
+    app_process = None
+    try:
+        await wait_until_ready(fake_url, fake_process, fake_log)
+        app_process = start_process("benchmarks.app_server", app_args, env, app_log)
+        await wait_until_ready(app_url, app_process, app_log)
+        print(f"🚀 부하 시작: 목표 {args.rps} RPS, {args.duration}초, 리포트 조회 {args.report_mode}")
+
+        load_test = LoadTest(args, app_url)
+        elapsed = await load_test.run()
+        server = await collect_server_stats(app_url)
+    finally:
+        for process in (app_process, fake_process):
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=10)
+        if args.mongodb_url:
+            await drop_database(args.mongodb_url, database_name)
+
+    recorder = load_test.recorder
+    requests = sum(len(values) for values in recorder.endpoints.values())
+    return {
+        "config": {key: str(value) for key, value in vars(args).items()},
+        "summary": {
+            "target_rps": args.rps,
+            "achieved_rps": requests / elapsed if elapsed else 0.0,
+            "elapsed_seconds": round(elapsed, 2),
+            "requests": requests,
+            "sessions_started": load_test.sessions_started,
+            "sessions_failed": recorder.failed_sessions,
+        },
+        "endpoints": {name: summarize(values) for name, values in recorder.endpoints.items()},
+        "errors": dict(recorder.errors),
+        "error_samples": recorder.error_samples,
+        "stages": {name: summarize(values) for name, values in recorder.stages.items()},
+        "sessions": {name: summarize(values) for name, values in recorder.sessions.items()},
+        **server,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MoA 백엔드 부하 테스트 (외부 서비스 대체 구현 사용)")
+    parser.add_argument("--rps", type=float, default=4.0, help="목표 요청 수/초 (세션당 요청 수로 나눠 세션 도착률 계산)")
+    parser.add_argument("--duration", type=float, default=60.0, help="세션을 발생시키는 시간 (초)")
+    parser.add_argument("--seed", type=int, default=42, help="도착 간격 / 오디오 / 지연 시간 난수 시드")
+    parser.add_argument("--audio-seconds", type=float, default=20.0, help="답변 1개의 오디오 길이 (16kHz WAV)")
+    parser.add_argument("--think-time", type=float, default=2.0, help="질문 사이 평균 대기 시간 (초)")
+    parser.add_argument("--report-mode", choices=("poll", "stream"), default="poll")
+    parser.add_argument("--report-poll-interval", type=float, default=1.0)
+    parser.add_argument("--report-timeout", type=float, default=180.0)
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--chat-latency", type=LatencyProfile.parse, default=LatencyProfile(3.0, 0.4), help="OpenAI Chat 지연 '중앙값[:sigma[:오류율]]'")
+    parser.add_argument("--stt-latency", type=LatencyProfile.parse, default=LatencyProfile(1.5, 0.4), help="OpenAI Whisper 지연")
+    parser.add_argument("--gemini-latency", type=LatencyProfile.parse, default=LatencyProfile(4.0, 0.4), help="Gemini 지연")
+    parser.add_argument("--gcs-latency", type=LatencyProfile.parse, default=LatencyProfile(0.03, 0.5), help="GCS 요청당 지연")
+    parser.add_argument("--mongodb-url", default=None, help="로컬 mongod 주소 (생략 시 mongomock 사용, 실행 후 임시 DB 삭제)")
+    parser.add_argument("--fake-port", type=int, default=18081)
+    parser.add_argument("--app-port", type=int, default=18000)
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args))
+    print_report(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+워커 수 / 이벤트 루프 / HTTP 파서 조합별 처리량 측정
+
+- 조합마다 benchmarks.app_server를 새로 띄우고, 여러 클라이언트 프로세스가 keep-alive 연결로 같은 경로를 반복 요청
+- 클라이언트는 httpx 대신 asyncio 스트림으로 직접 HTTP/1.1을 주고받아 부하 생성기가 병목이 되지 않도록 함
+- 서버와 클라이언트가 같은 머신의 코어를 나눠 쓰므로 절대값보다 조합 간 비율을 비교
+
+실행: python -m benchmarks.server_scaling --workers 1,2,4 --duration 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.load_test import percentile, start_process, wait_until_ready
+
+IMPLEMENTATIONS = {
+    "asyncio+h11": ("asyncio", "h11"),
+    "uvloop+httptools": ("uvloop", "httptools"),
+}
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: bytes) -> int:
+    """요청 하나를 보내고 상태 코드 반환 (Content-Length 응답만 처리)"""
+    writer.write(request)
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head[9:12])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    if length:
+        await reader.readexactly(length)
+    return status
+
+
+async def _connection_loop(host: str, port: int, request: bytes, deadline: float, latencies: List[float], errors: List[int]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status = await _request(reader, writer, request)
+            except (OSError, asyncio.IncompleteReadError):
+                errors.append(1)
+                writer.close()
+                reader, writer = await asyncio.open_connection(host, port)
+                continue
+            if status != 200:
+                errors.append(1)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+def _client_process(host: str, port: int, path: str, connections: int, duration: float, results) -> None:
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode()
+
+    async def run():
+        latencies: List[float] = []
+        errors: List[int] = []
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            _connection_loop(host, port, request, deadline, latencies, errors)
+            for _ in range(connections)
+        ))
+        return latencies, len(errors)
+
+    results.put(asyncio.run(run()))
+
+
+def generate_load(host: str, port: int, path: str, processes: int, connections: int, duration: float) -> Tuple[List[float], int]:
+    """클라이언트 프로세스 processes개 x 연결 connections개로 duration초 동안 요청"""
+    results = multiprocessing.Queue()
+    clients = [
+        multiprocessing.Process(target=_client_process, args=(host, port, path, connections, duration, results))
+        for _ in range(processes)
+    ]
+    for client in clients:
+        client.start()
+    latencies: List[float] = []
+    errors = 0
+    for _ in clients:
+        client_latencies, client_errors = results.get()
+        latencies.extend(client_latencies)
+        errors += client_errors
+    for client in clients:
+        client.join()
+    return latencies, errors
+
+
+async def measure(args, workers: int, implementation: str, log_path: str) -> Dict[str, float]:
+    loop, http = IMPLEMENTATIONS[implementation]
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": "benchmark",
+        "GEMINI_API_KEY": "benchmark",
+        "STORAGE_EMULATOR_HOST": "http://127.0.0.1:9",
+    }
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    process = start_process(
+        "benchmarks.app_server",
+        ["--port", str(args.port), "--mongo-mock", "--workers", str(workers), "--loop", loop, "--http", http],
+        env,
+        log_path,
+    )
+    try:
+        await wait_until_ready(f"http://127.0.0.1:{args.port}", process, log_path)
+        # 모든 워커가 accept를 시작하도록 예열
+        generate_load("127.0.0.1", args.port, args.path, 1, args.connections, args.warmup)
+        latencies, errors = generate_load(
+            "127.0.0.1", args.port, args.path, args.client_processes, args.connections, args.duration
+        )
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    return {
+        "rps": len(latencies) / args.duration,
+        "p50": percentile(latencies, 0.5) * 1000 if latencies else 0.0,
+        "p99": percentile(latencies, 0.99) * 1000 if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def print_results(results: List[Tuple[int, str, Dict[str, float]]]) -> None:
+    baseline = {implementation: stats["rps"] for workers, implementation, stats in results if workers == results[0][0]}
+    print(f"\n{'workers':>7}  {'구현':<18} {'req/s':>9} {'배율':>6} {'p50(ms)':>8} {'p99(ms)':>8} {'오류':>5}")
+    for workers, implementation, stats in results:
+        ratio = stats["rps"] / baseline[implementation] if baseline.get(implementation) else 0.0
+        print(
+            f"{workers:>7}  {implementation:<18} {stats['rps']:>9.0f} {ratio:>5.2f}x "
+            f"{stats['p50']:>8.2f} {stats['p99']:>8.2f} {stats['errors']:>5}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워커 수 / 루프 / HTTP 파서별 처리량 측정")
+    parser.add_argument("--workers", default="1,2,4", help="쉼표로 구분한 워커 수 목록")
+    parser.add_argument("--implementations", default=",".join(IMPLEMENTATIONS), help="asyncio+h11, uvloop+httptools")
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=2)
+    parser.add_argument("--connections", type=int, default=32, help="클라이언트 프로세스당 keep-alive 연결 수")
+    parser.add_argument("--client-processes", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--port", type=int, default=18020)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="moa-scaling-")
+    print(f"📁 로그 디렉터리: {work_dir} (CPU 코어 {os.cpu_count()}개, 클라이언트 프로세스 {args.client_processes}개)")
+    results = []
+    for workers in [int(value) for value in args.workers.split(",")]:
+        for implementation in args.implementations.split(","):
+            log_path = os.path.join(work_dir, f"app-{workers}-{implementation}.log")
+            stats = asyncio.run(measure(args, workers, implementation, log_path))
+            print(f"⏱️ workers={workers} {implementation}: {stats['rps']:.0f} req/s, p99 {stats['p99']:.2f}ms")
+            results.append((workers, implementation, stats))
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+애플리케이션 import 시간 / 콜드 스타트 측정
+
+- import: 새 프로세스에서 `import app.main`에 걸린 시간
+- ready: 서버 프로세스 시작부터 /health가 200을 반환할 때까지 시간 (lifespan 포함)
+- first_request: 준비 직후 첫 API 요청 시간 (지연 생성되는 서비스 / 클라이언트 초기화 포함)
+
+GCS는 STORAGE_EMULATOR_HOST로 대체 서버를 가리키므로 자격 증명 조회 비용은 포함되지 않습니다.
+실제 자격 증명 환경에서 측정하려면 --real-gcs를 사용하세요.
+
+실행: python -m benchmarks.startup --runs 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.load_test import start_process, wait_until_ready
+
+IMPORT_SNIPPET = "import time; started = time.perf_counter(); import app.main; print(time.perf_counter() - started)"
+
+
+def measure_import(env: Dict[str, str]) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+async def measure_cold_start(env: Dict[str, str], port: int, log_path: str) -> Dict[str, float]:
+    started = time.perf_counter()
+    process = start_process("benchmarks.app_server", ["--port", str(port), "--mongo-mock"], env, log_path)
+    try:
+        url = f"http://127.0.0.1:{port}"
+        await wait_until_ready(url, process, log_path)
+        ready = time.perf_counter() - started
+        async with httpx.AsyncClient(base_url=url, timeout=30) as client:
+            request_started = time.perf_counter()
+            await client.get("/api/answers/questions", headers={"X-User-Id": "startup-benchmark"})
+            first_request = time.perf_counter() - request_started
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {"ready": ready, "first_request": first_request}
+
+
+def print_summary(name: str, values: List[float]) -> None:
+    print(
+        f"  {name:<14} 중앙값 {statistics.median(values) * 1000:8.1f}ms  "
+        f"최소 {min(values) * 1000:8.1f}ms  최대 {max(values) * 1000:8.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="import 시간 / 콜드 스타트 측정")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=18010)
+    parser.add_argument("--real-gcs", action="store_true", help="STORAGE_EMULATOR_HOST를 설정하지 않음")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="moa-startup-")
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": "benchmark",
+        "GEMINI_API_KEY": "benchmark",
+        "AUDIO_CACHE_DIR": os.path.join(work_dir, "audio-cache"),
+    }
+    if not args.real_gcs:
+        # 연결하지 않는 주소 (클라이언트 생성 비용만 측정)
+        env["STORAGE_EMULATOR_HOST"] = "http://127.0.0.1:9"
+        env["GOOGLE_APPLICATION_CREDENTIALS"] = ""
+
+    imports, readies, first_requests = [], [], []
+    for run in range(args.runs):
+        imports.append(measure_import(env))
+        cold_start = asyncio.run(measure_cold_start(env, args.port, os.path.join(work_dir, f"app-{run}.log")))
+        readies.append(cold_start["ready"])
+        first_requests.append(cold_start["first_request"])
+        print(f"⏱️ {run + 1}/{args.runs}: import {imports[-1]:.3f}s, ready {readies[-1]:.3f}s, 첫 요청 {first_requests[-1]:.3f}s")
+
+    print(f"\n📊 시작 시간 ({args.runs}회)")
+    print_summary("import", imports)
+    print_summary("ready", readies)
+    print_summary("first_request", first_requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,22 @@ MoA Backend - 치매 부양자를 위한 감정 분석 및 위로 메시지 제
 """
 
 import uvicorn
+
+import app.core.logger  # noqa: F401
 from app.core.config import settings
+from app.core.server import (
+    APP_IMPORT_STRING,
+    build_server_options,
+    log_server_options,
+    prepare_multiprocess_metrics,
+)
 
 def main():
-    """애플리케이션 실행"""
-    uvicorn.run(
-        "app.main:app",
-        host=settings.HOST,
-        port=settings.PORT,
-        reload=settings.DEBUG,
-        reload_dirs=["./app"] if settings.DEBUG else None
-    )
+    """애플리케이션 실행 (DEBUG면 자동 재시작, 아니면 WORKERS 개수만큼 프로세스 실행)"""
+    options = build_server_options(settings)
+    prepare_multiprocess_metrics(options.get("workers", 1), settings.PORT)
+    log_server_options(options)
+    uvicorn.run(APP_IMPORT_STRING, **options)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+복합 AI 클라이언트 / 제공자 서킷 브레이커 테스트
+가짜 제공자와 가짜 시계로 서킷 전환, 시험 요청 소비, 헤징, 나머지 요청 취소를 확인합니다.
+
+실행: python -m pytest test_composite_client.py
+"""
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+import sys
+sys.path.append('.')
+
+import pytest
+
+from app.core.config import settings
+from app.external.ai import composite
+from app.external.ai.base import AIClient
+from app.external.ai.composite import CompositeAIClient, ProviderHealth
+
+pytestmark = pytest.mark.anyio
+
+COOLDOWN = 30.0
+
+
+class FakeClock:
+    """composite 모듈의 time 대신 사용하는 시계 (이벤트 루프 시간에는 영향 없음)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeClient(AIClient):
+    """지정한 시간만큼 기다린 뒤 응답하거나 실패하는 제공자"""
+
+    def __init__(self, name: str, delay: float = 0.0, error: Optional[Exception] = None, chunks: int = 3):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.chunks = chunks
+        self.calls = 0
+        self.started_at: List[float] = []
+        self.cancelled = False
+        self.closed = False
+
+    async def _respond(self) -> None:
+        self.calls += 1
+        self.started_at.append(asyncio.get_running_loop().time())
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+
+    async def generate_content(self, prompt: str) -> str:
+        await self._respond()
+        return self.name
+
+    async def generate_content_stream(self, prompt: str, response_model=None) -> AsyncIterator[str]:
+        try:
+            await self._respond()
+            for index in range(self.chunks):
+                yield f"{self.name}-{index}"
+        finally:
+            self.closed = True
+
+    async def generate_structured_content(self, prompt, expected_format="json", response_model=None):
+        return {"provider": await self.generate_content(prompt)}
+
+    def is_available(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(composite, "time", fake)
+    monkeypatch.setattr(settings, "AI_CIRCUIT_MIN_REQUESTS", 4)
+    monkeypatch.setattr(settings, "AI_CIRCUIT_ERROR_RATE", 0.5)
+    monkeypatch.setattr(settings, "AI_CIRCUIT_SLOW_CALL_SECONDS", 45.0)
+    monkeypatch.setattr(settings, "AI_CIRCUIT_COOLDOWN_SECONDS", COOLDOWN)
+    monkeypatch.setattr(settings, "AI_HEDGE_ENABLED", False)
+    return fake
+
+
+@pytest.fixture
+def hedging(monkeypatch, clock):
+    monkeypatch.setattr(settings, "AI_HEDGE_ENABLED", True)
+    monkeypatch.setattr(settings, "AI_HEDGE_QUANTILE", 0.9)
+    monkeypatch.setattr(settings, "AI_HEDGE_DEFAULT_DELAY_SECONDS", 10.0)
+    monkeypatch.setattr(settings, "AI_HEDGE_MIN_DELAY_SECONDS", 0.0)
+    return clock
+
+
+def _open_circuit(health: ProviderHealth) -> None:
+    for _ in range(settings.AI_CIRCUIT_MIN_REQUESTS):
+        health.record(0.1, False)
+    assert health.state == ProviderHealth.OPEN
+
+
+def _seed_latencies(health: ProviderHealth, latencies: List[float]) -> None:
+    for latency in latencies:
+        health.record(latency, True)
+
+
+def test_circuit_opens_on_error_rate(clock):
+    health = ProviderHealth("a")
+    health.record(0.1, True)
+    health.record(0.1, False)
+    health.record(0.1, False)
+    assert health.state == ProviderHealth.CLOSED  # 표본 부족
+
+    health.record(0.1, True)
+    assert health.state == ProviderHealth.OPEN
+    assert not health.may_allow()
+    assert not health.allow_request()
+
+
+def test_slow_calls_count_as_failures(clock):
+    health = ProviderHealth("a")
+    for _ in range(settings.AI_CIRCUIT_MIN_REQUESTS):
+        health.record(settings.AI_CIRCUIT_SLOW_CALL_SECONDS + 1, True)
+    assert health.state == ProviderHealth.OPEN
+    assert health.latency_quantile(0.5) is None
+
+
+def test_half_open_probe_closes_circuit(clock):
+    health = ProviderHealth("a")
+    _open_circuit(health)
+
+    clock.advance(COOLDOWN)
+    assert health.may_allow()
+    assert health.state == ProviderHealth.OPEN  # 확인만으로는 상태가 바뀌지 않음
+
+    assert health.allow_request()
+    assert health.state == ProviderHealth.HALF_OPEN
+    assert not health.allow_request()  # 시험 요청은 1건만
+
+    health.record(0.2, True)
+    assert health.state == ProviderHealth.CLOSED
+    assert health.error_rate() == 0.0
+
+
+def test_half_open_failure_reopens_circuit(clock):
+    health = ProviderHealth("a")
+    _open_circuit(health)
+    clock.advance(COOLDOWN)
+    assert health.allow_request()
+
+    health.record(0.2, False)
+    assert health.state == ProviderHealth.OPEN
+    assert not health.may_allow()
+    clock.advance(COOLDOWN)
+    assert health.may_allow()
+
+
+def test_abandoned_probe_is_allowed_again_after_cooldown(clock):
+    health = ProviderHealth("a")
+    _open_circuit(health)
+    clock.advance(COOLDOWN)
+    assert health.allow_request()
+
+    clock.advance(COOLDOWN - 1)
+    assert not health.may_allow()
+    clock.advance(1)
+    assert health.allow_request()
+
+
+async def test_probe_is_consumed_only_by_dispatched_provider(clock):
+    client = CompositeAIClient({"a": FakeClient("a"), "b": FakeClient("b")})
+    _open_circuit(client.health["a"])
+    _open_circuit(client.health["b"])
+    clock.advance(COOLDOWN)
+
+    assert await client.generate_content("prompt") == "a"
+    assert client.health["a"].state == ProviderHealth.CLOSED
+    assert client.health["b"].state == ProviderHealth.OPEN
+    assert client.providers["b"].calls == 0
+    assert client.health["b"].allow_request()  # b의 시험 요청은 그대로 남아 있음
+
+
+async def test_fallback_consumes_probe_of_next_provider(clock):
+    client = CompositeAIClient({"a": FakeClient("a", error=RuntimeError("down")), "b": FakeClient("b")})
+    _open_circuit(client.health["b"])
+    clock.advance(COOLDOWN)
+
+    assert await client.generate_content("prompt") == "b"
+    assert client.health["b"].state == ProviderHealth.CLOSED
+    assert client.health["a"].snapshot()["window_size"] == 1
+    assert client.health["b"].served == 1
+
+
+async def test_all_circuits_open_still_tries_without_changing_state(clock):
+    client = CompositeAIClient({"a": FakeClient("a"), "b": FakeClient("b")})
+    _open_circuit(client.health["a"])
+    _open_circuit(client.health["b"])
+
+    assert await client.generate_content("prompt") == "a"
+    assert client.health["a"].state == ProviderHealth.OPEN
+    assert client.health["b"].state == ProviderHealth.OPEN
+
+
+async def test_routes_to_lowest_p50(clock):
+    client = CompositeAIClient({"a": FakeClient("a"), "b": FakeClient("b")})
+    _seed_latencies(client.health["a"], [2.0] * 4)
+    _seed_latencies(client.health["b"], [1.0] * 4)
+
+    assert await client.generate_content("prompt") == "b"
+    assert client.providers["a"].calls == 0
+
+
+async def test_hedge_fires_at_p90_and_cancels_loser(hedging):
+    slow, fast = FakeClient("a", delay=5.0), FakeClient("b", delay=0.0)
+    client = CompositeAIClient({"a": slow, "b": fast})
+    # p50 0.01s (라우팅 1순위), p90 0.15s
+    _seed_latencies(client.health["a"], [0.01] * 9 + [0.15])
+    assert client._hedge_delay("a") == pytest.approx(0.15)
+
+    assert await asyncio.wait_for(client.generate_content("prompt"), timeout=2) == "b"
+
+    delay = fast.started_at[0] - slow.started_at[0]
+    assert 0.15 <= delay < 0.15 + 0.5
+    assert slow.cancelled
+    assert client.health["b"].hedged == 1
+    assert client.health["b"].served == 1
+    # 취소된 요청은 기록하지 않음
+    assert client.health["a"].snapshot()["window_size"] == 10
+
+
+async def test_no_hedge_when_primary_answers_within_p90(hedging):
+    primary, secondary = FakeClient("a", delay=0.01), FakeClient("b")
+    client = CompositeAIClient({"a": primary, "b": secondary})
+    _seed_latencies(client.health["a"], [0.01] * 9 + [0.5])
+
+    assert await client.generate_content("prompt") == "a"
+    assert secondary.calls == 0
+    assert client.health["b"].hedged == 0
+
+
+async def test_stream_hedges_on_first_chunk_and_closes_loser(hedging):
+    slow, fast = FakeClient("a", delay=5.0), FakeClient("b", delay=0.0)
+    client = CompositeAIClient({"a": slow, "b": fast})
+    _seed_latencies(client.health["a"], [0.01] * 9 + [0.1])
+
+    async def collect() -> List[str]:
+        return [chunk async for chunk in client.generate_content_stream("prompt")]
+
+    assert await asyncio.wait_for(collect(), timeout=2) == ["b-0", "b-1", "b-2"]
+    assert slow.cancelled and slow.closed
+    assert fast.closed
+    assert client.health["b"].hedged == 1
+
+
+async def test_stream_falls_over_before_first_chunk(clock):
+    client = CompositeAIClient({"a": FakeClient("a", error=RuntimeError("down")), "b": FakeClient("b")})
+
+    chunks = [chunk async for chunk in client.generate_content_stream("prompt")]
+    assert chunks == ["b-0", "b-1", "b-2"]
+    assert client.health["a"].error_rate() == 1.0
+    assert client.health["b"].served == 1
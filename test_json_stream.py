@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+스트리밍 JSON 증분 파서 / JSON 추출 테스트
+
+실행: python -m pytest test_json_stream.py
+"""
+import json
+
+import sys
+sys.path.append('.')
+
+import pytest
+
+from app.utils.json_stream import IncrementalJSONParser, JSONStreamEvent, extract_json_object
+
+DOCUMENT = {
+    "daily_summary": "산책한 하루 \"따뜻함\"",
+    "emotion_score": 72,
+    "emotion_analysis": {"stress": 40, "resilience": 70, "stability": 65},
+    "tags": [1, 2.5, True, None, []],
+    "letter": "수고하셨어요 😊\n내일도 응원할게요.",
+}
+
+
+def _parse(text: str, piece_size: int = 1, stream_fields=()) -> IncrementalJSONParser:
+    parser = IncrementalJSONParser(stream_fields)
+    for start in range(0, len(text), piece_size):
+        parser.feed(text[start:start + piece_size])
+    return parser
+
+
+@pytest.mark.parametrize("piece_size", [1, 7, 1000])
+def test_parser_matches_json_loads(piece_size):
+    text = "```json\n" + json.dumps(DOCUMENT, ensure_ascii=True, indent=2) + "\n```"
+    parser = _parse(text, piece_size)
+    assert parser.done
+    assert parser.value == DOCUMENT
+
+
+def test_parser_streams_field_deltas():
+    parser = IncrementalJSONParser(stream_fields=["letter"])
+    events = []
+    text = json.dumps(DOCUMENT, ensure_ascii=False)
+    for start in range(0, len(text), 5):
+        events.extend(parser.feed(text[start:start + 5]))
+
+    deltas = [event.value for event in events if event.kind == JSONStreamEvent.DELTA]
+    assert "".join(deltas) == DOCUMENT["letter"]
+    values = {event.path: event.value for event in events if event.kind == JSONStreamEvent.VALUE}
+    assert values["emotion_analysis.stress"] == 40
+    assert values[""] == DOCUMENT
+
+
+@pytest.mark.parametrize("text", [
+    '{"a" "b"}',
+    '{"a":1,,,"b"::2}',
+    '{"a":1 "b":2}',
+    '{"a"::1}',
+    '{"a":1,}',
+    '{,"a":1}',
+    '{"a":}',
+    '{"a"}',
+    '{1:2}',
+    '{"a":1]',
+    '[1 2]',
+    '[1,,2]',
+    '[1,]',
+    '[,1]',
+    '["a":1]',
+])
+def test_parser_rejects_malformed_separators(text):
+    with pytest.raises(ValueError):
+        _parse(text)
+
+
+@pytest.mark.parametrize("text", ['{"a":tru}', '[01x]'])
+def test_parser_rejects_malformed_scalars(text):
+    with pytest.raises(ValueError):
+        _parse(text)
+
+
+@pytest.mark.parametrize("text", ['{}', '[]', '{"a":{}}', '{"a":[]}', '[[],{}]'])
+def test_parser_accepts_empty_containers(text):
+    assert _parse(text).value == json.loads(text)
+
+
+def test_extract_json_object_skips_surrounding_text():
+    text = "설명입니다 {잘못된 부분} 그리고 ```json\n" + json.dumps(DOCUMENT, ensure_ascii=False) + "\n``` 끝"
+    assert extract_json_object(text) == DOCUMENT
+
+
+def test_extract_json_object_rejects_malformed():
+    for text in ('{"a" "b"}', '{"a":1,,,"b"::2}', "JSON 없음", ""):
+        with pytest.raises(ValueError):
+            extract_json_object(text)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+클라이언트 측 속도 제한기 테스트
+토큰 버킷 보충, 대기열 시간 초과, 429 / 일시적 오류 재시도, 스트리밍 사용량 보정,
+복합 클라이언트 지연 시간에서 대기열 시간 제외를 확인합니다.
+
+실행: python -m pytest test_rate_limiter.py
+"""
+import asyncio
+from types import SimpleNamespace
+from typing import List, Optional
+
+import sys
+sys.path.append('.')
+
+import httpx
+import openai
+import pytest
+
+from app.core.config import settings
+from app.external import rate_limiter as rate_limiter_module
+from app.external.ai import openai as openai_module
+from app.external.ai.base import AIClient
+from app.external.ai.composite import CompositeAIClient
+from app.external.rate_limiter import RateLimiter, TokenBucket, get_queue_wait_seconds
+
+pytestmark = pytest.mark.anyio
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+class FakeClock:
+    """rate_limiter 모듈의 time 대신 사용하는 시계 (이벤트 루프 시간에는 영향 없음)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter_module, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def retries(monkeypatch):
+    """지터 없이 짧은 백오프"""
+    monkeypatch.setattr(rate_limiter_module.random, "random", lambda: 0.0)
+    monkeypatch.setattr(settings, "RATE_LIMIT_RETRY_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "RATE_LIMIT_MAX_RETRIES", 2)
+    monkeypatch.setattr(settings, "AI_MAX_RETRIES", 2)
+    monkeypatch.setattr(settings, "RATE_LIMIT_MAX_QUEUE_SECONDS", 5.0)
+
+
+def _rate_limit_error(headers: Optional[dict] = None) -> openai.RateLimitError:
+    response = httpx.Response(429, headers=headers or {}, request=REQUEST)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+def _failing(errors: List[Exception], result: str = "ok"):
+    """errors를 차례로 발생시킨 뒤 result를 반환하는 호출 (호출 시각 기록)"""
+    calls: List[float] = []
+
+    async def operation():
+        calls.append(asyncio.get_running_loop().time())
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return operation, calls
+
+
+def test_bucket_refills_at_per_minute_rate(clock):
+    bucket = TokenBucket(60)
+    bucket.consume(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+
+    clock.advance(0.5)
+    assert bucket.wait_time(1) == pytest.approx(0.5)
+    clock.advance(0.5)
+    assert bucket.wait_time(1) == 0.0
+
+    clock.advance(3600)
+    bucket.wait_time(1)
+    assert bucket.tokens == 60  # 용량 이상으로 쌓이지 않음
+
+
+def test_bucket_lets_oversized_request_through_when_full(clock):
+    bucket = TokenBucket(60)
+    assert bucket.wait_time(1000) == 0.0
+    bucket.consume(1000)
+    assert bucket.tokens == 0
+    assert bucket.wait_time(1000) == pytest.approx(60.0)
+
+
+def test_bucket_refund_is_capped_and_can_charge_extra(clock):
+    bucket = TokenBucket(100)
+    bucket.consume(80)
+    bucket.refund(50)
+    assert bucket.tokens == 70
+    bucket.refund(-20)
+    assert bucket.tokens == 50
+    bucket.refund(1000)
+    assert bucket.tokens == 100
+
+
+def test_unlimited_bucket_never_waits(clock):
+    bucket = TokenBucket(0)
+    bucket.consume(10 ** 6)
+    assert bucket.unlimited
+    assert bucket.wait_time(10 ** 6) == 0.0
+
+
+async def test_queue_timeout_does_not_call_operation(monkeypatch, retries):
+    monkeypatch.setattr(settings, "RATE_LIMIT_MAX_QUEUE_SECONDS", 0.05)
+    limiter = RateLimiter("test", requests_per_minute=1)
+    await limiter.run(_failing([])[0])
+
+    operation, calls = _failing([])
+    with pytest.raises(asyncio.TimeoutError):
+        await limiter.run(operation)
+    assert calls == []
+    assert limiter.waiting == 0
+    assert limiter.in_flight == 0
+
+
+async def test_rate_limit_retries_with_exponential_backoff(monkeypatch, retries):
+    limiter = RateLimiter("test", requests_per_minute=0)
+    blocked: List[float] = []
+    block_for = limiter.block_for
+    monkeypatch.setattr(limiter, "block_for", lambda seconds: (blocked.append(seconds), block_for(seconds)))
+
+    operation, calls = _failing([_rate_limit_error(), _rate_limit_error()])
+    assert await limiter.run(operation) == "ok"
+    assert len(calls) == 3
+    assert blocked == pytest.approx([0.01, 0.02])
+    assert limiter.throttled == 2
+
+
+async def test_rate_limit_gives_up_after_max_retries(retries):
+    limiter = RateLimiter("test", requests_per_minute=0)
+    operation, calls = _failing([_rate_limit_error()] * 10)
+    with pytest.raises(openai.RateLimitError):
+        await limiter.run(operation)
+    assert len(calls) == settings.RATE_LIMIT_MAX_RETRIES + 1
+    assert limiter.in_flight == 0
+
+
+async def test_rate_limit_honours_retry_after(monkeypatch, retries):
+    limiter = RateLimiter("test", requests_per_minute=0)
+    blocked: List[float] = []
+    block_for = limiter.block_for
+    monkeypatch.setattr(limiter, "block_for", lambda seconds: (blocked.append(seconds), block_for(seconds)))
+
+    operation, calls = _failing([_rate_limit_error({"retry-after-ms": "30"})])
+    assert await limiter.run(operation) == "ok"
+    assert blocked == pytest.approx([0.03])
+    assert calls[1] - calls[0] >= 0.03
+
+
+async def test_transient_errors_retry_only_this_request(retries):
+    limiter = RateLimiter("test", requests_per_minute=0)
+    operation, calls = _failing([
+        openai.APIConnectionError(request=REQUEST),
+        openai.APIConnectionError(request=REQUEST),
+    ])
+    assert await limiter.run(operation) == "ok"
+    assert len(calls) == 3
+    assert calls[1] - calls[0] >= 0.01
+    assert calls[2] - calls[1] >= 0.02
+    assert limiter.throttled == 0
+
+    operation, calls = _failing([openai.APIConnectionError(request=REQUEST)] * 10)
+    with pytest.raises(openai.APIConnectionError):
+        await limiter.run(operation)
+    assert len(calls) == settings.AI_MAX_RETRIES + 1
+
+
+async def test_streamed_usage_refunds_reserved_tokens(monkeypatch):
+    limiter = RateLimiter("test", requests_per_minute=0, tokens_per_minute=100000)
+
+    class FakeCompletions:
+        async def create(self, **params):
+            assert params["stream_options"] == {"include_usage": True}
+
+            async def chunks():
+                for text in ("안녕", "하세요"):
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None)
+                yield SimpleNamespace(choices=[], usage=SimpleNamespace(total_tokens=120))
+
+            return chunks()
+
+    fake_openai = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+    monkeypatch.setattr(openai_module, "get_async_openai_client", lambda: fake_openai)
+    monkeypatch.setattr(openai_module, "get_chat_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-key")
+
+    client = openai_module.OpenAIClient()
+    chunks = [chunk async for chunk in client.generate_content_stream("프롬프트")]
+
+    assert "".join(chunks) == "안녕하세요"
+    # max_tokens 기준으로 예약한 토큰 중 실제 사용량(120)을 제외한 나머지가 반환됨
+    assert limiter.tokens.tokens == pytest.approx(100000 - 120, abs=1)
+
+
+class QueuedClient(AIClient):
+    """속도 제한 대기열을 거쳐 바로 응답하는 제공자"""
+
+    def __init__(self, limiter: RateLimiter):
+        self.limiter = limiter
+
+    async def generate_content(self, prompt: str) -> str:
+        async def request():
+            return "ok"
+        return await self.limiter.run(request)
+
+    async def generate_structured_content(self, prompt, expected_format="json", response_model=None):
+        return {}
+
+    def is_available(self) -> bool:
+        return True
+
+
+async def test_composite_latency_excludes_queue_wait(monkeypatch):
+    monkeypatch.setattr(settings, "AI_CIRCUIT_MIN_REQUESTS", 1)
+    monkeypatch.setattr(settings, "AI_HEDGE_ENABLED", False)
+    limiter = RateLimiter("test", requests_per_minute=600)  # 0.1초마다 1건
+    limiter.requests.consume(limiter.requests.capacity)
+    client = CompositeAIClient({"a": QueuedClient(limiter)})
+
+    queued_before = get_queue_wait_seconds()
+    assert await client.generate_content("prompt") == "ok"
+    assert limiter.total_wait_seconds >= 0.09
+    assert client.health["a"].latency_quantile(0.5) < 0.05
+    assert get_queue_wait_seconds() == queued_before  # 호출 태스크 밖으로 새지 않음
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+리포트 목록 조회 쿼리 실행 계획(explain) 검증 테스트
+(MONGODB_URL의 MongoDB에 연결할 수 없으면 건너뜁니다)
+
+실행: python -m pytest test_report_query_plan.py
+"""
+import uuid
+from datetime import date
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import sys
+sys.path.append('.')
+
+import pytest
+
+from app.core.constants import Defaults
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.models.models import Report
+from app.schemas.reports import ConversationReport, ConversationReportEmotion
+from app.services.report import ReportService
+
+pytestmark = pytest.mark.anyio
+
+_mongo_unavailable = None
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def mongo():
+    global _mongo_unavailable
+    if _mongo_unavailable:
+        pytest.skip(_mongo_unavailable)
+    try:
+        await connect_to_mongo()
+    except Exception as e:
+        _mongo_unavailable = f"MongoDB에 연결할 수 없습니다: {type(e).__name__}"
+        pytest.skip(_mongo_unavailable)
+    try:
+        yield
+    finally:
+        await close_mongo_connection()
+
+
+@pytest.fixture
+async def user_reports(mongo):
+    """2025년 1월 리포트 3개를 가진 테스트 사용자"""
+    user_id = f"explain-test-{uuid.uuid4()}"
+    for day in (3, 10, 17):
+        await Report(
+            user_id=user_id,
+            report_date=date(2025, 1, day),
+            report=ConversationReport(
+                letter="",
+                actions="",
+                emotion_score=50,
+                daily_summary="",
+                emotion_analysis=ConversationReportEmotion(stress=50, resilience=50, stability=50)
+            )
+        ).insert()
+    try:
+        yield user_id
+    finally:
+        await Report.find(Report.user_id == user_id).delete()
+
+
+def _collect_stages(plan: dict) -> list:
+    """실행 계획 트리의 stage 이름을 모두 수집"""
+    stages = [plan.get("stage")]
+    for child_key in ("inputStage", "queryPlan"):
+        if child_key in plan:
+            stages.extend(_collect_stages(plan[child_key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_collect_stages(child))
+    return stages
+
+
+@pytest.mark.parametrize("cursor", [None, "2025-01-10"])
+async def test_report_listing_is_covered_query(user_reports, cursor):
+    """API와 같은 쿼리 / 커서로 월별 리포트 목록이 인덱스만으로 처리되는지 (FETCH, SORT 없음) 확인"""
+    service = ReportService()
+    query = service._build_report_list_query(user_reports, 2025, 1, cursor=cursor)
+    explain = await service._report_list_cursor(query, Defaults.REPORT_PAGE_SIZE + 1).explain()
+
+    stages = _collect_stages(explain["queryPlanner"]["winningPlan"])
+    assert "IXSCAN" in stages, f"인덱스 범위 스캔이 아닙니다: {stages}"
+    assert "FETCH" not in stages, f"covered query가 아닙니다 (FETCH 발생): {stages}"
+    assert "SORT" not in stages, f"인메모리 정렬이 발생했습니다: {stages}"
+    assert explain["executionStats"]["totalDocsExamined"] == 0, "문서를 직접 읽었습니다."
+
+
+async def test_report_listing_total_count_ignores_cursor(user_reports):
+    """total_count는 페이지와 무관하게 조회 기간 전체 리포트 수"""
+    service = ReportService()
+    first_page = await service.get_user_reports(user_reports, 2025, 1, limit=2)
+    second_page = await service.get_user_reports(user_reports, 2025, 1, cursor=first_page["next_cursor"], limit=2)
+
+    assert [page["total_count"] for page in (first_page, second_page)] == [3, 3]
+    assert len(first_page["reports"]) == 2 and len(second_page["reports"]) == 1
+    assert second_page["next_cursor"] is None
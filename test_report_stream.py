@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+리포트 SSE 스트림 테스트
+워커가 이미 생성 중인 리포트도 done 이전에 field / delta 이벤트가 전달되는지 확인합니다.
+(mongomock-motor가 없으면 건너뜁니다)
+
+실행: python -m pytest test_report_stream.py
+"""
+import asyncio
+import json
+from datetime import date
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Type
+
+import sys
+sys.path.append('.')
+
+import pytest
+from pydantic import BaseModel
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from app.core import database
+from app.core.config import settings
+from app.core.container import close_container
+from app.external.ai.base import AIClient
+from app.external.ai.client import AIClientFactory
+from app.models.models import Conversation
+from app.schemas.common import ReportStatus
+from app.services.report_job import get_report_job_service
+from app.services.report_progress import ReportProgressHub
+from app.services.report_stream import get_report_stream_service
+
+pytestmark = pytest.mark.anyio
+
+REPORT = {
+    "daily_summary": "어머니와 산책하며 웃은 하루",
+    "emotion_score": 72,
+    "emotion_analysis": {"stress": 40, "resilience": 70, "stability": 65},
+    "actions": "저녁에 10분 정도 가벼운 스트레칭을 해 보세요.",
+    "letter": "오늘도 어머니 곁을 지킨 당신, 정말 수고 많으셨어요. 내일도 응원할게요.",
+}
+
+
+class SlowStreamingClient(AIClient):
+    """리포트 JSON을 작은 조각으로 나눠 천천히 보내는 AI 클라이언트"""
+
+    def __init__(self, delay: float = 0.02, piece_size: int = 12):
+        self.delay = delay
+        self.piece_size = piece_size
+        # 다음 스트림의 세 번째 조각을 보내기 전에 한 번 실행할 작업 (생성 도중 재등록 재현용)
+        self.interrupt: Optional[Callable[[], Awaitable[None]]] = None
+
+    async def generate_content(self, prompt: str) -> str:
+        return json.dumps(REPORT, ensure_ascii=False)
+
+    async def generate_content_stream(
+        self,
+        prompt: str,
+        response_model: Optional[Type[BaseModel]] = None
+    ) -> AsyncIterator[str]:
+        text = json.dumps(REPORT, ensure_ascii=False)
+        for index, start in enumerate(range(0, len(text), self.piece_size)):
+            await asyncio.sleep(self.delay)
+            if index == 2 and self.interrupt is not None:
+                interrupt, self.interrupt = self.interrupt, None
+                await interrupt()
+            yield text[start:start + self.piece_size]
+
+    async def generate_structured_content(self, prompt, expected_format="json", response_model=None):
+        return REPORT
+
+    def is_available(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def ai_client():
+    return SlowStreamingClient()
+
+
+@pytest.fixture
+async def report_jobs(monkeypatch, ai_client):
+    """mongomock 위의 리포트 작업 서비스 (워커는 시작하지 않음)"""
+    monkeypatch.setattr(database, "AsyncIOMotorClient", mongomock_motor.AsyncMongoMockClient)
+    monkeypatch.setattr(AIClientFactory, "_instances", {settings.AI_CLIENT_TYPE: ai_client})
+    monkeypatch.setattr(settings, "REPORT_STREAM_POLL_INTERVAL", 0.05)
+    monkeypatch.setattr(settings, "REPORT_STREAM_PROGRESS_INTERVAL", 0.0)
+    await database.connect_to_mongo()
+    report_job_service = get_report_job_service()
+    try:
+        yield report_job_service
+    finally:
+        await report_job_service.stop(drain_timeout=1)
+        await close_container()
+        await database.close_mongo_connection()
+
+
+@pytest.fixture
+async def services(report_jobs):
+    report_jobs.start(worker_count=1)
+    return report_jobs
+
+
+async def _create_pending_report(report_job_service) -> Conversation:
+    """리포트 대기 상태의 Conversation과 작업 등록"""
+    conversation = Conversation(
+        user_id="stream-test",
+        conversation_date=date(2025, 1, 1),
+        user_message="Q1: 오늘 어떠셨나요?\nA1: 어머니와 산책했어요.",
+        ai_sentiment="neutral",
+        ai_score=50,
+        ai_comfort_message="",
+        report_status=ReportStatus.PENDING,
+    )
+    await conversation.insert()
+    await report_job_service.enqueue(conversation)
+    return conversation
+
+
+async def _enqueue_running_report(report_job_service) -> Conversation:
+    """리포트 작업을 등록하고 워커가 가져갈 때까지 대기"""
+    conversation = await _create_pending_report(report_job_service)
+    for _ in range(100):
+        state = await Conversation.get(conversation.id)
+        if state.report_status == ReportStatus.RUNNING:
+            return conversation
+        await asyncio.sleep(0.01)
+    raise AssertionError("워커가 작업을 가져가지 않았습니다.")
+
+
+async def _collect_events(stream_service, conversation: Conversation) -> List[Tuple[str, dict]]:
+    stream = await stream_service.open_stream(user_id=conversation.user_id, report_id=str(conversation.id))
+    events = []
+    async for message in stream:
+        if message.startswith(":"):
+            continue
+        name, data = message.strip().split("\n", 1)
+        events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def _assert_content_before_done(events: List[Tuple[str, dict]]) -> None:
+    names = [name for name, _ in events]
+    assert names[-1] == "done", names
+    content = [index for index, name in enumerate(names) if name in ("field", "delta")]
+    assert content and content[0] < names.index("done"), names
+
+    deltas = "".join(data["text"] for name, data in events if name == "delta" and data["field"] == "letter")
+    assert deltas == REPORT["letter"]
+    fields = {data["field"]: data["value"] for name, data in events if name == "field"}
+    assert fields["emotion_score"] == REPORT["emotion_score"]
+    assert events[-1][1]["letter"] == REPORT["letter"]
+
+
+async def test_stream_relays_progress_from_worker_in_same_process(services):
+    """워커가 먼저 가져간 작업도 진행 상황 허브를 통해 field / delta 이벤트가 done보다 먼저 도착"""
+    conversation = await _enqueue_running_report(services)
+    events = await _collect_events(get_report_stream_service(), conversation)
+    _assert_content_before_done(events)
+
+
+async def test_stream_relays_progress_from_other_worker_process(services):
+    """다른 워커 프로세스(허브에 없음)가 생성 중이면 ReportJob.progress를 폴링해 전달"""
+    conversation = await _enqueue_running_report(services)
+    stream_service = get_report_stream_service()
+    stream_service.progress_hub = ReportProgressHub()
+    events = await _collect_events(stream_service, conversation)
+    _assert_content_before_done(events)
+
+
+async def test_stream_follows_new_job_when_lease_is_lost(report_jobs, ai_client):
+    """스트림이 생성하던 작업이 재등록(답변 재제출)되면 저장하지 않고 새 작업을 이어서 전달"""
+    conversation = await _create_pending_report(report_jobs)
+
+    async def resubmit():
+        await conversation.set_fields({"report_status": ReportStatus.PENDING})
+        await report_jobs.enqueue(conversation)
+        report_jobs.start(worker_count=1)
+
+    ai_client.interrupt = resubmit
+    events = await _collect_events(get_report_stream_service(), conversation)
+
+    restarts = [data for name, data in events if name == "status" and data.get("restarted")]
+    assert restarts, [name for name, _ in events]
+    assert events[-1][0] == "done", [name for name, _ in events]
+    assert events[-1][1]["letter"] == REPORT["letter"]